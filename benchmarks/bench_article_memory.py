@@ -0,0 +1,110 @@
+"""
+記事レコードのメモリベンチマーク
+分析済みの記事を辞書で保持した場合と Article（__slots__）で保持した場合の1件あたりのバイト数を比較
+
+実行: python benchmarks/bench_article_memory.py [--articles 100000]
+"""
+
+import os
+import sys
+import gc
+import json
+import random
+import argparse
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.categories import CATEGORIES, IMPORTANCE_CRITERIA
+from modules.article import Article, Level
+
+
+def build_payload(count: int, seed: int = 42) -> str:
+    """収集結果を模したJSON（読み込み時に文字列が記事ごとに別オブジェクトになる）"""
+    rng = random.Random(seed)
+    keywords = [k for info in CATEGORIES.values() for k in info['keywords']]
+    sources = ['OpenAI Blog', 'TechCrunch', 'Hacker News', 'GitHub Blog', 'The Verge', 'arXiv AI']
+    start = datetime(2025, 1, 1)
+    articles = []
+    for i in range(count):
+        articles.append({
+            'title': ' '.join(rng.choice(keywords) for _ in range(rng.randint(5, 12))),
+            'link': f"https://example.com/news/{i}",
+            'description': ' '.join(rng.choice(keywords) for _ in range(rng.randint(10, 40))),
+            'published_date': (start + timedelta(minutes=i)).isoformat(),
+            'source': rng.choice(sources),
+            'source_type': rng.choice(['rss', 'api', 'scraping']),
+            'category': 'general',
+            'priority': rng.choice(['high', 'medium'])
+        })
+    return json.dumps(articles, ensure_ascii=False)
+
+
+def analyze_dict(article: dict, rng: random.Random):
+    """分析・レポート段階で辞書に追加されていたキー"""
+    category = rng.choice(list(CATEGORIES))
+    level = rng.choice(['high', 'medium', 'low'])
+    article['published_date'] = datetime.fromisoformat(article['published_date'])
+    article['category'] = category
+    article['category_score'] = rng.random()
+    article['category_name'] = CATEGORIES[category]['name']
+    article['importance_score'] = rng.random()
+    article['importance_level'] = level
+    article['importance_description'] = IMPORTANCE_CRITERIA[level]['description']
+    article['attention_score'] = rng.random()
+    article['attention_level'] = rng.choice(['high', 'medium', 'low'])
+    article['combined_score'] = article['importance_score'] + article['attention_score']
+
+
+def analyze_article(article: Article, rng: random.Random):
+    article.category = rng.choice(list(CATEGORIES))
+    article.category_score = rng.random()
+    article.importance_score = rng.random()
+    article.importance_level = Level(rng.choice(['high', 'medium', 'low']))
+    article.attention_score = rng.random()
+    article.attention_level = Level(rng.choice(['high', 'medium', 'low']))
+
+
+def measure(payload: str, as_article: bool) -> int:
+    """JSONの読み込みから分析済みの状態までに確保され、保持されているバイト数"""
+    gc.collect()
+    tracemalloc.start()
+    rng = random.Random(0)
+
+    records = json.loads(payload)
+    if as_article:
+        articles = [Article.from_dict(record) for record in records]
+        del records
+        for article in articles:
+            analyze_article(article, rng)
+    else:
+        articles = records
+        for article in articles:
+            analyze_dict(article, rng)
+
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del articles
+    return current
+
+
+def main():
+    parser = argparse.ArgumentParser(description='記事レコードのメモリベンチマーク')
+    parser.add_argument('--articles', type=int, default=100000)
+    args = parser.parse_args()
+
+    payload = build_payload(args.articles)
+    dict_bytes = measure(payload, as_article=False)
+    article_bytes = measure(payload, as_article=True)
+
+    print(f"記事数: {args.articles:,}")
+    print(f"{'':16}{'合計(MB)':>12}{'1件あたり(バイト)':>20}")
+    print(f"{'辞書':16}{dict_bytes / 1024 / 1024:>12,.1f}{dict_bytes / args.articles:>20,.0f}")
+    print(f"{'Article':16}{article_bytes / 1024 / 1024:>12,.1f}{article_bytes / args.articles:>20,.0f}")
+    print(f"削減率: {1 - article_bytes / dict_bytes:.1%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+"""
+記事ストアのベンチマーク
+旧形式（実行ごとのJSON indent=2 + pandas CSV）と日付パーティションJSONLストアの書き込み・読み込みを比較
+分析結果を全列で保存した場合と、記事IDをキーにした列指向の差分で保存した場合の書き込み量も比較
+
+実行: python benchmarks/bench_article_store.py [--runs 50 --articles 200]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+from datetime import datetime, date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from config.categories import CATEGORIES
+from modules.article_store import ArticleStore, article_id
+from modules.analyzer import ANALYSIS_FIELDS, ANALYSIS_DICTIONARY_FIELDS
+
+
+def build_runs(runs: int, articles_per_run: int, seed: int = 42):
+    """実行ごとの合成記事リスト"""
+    rng = random.Random(seed)
+    keywords = [k for info in CATEGORIES.values() for k in info['keywords']]
+    result = []
+    for run in range(runs):
+        articles = []
+        for i in range(articles_per_run):
+            title = ' '.join(rng.choice(keywords) for _ in range(rng.randint(5, 12)))
+            article = {
+                'title': title,
+                'link': f"https://example.com/{run}/{i}",
+                'description': ' '.join(rng.choice(keywords) for _ in range(rng.randint(20, 80))),
+                'published_date': datetime(2025, 1, 1) + timedelta(hours=run * 24 + i),
+                'source': rng.choice(['OpenAI Blog', 'TechCrunch', 'Hacker News', 'GitHub Blog']),
+                'source_type': 'rss',
+                'category': rng.choice(list(CATEGORIES)),
+                'priority': rng.choice(['high', 'medium']),
+                'category_score': rng.random(),
+                'importance_score': rng.random() * 2,
+                'importance_level': rng.choice(['critical', 'high', 'medium', 'low']),
+                'attention_score': rng.random(),
+                'attention_level': rng.choice(['high', 'medium', 'low'])
+            }
+            article['id'] = article_id(article)
+            articles.append(article)
+        result.append(articles)
+    return result
+
+
+def dir_size(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(d, f)) for d, _, files in os.walk(path) for f in files)
+
+
+def bench_legacy(runs, workdir):
+    start = time.perf_counter()
+    for run, articles in enumerate(runs):
+        base = os.path.join(workdir, f"articles_{run:05d}")
+        with open(f"{base}.json", 'w', encoding='utf-8') as f:
+            json.dump(articles, f, ensure_ascii=False, indent=2, default=str)
+        pd.DataFrame(articles).to_csv(f"{base}.csv", index=False, encoding='utf-8')
+    write_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    count = 0
+    for name in sorted(os.listdir(workdir)):
+        if name.endswith('.json'):
+            with open(os.path.join(workdir, name), 'r', encoding='utf-8') as f:
+                count += sum(1 for a in json.load(f) if a['category'])
+    read_seconds = time.perf_counter() - start
+    return write_seconds, read_seconds, count, dir_size(workdir)
+
+
+def bench_store(runs, workdir):
+    store = ArticleStore(workdir)
+    start = time.perf_counter()
+    for run, articles in enumerate(runs):
+        store.write('articles', articles, run_id=f"{run:05d}", partition_date=date(2025, 1, 1) + timedelta(days=run))
+    write_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    count = sum(1 for r in store.read('articles', columns=['id', 'category']) if r['category'])
+    read_seconds = time.perf_counter() - start
+
+    # パーティション絞り込み（直近1週間分）
+    last_day = date(2025, 1, 1) + timedelta(days=len(runs) - 1)
+    start = time.perf_counter()
+    recent = sum(1 for _ in store.read('articles', columns=['id'], start_date=last_day - timedelta(days=6)))
+    recent_seconds = time.perf_counter() - start
+    return write_seconds, read_seconds, count, dir_size(workdir), recent, recent_seconds
+
+
+def bench_analysis(runs, workdir):
+    """分析結果の保存: 全列のJSONL と 列指向の差分"""
+    full_store = ArticleStore(os.path.join(workdir, 'full'))
+    delta_store = ArticleStore(os.path.join(workdir, 'delta'))
+
+    start = time.perf_counter()
+    for run, articles in enumerate(runs):
+        full_store.write('analyzed', articles, run_id=f"{run:05d}", partition_date=date(2025, 1, 1) + timedelta(days=run))
+    full_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for run, articles in enumerate(runs):
+        delta_store.write_columns('analysis', articles, ANALYSIS_FIELDS,
+                                  dictionary_fields=ANALYSIS_DICTIONARY_FIELDS,
+                                  run_id=f"{run:05d}", partition_date=date(2025, 1, 1) + timedelta(days=run))
+    delta_seconds = time.perf_counter() - start
+
+    return (full_seconds, dir_size(os.path.join(workdir, 'full')),
+            delta_seconds, dir_size(os.path.join(workdir, 'delta')))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='記事ストアのベンチマーク')
+    parser.add_argument('--runs', type=int, default=50)
+    parser.add_argument('--articles', type=int, default=200, help='1実行あたりの記事数')
+    args = parser.parse_args()
+
+    import logging
+    logging.disable(logging.INFO)
+
+    runs = build_runs(args.runs, args.articles)
+    total = args.runs * args.articles
+    workdir = tempfile.mkdtemp(prefix='bench_store_')
+    try:
+        legacy_dir = os.path.join(workdir, 'legacy')
+        store_dir = os.path.join(workdir, 'store')
+        os.makedirs(legacy_dir)
+
+        lw, lr, lc, ls = bench_legacy(runs, legacy_dir)
+        sw, sr, sc, ss, recent, recent_seconds = bench_store(runs, store_dir)
+
+        print(f"記事数: {total} ({args.runs}実行 × {args.articles}件)")
+        print(f"{'':20}{'書き込み(件/秒)':>16}{'全件読み込み(件/秒)':>20}{'ディスク(KB)':>14}")
+        print(f"{'旧形式 JSON+CSV':20}{total / lw:>16,.0f}{lc / lr:>20,.0f}{ls / 1024:>14,.0f}")
+        print(f"{'JSONLストア':20}{total / sw:>16,.0f}{sc / sr:>20,.0f}{ss / 1024:>14,.0f}")
+        print(f"直近7日パーティションのみ読み込み: {recent}件 {recent_seconds * 1000:.1f}ms")
+
+        fw, fs, dw, ds = bench_analysis(runs, os.path.join(workdir, 'analysis'))
+        print(f"分析結果 全列JSONL: {fw * 1000:.0f}ms {fs / 1024:,.0f}KB / "
+              f"列指向の差分: {dw * 1000:.0f}ms {ds / 1024:,.0f}KB ({fs / ds:.1f}分の1)")
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+収集のエンドツーエンドベンチマーク
+モックソースサーバーに向けた 10・100・1000 ソースで collect_all の所要時間と毎秒リクエスト数、
+読み込んだ本文のバイト数と、同時に読み込んでいた本文の最大バイト数を計測
+
+実行: python benchmarks/bench_collect.py [--sources 10 100 1000] [--workers 1 8 32] [--latency-ms 50] [--items 200]
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.mock_sources import MockSourceServer
+from config.sources import mock_sources
+from modules.collector import NewsCollector
+
+
+def run_once(server: MockSourceServer, source_count: int, workers: int, host_interval: float,
+             max_inflight_bytes: int) -> dict:
+    collector = NewsCollector(
+        sources=mock_sources(server.base_url, source_count),
+        config={'max_workers': workers, 'host_interval_seconds': host_interval, 'max_inflight_bytes': max_inflight_bytes}
+    )
+    # ストアへの書き込みは計測対象外
+    collector._save_collected_data = lambda articles, run_id=None: None
+
+    requests_before = server.request_count()
+    start = time.perf_counter()
+    articles = collector.collect_all()
+    elapsed = time.perf_counter() - start
+    requests = server.request_count() - requests_before
+
+    return {
+        'seconds': elapsed,
+        'requests': requests,
+        'requests_per_second': requests / elapsed,
+        'articles': len(articles),
+        'bytes': sum(entry['value'] for entry in collector.metrics.snapshot()['counters'].get('collector_fetch_bytes_total', [])),
+        'peak_inflight_bytes': collector.budget.peak
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='収集のエンドツーエンドベンチマーク')
+    parser.add_argument('--sources', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 8, 32])
+    parser.add_argument('--latency-ms', type=float, default=50)
+    parser.add_argument('--jitter-ms', type=float, default=20)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--retry-after-rate', type=float, default=0.0)
+    parser.add_argument('--host-interval', type=float, default=0.0,
+                        help='同じホストへのリクエスト間隔（モックは全ソースが同じホストのため既定は0）')
+    parser.add_argument('--items', type=int, default=20, help='1フィードあたりの記事数')
+    parser.add_argument('--max-inflight-mb', type=float, default=32, help='同時に読み込む本文の上限')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    os.environ.setdefault('MOCK_API_KEY', 'mock')
+
+    with MockSourceServer(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+                          retry_after_rate=args.retry_after_rate, items=args.items) as server:
+        print(f"応答遅延: {args.latency_ms:.0f}±{args.jitter_ms:.0f} ms  エラー率: {args.error_rate:.0%}  "
+              f"429率: {args.retry_after_rate:.0%}")
+        print(f"{'ソース数':>8}{'並行数':>8}{'所要時間(s)':>14}{'リクエスト':>12}{'リクエスト/秒':>14}{'記事数':>10}"
+              f"{'読込(MB)':>10}{'最大同時(MB)':>14}")
+        for source_count in args.sources:
+            for workers in args.workers:
+                result = run_once(server, source_count, workers, args.host_interval,
+                                  int(args.max_inflight_mb * 1024 * 1024))
+                print(f"{source_count:>8}{workers:>8}{result['seconds']:>14.2f}{result['requests']:>12}"
+                      f"{result['requests_per_second']:>14.1f}{result['articles']:>10}"
+                      f"{result['bytes'] / 1024 / 1024:>10.1f}{result['peak_inflight_bytes'] / 1024 / 1024:>14.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+ジョブキューのワーカー数スケーリングベンチマーク
+応答を遅延させるローカルのモックフィードサーバーに対し、ソースごとの取得ジョブを
+ワーカープロセス数を変えて実行し、スループット（ジョブ/秒）を計測
+
+実行: python benchmarks/bench_job_queue.py [--workers 1 2 4 8] [--sources 48] [--latency-ms 200]
+"""
+
+import os
+import sys
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+import multiprocessing
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.mock_sources import MockSourceServer
+from modules.job_queue import SQLiteJobQueue, QueueWorker, fetch_job_key
+
+
+def worker_process(db_path: str):
+    """キューが空になるまでジョブを実行するワーカープロセス"""
+    logging.disable(logging.CRITICAL)
+    from modules.collector import NewsCollector
+
+    # モックは全ソースが同じホストのため、ホストごとの間隔は空けない
+    QueueWorker(SQLiteJobQueue(db_path), NewsCollector(config={'host_interval_seconds': 0}),
+                poll_seconds=0.05).run(stop_when_empty=True)
+
+
+def run_once(workers: int, sources: int, base_url: str) -> tuple:
+    """
+    一時ディレクトリでジョブを登録し、workers プロセスで実行
+
+    Returns:
+        (所要時間秒, 完了ジョブ数, 失敗ジョブ数)
+    """
+    work_dir = tempfile.mkdtemp(prefix='bench_queue_')
+    cwd = os.getcwd()
+    # 記事ストアは相対パスのため、作業ディレクトリごと切り替える
+    os.chdir(work_dir)
+    try:
+        db_path = os.path.join(work_dir, 'queue.db')
+        queue = SQLiteJobQueue(db_path)
+        for index in range(sources):
+            source = {
+                'name': f"Mock Feed {index}",
+                'url': f"{base_url}/rss/{index}.xml",
+                'category': 'benchmark',
+                'priority': 'medium'
+            }
+            queue.enqueue('fetch_source', {'kind': 'rss', 'source': source}, dedupe_key=fetch_job_key('rss', source))
+
+        start = time.perf_counter()
+        processes = [multiprocessing.Process(target=worker_process, args=(db_path,)) for _ in range(workers)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        elapsed = time.perf_counter() - start
+
+        stats = queue.stats()
+        return elapsed, stats['done'], stats['dead'] + stats['queued'] + stats['leased']
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ジョブキューのワーカー数スケーリングベンチマーク')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--sources', type=int, default=48, help='登録する取得ジョブ数')
+    parser.add_argument('--latency-ms', type=float, default=200.0, help='モックサーバーの応答遅延')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    server = MockSourceServer(latency_ms=args.latency_ms)
+    base_url = server.start()
+
+    print(f"ジョブ数: {args.sources}  応答遅延: {args.latency_ms:.0f} ms  記事/フィード: {server.items}")
+    print(f"{'ワーカー':>8}{'所要時間(s)':>14}{'ジョブ/秒':>12}{'速度比':>10}{'未完了':>8}")
+    baseline = None
+    for workers in args.workers:
+        elapsed, done, unfinished = run_once(workers, args.sources, base_url)
+        throughput = done / elapsed
+        baseline = baseline or throughput
+        print(f"{workers:>8}{elapsed:>14.2f}{throughput:>12.1f}{throughput / baseline:>10.2f}{unfinished:>8}")
+
+    server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+購読者別ニュースレター生成のベンチマーク
+フラグメントキャッシュ方式と、購読者ごとにnewsletter.htmlを丸ごとレンダリングする方式を比較
+
+実行: python benchmarks/bench_personalized.py [--subscribers 10000]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jinja2 import Template
+
+from config.categories import CATEGORIES
+from modules.personalizer import PersonalizedRenderer
+
+
+def build_content(seed: int = 42):
+    """各カテゴリ10件・注目記事15件の合成ニュースレターコンテンツ"""
+    rng = random.Random(seed)
+    categorized = {}
+    for category_id, category_info in CATEGORIES.items():
+        categorized[category_id] = [
+            {
+                'title': f"{rng.choice(category_info['keywords'])} update {i}",
+                'link': f"https://example.com/{category_id}/{i}",
+                'description': ' '.join(rng.choice(category_info['keywords']) for _ in range(30)),
+                'source': rng.choice(['OpenAI Blog', 'TechCrunch', 'Hacker News']),
+                'category': category_id,
+                'category_name': category_info['name'],
+                'importance_score': rng.random(),
+                'attention_score': rng.random()
+            }
+            for i in range(10)
+        ]
+    important = sorted(
+        (a for articles in categorized.values() for a in articles),
+        key=lambda a: a['importance_score'] + a['attention_score'], reverse=True
+    )[:15]
+    return {
+        'week_summary': {
+            'total_articles': 110, 'high_importance_count': 15, 'high_attention_count': 12,
+            'date_range': '10月12日 - 10月19日', 'generated_date': '2026年10月19日', 'ai_summary': ''
+        },
+        'category_summary': [],
+        'categorized_articles': categorized,
+        'important_articles': important,
+        'trends': {'previous_week': None, 'category_trends': [], 'rising_keywords': [], 'emerging_topics': []},
+        'top_articles': important[:10]
+    }
+
+
+def build_subscribers(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    category_ids = list(CATEGORIES)
+    return [
+        {'id': f"u{i:06d}", 'name': f"読者{i}", 'categories': rng.sample(category_ids, rng.randint(1, 5))}
+        for i in range(count)
+    ]
+
+
+def render_naive(content, subscribers, template_path):
+    """購読者ごとにnewsletter.html全体をレンダリング（比較用）"""
+    with open(template_path, 'r', encoding='utf-8') as f:
+        template = Template(f.read())
+    total_bytes = 0
+    for subscriber in subscribers:
+        followed = set(subscriber['categories'])
+        filtered = {cid: arts for cid, arts in content['categorized_articles'].items() if cid in followed}
+        tops = [a for a in content['important_articles'] if a['category'] in followed]
+        html = template.render(
+            week_summary=content['week_summary'], category_summary=content['category_summary'],
+            categorized_articles=filtered, important_articles=tops,
+            trends=content['trends'], top_articles=tops
+        )
+        total_bytes += len(html)
+    return total_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='購読者別ニュースレター生成ベンチマーク')
+    parser.add_argument('--subscribers', type=int, default=10000)
+    parser.add_argument('--naive-sample', type=int, default=500, help='比較方式で実測する購読者数')
+    args = parser.parse_args()
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    content = build_content()
+    subscribers = build_subscribers(args.subscribers)
+    renderer = PersonalizedRenderer(template_dir=os.path.join(root, 'templates'))
+
+    start = time.perf_counter()
+    total_bytes = sum(len(html) for _, html in renderer.render_editions(content, subscribers))
+    fragment_seconds = time.perf_counter() - start
+
+    sample = subscribers[:args.naive_sample]
+    start = time.perf_counter()
+    render_naive(content, sample, os.path.join(root, 'templates', 'newsletter.html'))
+    naive_seconds = (time.perf_counter() - start) * len(subscribers) / len(sample)
+
+    print(f"購読者数: {len(subscribers)}")
+    print(f"フラグメント方式: {fragment_seconds:.2f}秒 "
+          f"({len(subscribers) / fragment_seconds:,.0f}件/秒, 平均 {total_bytes / len(subscribers) / 1024:.1f}KB)")
+    print(f"全体レンダリング方式（{len(sample)}件から推定）: {naive_seconds:.2f}秒")
+    print(f"高速化: {naive_seconds / fragment_seconds:.1f}倍")
+
+
+if __name__ == '__main__':
+    main()
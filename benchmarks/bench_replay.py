@@ -0,0 +1,59 @@
+"""
+アーカイブ再生ベンチマーク
+--capture で保存した実行のレスポンスをネットワークなしで再生し、パース・分析の所要時間を計測
+
+実行: python benchmarks/bench_replay.py RUN_ID [--repeat 5]
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.response_archive import ResponseArchive
+from modules.collector import NewsCollector
+from modules.analyzer import NewsAnalyzer
+
+
+def run_once(run_id: str):
+    """再生した収集（パース）と分析の所要時間（秒）"""
+    collector = NewsCollector(archive=ResponseArchive('replay', run_id=run_id))
+    # ストアへの書き込みは計測対象外
+    collector._save_collected_data = lambda articles, run_id=None: None
+
+    start = time.perf_counter()
+    articles = collector.collect_all()
+    collected = time.perf_counter()
+
+    analyzer = NewsAnalyzer()
+    analyzer._save_analysis_results = lambda articles, summary: None
+    analyzer.analyze_articles(articles)
+    analyzed = time.perf_counter()
+
+    return len(articles), collected - start, analyzed - collected
+
+
+def main():
+    parser = argparse.ArgumentParser(description='アーカイブ再生ベンチマーク')
+    parser.add_argument('run_id', help='--capture で保存した実行ID')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    results = [run_once(args.run_id) for _ in range(args.repeat)]
+    count = results[0][0]
+    collect_times = sorted(r[1] for r in results)
+    analyze_times = sorted(r[2] for r in results)
+
+    print(f"実行ID: {args.run_id}  記事数: {count}  繰り返し: {args.repeat}")
+    print(f"{'':12}{'最小(ms)':>12}{'中央値(ms)':>14}")
+    print(f"{'収集・パース':12}{collect_times[0] * 1000:>12,.1f}{collect_times[len(results) // 2] * 1000:>14,.1f}")
+    print(f"{'分析':12}{analyze_times[0] * 1000:>12,.1f}{analyze_times[len(results) // 2] * 1000:>14,.1f}")
+
+
+if __name__ == '__main__':
+    main()
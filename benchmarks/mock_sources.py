@@ -0,0 +1,249 @@
+"""
+モックソースサーバー
+RSS・Atom・NewsAPI形式のJSON・Hacker News形式のHTML・arXiv形式のフィードを返すローカルのHTTPサーバー。
+応答の遅延・ばらつき・エラー率・Retry-After 付きの429を設定でき、ネットワークなしで収集の負荷試験ができる
+
+実行: python benchmarks/mock_sources.py [--port 8765] [--latency-ms 100] [--jitter-ms 50] [--error-rate 0.05]
+      MOCK_SOURCES_URL=http://127.0.0.1:8765 MOCK_SOURCES_COUNT=100 python main.py
+"""
+
+import os
+import sys
+import json
+import time
+import zlib
+import random
+import argparse
+import mimetypes
+import threading
+from html import escape
+from datetime import datetime
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit, parse_qs, quote
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import generate_articles
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # 収集側が本文の途中で接続を閉じる（上限超過・必要な件数を読んだ時点での打ち切り）のは正常な動作
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+
+class MockSourceServer:
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency_ms: float = 50, jitter_ms: float = 0,
+                 error_rate: float = 0.0, retry_after_rate: float = 0.0, retry_after_seconds: int = 1,
+                 items: int = 20, recorded_dir: Optional[str] = None, seed: int = 42):
+        """
+        モックソースサーバーを初期化
+
+        パスごとの記事はパスから決まるシードで生成するため、同じパスには常に同じ内容を返す。
+
+        Args:
+            latency_ms: 応答までの遅延
+            jitter_ms: 遅延のばらつき（0〜jitter_ms を加算）
+            error_rate: 500 を返す割合
+            retry_after_rate: Retry-After 付きの 429 を返す割合
+            retry_after_seconds: 429 の Retry-After の秒数
+            items: 1フィードあたりの記事数
+            recorded_dir: /recorded/<パス> で返す記録済みのファイルのディレクトリ
+        """
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.error_rate = error_rate
+        self.retry_after_rate = retry_after_rate
+        self.retry_after_seconds = retry_after_seconds
+        self.items = items
+        self.recorded_dir = recorded_dir
+        self.now = datetime.now().astimezone()
+        self.requests: Dict[int, int] = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._bodies: Dict[str, Tuple[bytes, str]] = {}
+        self._server = _Server((host, port), self._handler_class())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        """バックグラウンドのスレッドで起動し、ベースURLを返す"""
+        self._thread = threading.Thread(target=self._server.serve_forever, name='mock-sources', daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def request_count(self) -> int:
+        with self._lock:
+            return sum(self.requests.values())
+
+    def respond(self, path: str, query: Dict[str, list]) -> Tuple[int, bytes, str, Dict[str, str]]:
+        """パスに応じた応答（ステータス, 本文, Content-Type, 追加ヘッダー）"""
+        with self._lock:
+            roll = self._rng.random()
+            delay = self.latency + self._rng.random() * self.jitter
+        time.sleep(delay)
+
+        if roll < self.retry_after_rate:
+            return 429, b'rate limited', 'text/plain', {'Retry-After': str(self.retry_after_seconds)}
+        if roll < self.retry_after_rate + self.error_rate:
+            return 500, b'internal error', 'text/plain', {}
+
+        if path.startswith('/recorded/') and self.recorded_dir:
+            return self._recorded(path[len('/recorded/'):])
+
+        cache_key = f"{path}?{query.get('q', [''])[0]}"
+        with self._lock:
+            cached = self._bodies.get(cache_key)
+        if cached is None:
+            cached = self._generate(path, query)
+            if cached is None:
+                return 404, b'not found', 'text/plain', {}
+            with self._lock:
+                self._bodies[cache_key] = cached
+        body, content_type = cached
+        return 200, body, content_type, {}
+
+    def _generate(self, path: str, query: Dict[str, list]) -> Optional[Tuple[bytes, str]]:
+        parts = path.strip('/').split('/')
+        kind = parts[0]
+        if kind not in ('rss', 'atom', 'hn', 'newsapi', 'arxiv'):
+            return None
+
+        keyword = query.get('q', [''])[0]
+        # フィードのパス・検索語ごとに別の記事URLにする（同じURLの記事は同じ記事IDになるため）
+        link_base = f"https://example.com{path}" + (f"/{quote(keyword)}" if keyword else '')
+        articles = generate_articles(self.items, seed=zlib.crc32(f"{path}{keyword}".encode()),
+                                     now=self.now.replace(tzinfo=None), link_base=link_base)
+        for article in articles:
+            article['published_date'] = article['published_date'].replace(tzinfo=self.now.tzinfo)
+
+        if kind == 'rss':
+            items = ''.join(
+                f"<item><title>{escape(a['title'])}</title><link>{escape(a['link'])}</link>"
+                f"<description>{escape(a['description'])}</description>"
+                f"<pubDate>{format_datetime(a['published_date'])}</pubDate></item>"
+                for a in articles
+            )
+            body = f'<?xml version="1.0" encoding="utf-8"?><rss version="2.0"><channel><title>{path}</title>{items}</channel></rss>'
+            return body.encode('utf-8'), 'application/rss+xml'
+
+        if kind in ('atom', 'arxiv'):
+            entries = ''.join(
+                f"<entry><title>{escape(('AI ' if kind == 'arxiv' else '') + a['title'])}</title>"
+                f"<id>{escape(a['link'])}</id><link href=\"{escape(a['link'])}\"/>"
+                f"<published>{a['published_date'].isoformat()}</published>"
+                f"<updated>{a['published_date'].isoformat()}</updated>"
+                f"<summary>{escape(a['description'])}</summary></entry>"
+                for a in articles
+            )
+            body = f'<?xml version="1.0" encoding="utf-8"?><feed xmlns="http://www.w3.org/2005/Atom"><title>{path}</title>{entries}</feed>'
+            return body.encode('utf-8'), 'application/atom+xml'
+
+        if kind == 'hn':
+            rows = ''.join(
+                f'<tr class="athing"><td class="title"><span class="titleline">'
+                f'<a href="{escape(a["link"])}">{escape(a["title"])}</a></span></td></tr>'
+                for a in articles
+            )
+            body = f'<html><body><table>{rows}</table></body></html>'
+            return body.encode('utf-8'), 'text/html; charset=utf-8'
+
+        # NewsAPI の /v2/everything と同じ形式
+        body = json.dumps({
+            'status': 'ok',
+            'totalResults': len(articles),
+            'articles': [
+                {
+                    'source': {'id': None, 'name': a['source']},
+                    'title': f"{keyword} {a['title']}".strip(),
+                    'description': a['description'],
+                    'url': a['link'],
+                    'publishedAt': a['published_date'].isoformat()
+                }
+                for a in articles
+            ]
+        })
+        return body.encode('utf-8'), 'application/json'
+
+    def _recorded(self, relative_path: str) -> Tuple[int, bytes, str, Dict[str, str]]:
+        base = os.path.realpath(self.recorded_dir)
+        path = os.path.realpath(os.path.join(base, relative_path))
+        if not path.startswith(base + os.sep) or not os.path.isfile(path):
+            return 404, b'not found', 'text/plain', {}
+        with open(path, 'rb') as f:
+            content = f.read()
+        return 200, content, mimetypes.guess_type(path)[0] or 'application/octet-stream', {}
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                status, body, content_type, headers = server.respond(url.path, parse_qs(url.query))
+                with server._lock:
+                    server.requests[status] = server.requests.get(status, 0) + 1
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description='モックソースサーバー')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=100)
+    parser.add_argument('--jitter-ms', type=float, default=50)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--retry-after-rate', type=float, default=0.0)
+    parser.add_argument('--retry-after-seconds', type=int, default=1)
+    parser.add_argument('--items', type=int, default=20, help='1フィードあたりの記事数')
+    parser.add_argument('--recorded-dir', help='/recorded/<パス> で返すファイルのディレクトリ')
+    args = parser.parse_args()
+
+    server = MockSourceServer(
+        args.host, args.port, args.latency_ms, args.jitter_ms, args.error_rate,
+        args.retry_after_rate, args.retry_after_seconds, args.items, args.recorded_dir
+    )
+    print(f"モックソースサーバー: {server.base_url}")
+    print(f"  MOCK_SOURCES_URL={server.base_url} MOCK_SOURCES_COUNT=100 python main.py")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+レンダリングキャッシュの再実行チェック
+同じ内容のニュースレターを生成する main.py を別プロセスで3回実行し（PYTHONHASHSEED を変える）、
+2回目以降が1回目のレポートを再利用しなければ終了コード1を返す
+
+- store: 合成記事を入れた一時ディレクトリの記事ストアから --from-store で生成
+- collect: モックソースサーバーから収集して生成（スクレイピング・arXiv の記事は公開日時に収集時刻が入る）
+
+実行: python benchmarks/render_cache_check.py [--articles 200] [--sources 10]
+"""
+
+import os
+import re
+import sys
+import shutil
+import argparse
+import tempfile
+import subprocess
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.mock_sources import MockSourceServer
+from benchmarks.synthetic import generate_articles
+from modules.article_store import ArticleStore, article_id
+
+_HTML_RE = re.compile(r'^HTMLレポート: (.+)$', re.MULTILINE)
+
+
+def run_pipeline(work_dir: str, hash_seed: int, args: list, env: dict = None) -> str:
+    """
+    作業ディレクトリで main.py を実行
+
+    Returns:
+        HTMLレポートのパス
+    """
+    env = dict(os.environ, PYTHONHASHSEED=str(hash_seed), **(env or {}))
+    proc = subprocess.run(
+        [sys.executable, os.path.join(ROOT, 'main.py')] + args,
+        cwd=work_dir, env=env, capture_output=True, text=True
+    )
+    match = _HTML_RE.search(proc.stdout)
+    if proc.returncode != 0 or not match:
+        raise RuntimeError(f"main.py {' '.join(args)} が失敗しました:\n{proc.stdout[-2000:]}{proc.stderr[-2000:]}")
+    return match.group(1)
+
+
+def check_store(work_dir: str, articles: int) -> list:
+    records = generate_articles(articles, now=datetime.now())
+    for record in records:
+        record['id'] = article_id(record)
+    ArticleStore(os.path.join(work_dir, 'data', 'store')).write('articles', records)
+    return [run_pipeline(work_dir, seed, ['--from-store']) for seed in (1, 2, 3)]
+
+
+def check_collect(work_dir: str, sources: int) -> list:
+    with MockSourceServer(latency_ms=0, jitter_ms=0) as server:
+        env = {'MOCK_SOURCES_URL': server.base_url, 'MOCK_SOURCES_COUNT': str(sources)}
+        return [run_pipeline(work_dir, seed, [], env) for seed in (1, 2, 3)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='レンダリングキャッシュの再実行チェック')
+    parser.add_argument('--articles', type=int, default=200, help='記事ストアに入れる合成記事数（store）')
+    parser.add_argument('--sources', type=int, default=10, help='モックソースの数（collect）')
+    args = parser.parse_args()
+
+    cases = {
+        'store': lambda work_dir: check_store(work_dir, args.articles),
+        'collect': lambda work_dir: check_collect(work_dir, args.sources),
+    }
+    failed = []
+    for name, check in cases.items():
+        work_dir = tempfile.mkdtemp(prefix='render_cache_check_')
+        try:
+            # テンプレートは相対パスで読むため作業ディレクトリに置く
+            shutil.copytree(os.path.join(ROOT, 'templates'), os.path.join(work_dir, 'templates'))
+            reports = check(work_dir)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+        print(f"[{name}] " + '  '.join(f"{index}回目: {os.path.basename(report)}"
+                                      for index, report in enumerate(reports, 1)))
+        if len(set(reports)) != 1:
+            failed.append(name)
+
+    if failed:
+        print(f"レンダリングキャッシュチェック失敗: 同じ内容の再実行でレポートを再利用しませんでした（{', '.join(failed)}）")
+        sys.exit(1)
+    print("レンダリングキャッシュチェック成功")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+起動時間チェック
+python -X importtime で main.py の軽量な実行パス（status, --help）のインポート時間を計測し、
+予算を超えた場合や重い依存関係が読み込まれた場合に終了コード1を返す
+
+実行: python benchmarks/startup_check.py [--budget-ms 150] [--repeat 5]
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 計測する実行パス（main.py への引数）
+PATHS = {
+    'status': ['--mode', 'status'],
+    'help': ['--help'],
+}
+
+# 軽量な実行パスで読み込まれてはいけないモジュール
+HEAVY_MODULES = ['pandas', 'numpy', 'bs4', 'feedparser', 'jinja2', 'requests', 'schedule']
+
+_IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)')
+
+
+def measure(args, repeat: int):
+    """
+    実行パスを repeat 回実行し、最も速かった回の結果を返す
+
+    Returns:
+        (実行時間ms, インポート時間ms, 読み込まれたモジュール, 累積時間の大きいトップレベルのインポート)
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, '-X', 'importtime', os.path.join(ROOT, 'main.py')] + args,
+            cwd=ROOT, capture_output=True, text=True
+        )
+        wall_ms = (time.perf_counter() - start) * 1000
+        if proc.returncode != 0:
+            raise RuntimeError(f"main.py {' '.join(args)} が失敗しました:\n{proc.stderr[-2000:]}")
+
+        modules = set()
+        top_level = []
+        for line in proc.stderr.splitlines():
+            match = _IMPORTTIME_RE.match(line)
+            if not match:
+                continue
+            _, cumulative, indent, name = match.groups()
+            modules.add(name)
+            # インタープリタ自体の起動（site）は対象外
+            if not indent and name != 'site':
+                top_level.append((int(cumulative) / 1000, name))
+
+        import_ms = sum(ms for ms, _ in top_level)
+        if best is None or import_ms < best[1]:
+            best = (wall_ms, import_ms, modules, sorted(top_level, reverse=True)[:8])
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='main.py の起動時間チェック')
+    parser.add_argument('--budget-ms', type=float, default=150.0,
+                        help='実行パスごとのインポート時間の上限（ミリ秒）')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    failures = []
+    for name, path_args in PATHS.items():
+        wall_ms, import_ms, modules, top = measure(path_args, args.repeat)
+        heavy = sorted(m for m in HEAVY_MODULES if m in modules)
+
+        print(f"=== {name}: main.py {' '.join(path_args)} ===")
+        print(f"実行時間: {wall_ms:.1f} ms  インポート時間: {import_ms:.1f} ms（上限 {args.budget_ms:.0f} ms）")
+        for ms, module in top:
+            print(f"  {ms:8.1f} ms  {module}")
+
+        if import_ms > args.budget_ms:
+            failures.append(f"{name}: インポート時間 {import_ms:.1f} ms が上限 {args.budget_ms:.0f} ms を超えています")
+        if heavy:
+            failures.append(f"{name}: 重い依存関係が読み込まれています: {', '.join(heavy)}")
+
+    if failures:
+        print("\n起動時間チェック失敗:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+
+    print("\n起動時間チェック成功")
+
+
+if __name__ == '__main__':
+    main()
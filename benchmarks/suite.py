@@ -0,0 +1,264 @@
+"""
+ベンチマークスイート
+合成記事で分析・重複除去・レポート生成のスループットとピークメモリを記事数ごとに計測し、
+結果を JSON に保存する。compare で2つの結果（コミット）を比較し、性能の劣化を検出する
+
+実行: python benchmarks/suite.py run [--sizes 1000 10000 100000 1000000] [--only analyze ...]
+      python benchmarks/suite.py compare BASE NEW [--threshold 0.1]
+      （BASE / NEW は結果のJSONファイルか、benchmarks/results/<コミット>.json のコミット）
+"""
+
+import os
+import sys
+import gc
+import json
+import time
+import shutil
+import logging
+import argparse
+import platform
+import tempfile
+import subprocess
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, Any, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import generate_articles
+from modules.article import to_articles
+
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+
+
+class Workdir:
+    """レポートやストアの書き込み先を一時ディレクトリに切り替える"""
+
+    def __enter__(self):
+        self.cwd = os.getcwd()
+        self.path = tempfile.mkdtemp(prefix='bench_suite_')
+        shutil.copytree(os.path.join(ROOT, 'templates'), os.path.join(self.path, 'templates'))
+        os.chdir(self.path)
+        return self.path
+
+    def __exit__(self, *exc):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+def setup_analyze(records):
+    from modules.analyzer import NewsAnalyzer
+    analyzer = NewsAnalyzer()
+    # 記事ストアへの書き込みは計測対象外
+    analyzer._save_analysis_results = lambda articles, summary: None
+    return lambda: analyzer.analyze_articles(records)
+
+
+def setup_collector_dedup(records):
+    from modules.collector import NewsCollector
+    collector = NewsCollector()
+    return lambda: collector._remove_duplicates(records)
+
+
+def setup_reporter_dedup(records):
+    from modules.reporter import NewsletterReporter
+    reporter = NewsletterReporter()
+    articles = to_articles(records)
+    return lambda: reporter._remove_duplicates_by_title(articles)
+
+
+def setup_generate_newsletter(records):
+    from modules.analyzer import NewsAnalyzer
+    from modules.reporter import NewsletterReporter
+    analyzer = NewsAnalyzer()
+    analyzer._save_analysis_results = lambda articles, summary: None
+    analysis_results = analyzer.analyze_articles(records)
+
+    def run():
+        reporter = NewsletterReporter()
+        # 同じ内容の再レンダリングを省く生成キャッシュは無効にする
+        reporter.render_cache.lookup = lambda fingerprint, reports_dir: None
+        return reporter.generate_newsletter(analysis_results)
+    return run
+
+
+# 名前: (準備関数, 対象とする最大記事数)
+# タイトルの部分一致による重複除去は記事数の2乗に比例するため、既定では1万件までにする（--no-limits で解除）
+BENCHMARKS: Dict[str, tuple] = {
+    'analyze': (setup_analyze, None),
+    'collector_dedup': (setup_collector_dedup, None),
+    'reporter_dedup': (setup_reporter_dedup, 10000),
+    'generate_newsletter': (setup_generate_newsletter, 10000),
+}
+
+
+def measure(setup: Callable, records, repeat: int, memory: bool) -> Dict[str, Any]:
+    """
+    repeat 回の最短時間と、tracemalloc で計測したピークメモリ
+
+    Returns:
+        seconds, articles_per_second, peak_mb（memory=False の場合は None）
+    """
+    with Workdir():
+        run = setup(records)
+        times = []
+        for _ in range(repeat):
+            gc.collect()
+            start = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - start)
+
+        peak_mb = None
+        if memory:
+            gc.collect()
+            tracemalloc.start()
+            run()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            peak_mb = peak / 1024 / 1024
+
+    seconds = min(times)
+    return {
+        'seconds': seconds,
+        'articles_per_second': len(records) / seconds if seconds > 0 else None,
+        'peak_mb': peak_mb
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(args) -> Dict[str, Any]:
+    names = args.only or list(BENCHMARKS)
+    results = {name: {} for name in names}
+
+    for size in args.sizes:
+        records = generate_articles(size, seed=args.seed, now=datetime.now())
+        for name in names:
+            setup, max_size = BENCHMARKS[name]
+            if max_size is not None and size > max_size and not args.no_limits:
+                results[name][str(size)] = {'skipped': f'{max_size}件まで（--no-limits で計測）'}
+                print(f"{name:22}{size:>10,}  スキップ")
+                continue
+            result = measure(setup, records, args.repeat, not args.no_memory)
+            results[name][str(size)] = result
+            peak = f"{result['peak_mb']:10,.1f} MB" if result['peak_mb'] is not None else ''
+            print(f"{name:22}{size:>10,}{result['seconds'] * 1000:>12,.1f} ms"
+                  f"{result['articles_per_second'] or 0:>14,.0f} 件/秒{peak}")
+        del records
+        gc.collect()
+
+    return {
+        'commit': git_commit(),
+        'created_at': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'repeat': args.repeat,
+        'results': results
+    }
+
+
+def resolve_results(ref: str) -> str:
+    """結果ファイルのパス（コミットを指定した場合は benchmarks/results/<短縮ハッシュ>.json）"""
+    if os.path.exists(ref):
+        return ref
+    commit = subprocess.run(
+        ['git', 'rev-parse', '--short', ref], cwd=ROOT, capture_output=True, text=True
+    ).stdout.strip() or ref
+    path = os.path.join(RESULTS_DIR, f"{commit}.json")
+    if not os.path.exists(path):
+        raise SystemExit(f"結果が見つかりません: {ref}（python benchmarks/suite.py run をそのコミットで実行してください）")
+    return path
+
+
+def compare(base: Dict[str, Any], new: Dict[str, Any], threshold: float, min_seconds: float) -> List[str]:
+    """
+    時間・ピークメモリが threshold を超えて増えた計測を返す
+
+    min_seconds 未満の計測は誤差が大きいため時間の比較から除く。
+    """
+    regressions = []
+    print(f"{'':22}{'記事数':>10}{'時間':>10}{'メモリ':>10}")
+    for name, sizes in new['results'].items():
+        for size, result in sizes.items():
+            before = base['results'].get(name, {}).get(size)
+            if not before or 'skipped' in before or 'skipped' in result:
+                continue
+
+            time_ratio = result['seconds'] / before['seconds'] - 1
+            memory_ratio = None
+            if result.get('peak_mb') and before.get('peak_mb'):
+                memory_ratio = result['peak_mb'] / before['peak_mb'] - 1
+
+            flags = []
+            if time_ratio > threshold and max(result['seconds'], before['seconds']) >= min_seconds:
+                flags.append('時間')
+            if memory_ratio is not None and memory_ratio > threshold:
+                flags.append('メモリ')
+
+            memory = f"{memory_ratio:>+10.1%}" if memory_ratio is not None else f"{'-':>10}"
+            mark = f"  劣化（{'・'.join(flags)}）" if flags else ''
+            print(f"{name:22}{int(size):>10,}{time_ratio:>+10.1%}{memory}{mark}")
+            if flags:
+                regressions.append(f"{name} {int(size):,}件: 時間 {time_ratio:+.1%}"
+                                   + (f", メモリ {memory_ratio:+.1%}" if memory_ratio is not None else ''))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='分析・重複除去・レポート生成のベンチマークスイート')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='計測して結果をJSONに保存')
+    run_parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    run_parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS))
+    run_parser.add_argument('--repeat', type=int, default=3)
+    run_parser.add_argument('--seed', type=int, default=42)
+    run_parser.add_argument('--no-memory', action='store_true', help='ピークメモリを計測しない（tracemalloc の実行を省く）')
+    run_parser.add_argument('--no-limits', action='store_true', help='記事数の2乗に比例する計測も全ての記事数で行う')
+    run_parser.add_argument('--output', help='結果のJSON（省略時は benchmarks/results/<コミット>.json）')
+
+    compare_parser = subparsers.add_parser('compare', help='2つの結果を比較し、劣化があれば終了コード1')
+    compare_parser.add_argument('base', help='比較元の結果ファイルまたはコミット')
+    compare_parser.add_argument('new', help='比較先の結果ファイルまたはコミット')
+    compare_parser.add_argument('--threshold', type=float, default=0.10, help='劣化とみなす増加率')
+    compare_parser.add_argument('--min-seconds', type=float, default=0.01, help='時間を比較する最短の計測時間')
+
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    if args.command == 'run':
+        results = run_suite(args)
+        output = args.output or os.path.join(RESULTS_DIR, f"{results['commit'] or 'results'}.json")
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n結果を保存しました: {output}")
+
+    else:
+        with open(resolve_results(args.base), 'r', encoding='utf-8') as f:
+            base = json.load(f)
+        with open(resolve_results(args.new), 'r', encoding='utf-8') as f:
+            new = json.load(f)
+
+        print(f"比較: {base.get('commit')} → {new.get('commit')}（しきい値 {args.threshold:.0%}）")
+        regressions = compare(base, new, args.threshold, args.min_seconds)
+        if regressions:
+            print("\n性能の劣化:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            sys.exit(1)
+        print("\n劣化はありません")
+
+
+if __name__ == '__main__':
+    main()
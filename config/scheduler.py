@@ -0,0 +1,74 @@
+"""
+スケジューラーの設定
+"""
+
+# ジョブの実行予定（cron形式: 分 時 日 月 曜日。@daily などの別名も可）
+#   policy: 前回の実行が終わっていない時に次の時刻が来た場合の動作
+#     "skip"  … 今回の実行を見送る
+#     "queue" … 前回の終了後に1回だけ実行する（複数回分はまとめる）
+#   catch_up: 停止中に過ぎた実行予定を再起動時に1回だけ実行する
+SCHEDULER_CONFIG = {
+    "state_path": "data/state/scheduler.json",  # ジョブごとの最終実行を記録
+    "jobs": {
+        "newsletter": {
+            "cron": "0 20 * * mon",  # 月曜夜8時
+            "policy": "skip",
+            "catch_up": True,
+        },
+        "maintenance": {
+            "cron": "30 3 * * *",  # 毎日3:30（コンパクション・保持期間の適用）
+            "policy": "skip",
+            "catch_up": True,
+        },
+    },
+}
+
+# 継続収集（--mode continuous）: ソースごとに優先度に応じた間隔で取得して記事ストアに蓄積し、
+# 週次のニュースレターは蓄積した記事の分析とレンダリングのみを行う
+CONTINUOUS_CONFIG = {
+    "poll_interval_minutes": {  # ソースの priority ごとの取得間隔（ソース設定の poll_interval_minutes で上書き可）
+        "high": 30,
+        "medium": 120,
+        "low": 360,
+    },
+    "min_interval_minutes": {  # 種別ごとの最短間隔（APIは呼び出し回数の上限があるため長めにする）
+        "api": 360,
+    },
+    "stagger_seconds": 15,  # 起動時に各ソースの初回取得をずらす間隔
+    "window_days": 7,  # 週次ニュースレターで対象にする蓄積期間
+    "seen_path": "data/state/continuous_seen.json",  # 取得済みの記事ID（同じ記事を重複して保存しない）
+}
+
+# ジョブキュー（--mode continuous --use-queue で取得ジョブを登録し、--mode worker のプロセスが実行）
+QUEUE_CONFIG = {
+    "db_path": "data/queue.db",  # 複数ノードで使う場合は共有ファイルシステム上に置く
+    "lease_seconds": 300,  # リース期限（過ぎると別のワーカーが再取得）
+    "max_attempts": 5,  # 失敗時の最大試行回数（使い切ると dead）
+    "retry_base_seconds": 30,  # 再試行までの待機時間（試行ごとに2倍）
+    "poll_seconds": 2,  # ジョブがない時にキューを確認する間隔
+    "keep_done_days": 7,  # 完了・失敗したジョブを残す日数
+    "keep_seen_days": 14,  # ワーカー間で共有する取得済みの記事IDを残す日数（継続収集の保持期間と同じ）
+}
+
+# 状態ファイル（--mode scheduler / continuous のプロセスが書き出し、--mode status が読む）
+STATUS_CONFIG = {
+    "status_path": "data/status/scheduler_status.json",
+    "heartbeat_seconds": 15,  # 変化がなくても状態ファイルを書き直す間隔
+    "stale_seconds": 60,  # この時間を過ぎても更新されなければ停止したとみなす
+    "progress_interval_seconds": 1.0,  # 進捗による書き出しの最短間隔
+}
+
+# ソースごとの新着の出方に応じた取得間隔の調整（--mode continuous）
+#   新着のない取得が続くと間隔を延ばし、取得した記事が全て新着（前回の取得と重ならない）なら縮める。
+#   間隔は CONTINUOUS_CONFIG の間隔（基準）に対する倍率として data/state/source_yield.json に保存する
+ADAPTIVE_POLL_CONFIG = {
+    "enabled": True,
+    "state_path": "data/state/source_yield.json",
+    "empty_fetches_before_backoff": 2,  # 新着なしがこの回数続いたら間隔を延ばし始める
+    "backoff_factor": 2.0,  # 新着なしの取得ごとに間隔に掛ける倍率
+    "max_backoff_factor": 8.0,  # 新着なしで延ばす間隔の上限（基準の倍率）
+    "burst_factor": 2.0,  # 取得した記事が全て新着の場合に間隔を割る倍率
+    "min_factor": 0.25,  # 縮める間隔の下限（基準の倍率。種別ごとの最短間隔も適用）
+    "failure_backoff_factor": 2.0,  # 連続して失敗するごとに間隔に掛ける倍率
+    "max_failure_factor": 16.0,  # 失敗で延ばす間隔の上限（停止したフィードはここで止まる）
+}
@@ -2,6 +2,8 @@
 情報収集ソースの設定
 """
 
+import os
+
 # RSSフィードソース（生成AI特化）
 RSS_SOURCES = [
     # 生成AI企業ブログ
@@ -175,5 +177,62 @@ COLLECTION_CONFIG = {
     "exclude_keywords": [
         "sponsored", "advertisement", "promoted",
         "clickbait", "fake news", "広告", "宣伝", "スポンサード"
-    ]
-} 
\ No newline at end of file
+    ],
+    "max_workers": 8,  # collect_all で並行して取得するソース数
+    "request_timeout": 10,  # 1リクエストのタイムアウト（秒）
+    "host_interval_seconds": 1.0,  # 同じホストへのリクエストの最短間隔（レート制限対策）
+    "max_retries": 2,  # 429/503 で Retry-After が返された場合の再試行回数
+    "max_retry_after_seconds": 30,  # これより長い Retry-After は待たずに失敗とする
+    "max_response_bytes": 5 * 1024 * 1024,  # 1レスポンスの本文の上限（超えると読み込みを中止）
+    "max_inflight_bytes": 32 * 1024 * 1024,  # 並行取得全体で同時に読み込む本文の上限（超える場合は空くまで待つ）
+    "stream_chunk_bytes": 64 * 1024,  # 本文を読み込む単位
+}
+
+
+def mock_sources(base_url: str, count: int = 10) -> dict:
+    """
+    ローカルのモックソースサーバー（benchmarks/mock_sources.py）を指すソース設定
+
+    RSS・Atom・NewsAPI形式のJSON・Hacker News形式のHTMLを count 件に振り分ける。
+
+    Returns:
+        rss / api / scraping / additional（RSS_SOURCES などと同じ形式）
+    """
+    base_url = base_url.rstrip('/')
+    sources = {'rss': [], 'api': [], 'scraping': [], 'additional': {}}
+    for i in range(count):
+        kind = ('rss', 'atom', 'rss', 'scraping', 'api')[i % 5]
+        name = f"Mock {kind} {i}"
+        if kind in ('rss', 'atom'):
+            sources['rss'].append({
+                "name": name, "url": f"{base_url}/{kind}/{i}.xml",
+                "category": "general", "priority": "high"
+            })
+        elif kind == 'scraping':
+            sources['scraping'].append({
+                "name": name, "url": f"{base_url}/hn/{i}.html",
+                "selector": "tr.athing",
+                "title_selector": "span.titleline > a",
+                "link_selector": "span.titleline > a",
+                "category": "general", "priority": "medium"
+            })
+        else:
+            sources['api'].append({
+                "name": name, "base_url": f"{base_url}/newsapi/{i}/v2/everything",
+                "api_key_env": "MOCK_API_KEY",
+                "params": {"language": "en", "sortBy": "publishedAt", "pageSize": 5},
+                "keywords": ["LLM", "AI agent"]
+            })
+    sources['additional']['arxiv'] = {
+        "name": "Mock arXiv", "url": f"{base_url}/arxiv",
+        "category": "content_gen", "priority": "high"
+    }
+    return sources
+
+
+# MOCK_SOURCES_URL を設定すると全てのソースをモックソースサーバーに向ける（ネットワークなしでの負荷試験用）
+if os.getenv('MOCK_SOURCES_URL'):
+    _mock = mock_sources(os.environ['MOCK_SOURCES_URL'], int(os.getenv('MOCK_SOURCES_COUNT', '10')))
+    RSS_SOURCES, API_SOURCES, SCRAPING_SOURCES = _mock['rss'], _mock['api'], _mock['scraping']
+    ADDITIONAL_SOURCES = dict(ADDITIONAL_SOURCES, **_mock['additional'])
+    os.environ.setdefault('MOCK_API_KEY', 'mock')
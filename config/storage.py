@@ -0,0 +1,58 @@
+"""
+データ保存の設定
+"""
+
+# 記事ストア（日付パーティション分割の追記専用JSONL）
+STORAGE_CONFIG = {
+    "store_dir": "data/store",  # ストアのルートディレクトリ
+    "batch_size": 500,  # 1回の書き込みでまとめるレコード数
+    "repository_path": "data/articles.db",  # 各段階で共有するSQLite記事リポジトリ
+    "use_repository": True,  # レポート生成時にリポジトリの索引付きクエリを使う
+}
+
+# コンパクション・保持期間（None は無期限に保持）
+RETENTION_CONFIG = {
+    "compact_after_days": 1,  # この日数より古いパーティションの実行ごとのファイルを1つにまとめる
+    "legacy_dir": "data/collected",  # ストアに取り込む旧形式（実行ごとのJSON/CSV）のディレクトリ
+    "dataset_retention_days": {  # データセットごとの保持日数
+        "articles": 365,
+        "analysis": 365,
+        "summaries": None,
+    },
+    "report_retention_days": None,  # reports/newsletters の保持日数（既定では削除しない）
+    "index_path": "data/store/_compaction.json",  # コンパクション結果の記録
+}
+
+# パイプラインの段階ごとのチェックポイント（--resume で失敗した段階から再開）
+CHECKPOINT_CONFIG = {
+    "checkpoint_dir": "data/checkpoints",  # data/checkpoints/<run_id>/<stage>.json
+    "keep_runs": 10,  # 保持する実行数（古い実行から削除）
+}
+
+# 収集時の生レスポンスのアーカイブ（--capture で保存、--replay でネットワークの代わりに使用）
+ARCHIVE_CONFIG = {
+    "archive_dir": "data/archive",  # blobs/<sha256>.gz に本文、runs/<run_id>.jsonl にマニフェスト
+    "compress_level": 6,  # gzip の圧縮レベル
+    "redact_params": ["apiKey", "api_key", "key", "token"],  # リクエストのキー・マニフェストに含めないパラメータ
+}
+
+# 実行ごとのメトリクス（収集・分析・レポート生成の件数・所要時間）
+METRICS_CONFIG = {
+    "metrics_dir": "data/metrics",  # run_<run_id>.prom / .json と latest.prom / latest.json
+    "keep_runs": 20,  # 保持する実行数（古い実行から削除）
+}
+
+# CPUプロファイル（--profile）
+PROFILE_CONFIG = {
+    "profile_dir": "data/profiles",  # <日時>/<段階>.pstats, pipeline.pstats, pipeline.collapsed, report.txt
+    "mode": "cprofile",  # cprofile: 関数ごとの集計とサンプリング / sampling: サンプリングのみ（低負荷）
+    "top_n": 30,  # 段階ごとのレポートに載せる関数の数
+    "sample_interval_ms": 5,  # スタックのサンプリング間隔
+    "keep_runs": 10,  # 保持するプロファイル数（古いものから削除）
+}
+
+# 実行のトレース（--trace）
+TRACE_CONFIG = {
+    "trace_dir": "data/traces",  # <run_id>.jsonl と <run_id>.trace.json（chrome://tracing / Perfetto で開く）
+    "keep_runs": 20,  # 保持するトレース数（古いものから削除）
+}
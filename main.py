@@ -5,16 +5,22 @@ AI最新情報キャッチアップシステム
 
 import os
 import sys
+import time
 import logging
-from datetime import datetime
+from datetime import datetime, date, timedelta
 import argparse
+from contextlib import contextmanager
+from functools import cached_property
 from typing import Optional
 
-# モジュールのインポート
-from modules.collector import NewsCollector
-from modules.analyzer import NewsAnalyzer
-from modules.reporter import NewsletterReporter
-from modules.scheduler import create_scheduler
+# モジュールのインポート（収集・分析・レポート生成のモジュールは使う時点で読み込み、
+# status や --help の起動を軽くする）
+from modules.checkpoint import CheckpointStore
+from modules.response_archive import ResponseArchive
+from modules.metrics import MetricsRegistry, load_latest
+from modules import tracing
+from config.storage import STORAGE_CONFIG
+from config.scheduler import CONTINUOUS_CONFIG, ADAPTIVE_POLL_CONFIG
 
 # ログ設定
 logging.basicConfig(
@@ -29,79 +35,361 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 class AINewsletterSystem:
-    def __init__(self):
-        self.collector = NewsCollector()
-        self.analyzer = NewsAnalyzer()
-        self.reporter = NewsletterReporter()
+    def __init__(self, archive: Optional[ResponseArchive] = None, profiler=None):
+        # 各コンポーネントは最初に使われた時点で生成する
+        self.archive = archive
+        self.profiler = profiler  # --profile 時のみ（PipelineProfiler）
+        self.checkpoints = CheckpointStore()
         self.scheduler = None
+        self.status = None  # --mode scheduler / continuous のみ（StatusPublisher）
+        self.yield_tracker = None  # --mode continuous / worker のみ（SourceYieldTracker）
+        # 収集・分析・レポート生成で共有するメトリクス（実行ごとに data/metrics に書き出す）
+        self.metrics = MetricsRegistry()
+        self.metrics.set_buckets('pipeline_stage_seconds', (1, 5, 10, 30, 60, 120, 300, 600, 1800))
     
-    def run_full_pipeline(self) -> dict:
-        """完全なパイプラインを実行"""
+    @cached_property
+    def repository(self):
+        """各段階で共有する記事リポジトリ"""
+        if not STORAGE_CONFIG['use_repository']:
+            return None
+        from modules.article_repository import ArticleRepository
+        return ArticleRepository()
+    
+    @cached_property
+    def collector(self):
+        from modules.collector import NewsCollector
+        return NewsCollector(
+            repository=self.repository, archive=self.archive, metrics=self.metrics, progress=self._collect_progress,
+            yield_tracker=self.yield_tracker
+        )
+    
+    @cached_property
+    def analyzer(self):
+        from modules.analyzer import NewsAnalyzer
+        return NewsAnalyzer(repository=self.repository, metrics=self.metrics)
+    
+    @cached_property
+    def reporter(self):
+        from modules.reporter import NewsletterReporter
+        return NewsletterReporter(repository=self.repository, metrics=self.metrics)
+    
+    def run_full_pipeline(self, streaming: bool = False, resume_run_id: Optional[str] = None,
+                          from_stage: Optional[str] = None, from_store: bool = False) -> dict:
+        """
+        完全なパイプラインを実行
+        
+        各段階の出力は実行IDごとにチェックポイントとして保存し、失敗時は resume_run_id で再開できる。
+        
+        Args:
+            streaming: 記事を全件保持せず、収集→分析→集計を1件ずつ流す（メモリ使用量がニュースレターの大きさで決まる）
+            resume_run_id: 再開する実行ID（チェックポイントから前段階の出力を読み込む）
+            from_stage: 再開する段階（analyze / report。省略時は最後に完了した段階の次）
+            from_store: 収集の代わりに継続収集で蓄積した記事を記事ストアから読み込む
+        """
+        if self.status:
+            self.status.run_started()
+        start = time.perf_counter()
+        with tracing.span('run', 'run', streaming=streaming, resume=resume_run_id, from_store=from_store) as span:
+            result = self._run_pipeline(streaming, resume_run_id, from_stage, from_store)
+            span.set(run_id=result.get('run_id'))
+            if 'error' in result:
+                span.set_error(result['error'])
+        
+        self.metrics.inc('pipeline_runs_total', status='error' if 'error' in result else 'success')
+        try:
+            paths = self.metrics.export(result.get('run_id'))
+            logger.info(f"メトリクス保存完了: {paths['prom']}")
+        except OSError as e:
+            logger.error(f"メトリクス保存エラー: {e}")
+        if self.status:
+            self.status.run_finished(result, time.perf_counter() - start, self._last_run_metrics(result))
+        return result
+    
+    def _last_run_metrics(self, result: dict) -> dict:
+        """状態ファイルに載せる最終実行のメトリクス（段階ごとの所要時間と記事数）"""
+        gauges = self.metrics.snapshot()['gauges']
+        summary = {
+            'stage_seconds': {
+                entry['labels']['stage']: round(entry['value'], 3)
+                for entry in gauges.get('pipeline_stage_last_seconds', [])
+            }
+        }
+        for key in ('collected_articles', 'analyzed_articles', 'high_importance', 'high_attention'):
+            if key in result:
+                summary[key] = result[key]
+        return summary
+    
+    def _collect_progress(self, done: int, total: int):
+        if self.status:
+            self.status.progress(done, total)
+    
+    @contextmanager
+    def _stage(self, name: str):
+        """段階の所要時間と失敗回数を記録（--profile 時は段階ごとにプロファイルを取る）"""
+        start = time.perf_counter()
+        if self.status:
+            self.status.stage(name)
+        try:
+            with tracing.span(name, 'stage'):
+                if self.profiler is None:
+                    yield
+                else:
+                    with self.profiler.stage(name):
+                        yield
+        except Exception:
+            self.metrics.inc('pipeline_stage_errors_total', stage=name)
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self.metrics.observe('pipeline_stage_seconds', elapsed, stage=name)
+            self.metrics.set('pipeline_stage_last_seconds', elapsed, stage=name)
+    
+    def _run_pipeline(self, streaming: bool, resume_run_id: Optional[str],
+                      from_stage: Optional[str], from_store: bool) -> dict:
+        """run_full_pipeline の本体（段階ごとの実行とチェックポイント）"""
         logger.info("AI最新情報キャッチアップシステム開始")
         
+        if streaming:
+            # ストリーミング時は記事を保持しないため段階ごとのチェックポイントは作らない
+            try:
+                stages = self._run_streaming_stages()
+                if stages is None:
+                    logger.warning("収集された記事がありません")
+                    return {'error': 'No articles collected'}
+                collected_count, analysis_summary, report_results = stages
+                return self._finish_pipeline(collected_count, analysis_summary, report_results)
+            except Exception as e:
+                logger.error(f"パイプライン実行中にエラーが発生: {e}")
+                return {'error': str(e)}
+        
+        run_id = resume_run_id or self.checkpoints.new_run_id()
+        stage = 'collect'
         try:
-            # 1. 情報収集
-            logger.info("=== 情報収集フェーズ ===")
-            articles = self.collector.collect_all()
-            logger.info(f"収集完了: {len(articles)}件の記事")
+            if resume_run_id:
+                if not self.checkpoints.completed_stages(resume_run_id):
+                    return {'error': f'No checkpoint for run {resume_run_id}', 'run_id': run_id}
+                stage = from_stage or self.checkpoints.resume_stage(resume_run_id)
+                if stage is None:
+                    return {'error': f'No resumable checkpoint for run {resume_run_id}', 'run_id': run_id}
+                logger.info(f"実行 {run_id} を {stage} 段階から再開")
             
-            if not articles:
-                logger.warning("収集された記事がありません")
-                return {'error': 'No articles collected'}
+            # 1. 情報収集
+            if stage == 'collect':
+                logger.info("=== 情報収集フェーズ ===")
+                with self._stage('collect'):
+                    if from_store:
+                        window_days = CONTINUOUS_CONFIG['window_days']
+                        articles = self.collector.load_collected(start_date=date.today() - timedelta(days=window_days - 1))
+                    else:
+                        articles = self.collector.collect_all()
+                self.metrics.set('pipeline_collected_articles', len(articles))
+                logger.info(f"収集完了: {len(articles)}件の記事")
+                
+                if not articles:
+                    logger.warning("収集された記事がありません")
+                    return {'error': 'No articles collected', 'run_id': run_id}
+                
+                self.checkpoints.save_articles(run_id, 'collect', articles)
+                stage = 'analyze'
+            elif stage == 'analyze':
+                articles = self.checkpoints.load_articles(run_id, 'collect')['articles']
             
             # 2. 分析
-            logger.info("=== 分析フェーズ ===")
-            analysis_results = self.analyzer.analyze_articles(articles)
-            logger.info(f"分析完了: {len(analysis_results['articles'])}件の記事を分析")
+            if stage == 'analyze':
+                logger.info("=== 分析フェーズ ===")
+                with self._stage('analyze'):
+                    analysis_results = self.analyzer.analyze_articles(articles)
+                logger.info(f"分析完了: {len(analysis_results['articles'])}件の記事を分析")
+                self.checkpoints.save_articles(
+                    run_id, 'analyze', analysis_results['articles'],
+                    extra={'summary': analysis_results['summary'], 'collected_count': len(articles)}
+                )
+                collected_count = len(articles)
+                stage = 'report'
+            else:
+                analysis_results = self.checkpoints.load_articles(run_id, 'analyze')
+                collected_count = analysis_results.get('collected_count', len(analysis_results['articles']))
             
             # 3. レポート生成
             logger.info("=== レポート生成フェーズ ===")
-            report_results = self.reporter.generate_newsletter(analysis_results)
-            logger.info("レポート生成完了")
-            
-            # 結果サマリー
-            summary = {
-                'collected_articles': len(articles),
-                'analyzed_articles': len(analysis_results['articles']),
-                'high_importance': analysis_results['summary']['importance_levels'].get('high', 0),
-                'high_attention': analysis_results['summary']['attention_levels'].get('high', 0),
-                'timestamp': report_results['timestamp'],
-                'html_file': f"reports/newsletters/newsletter_{report_results['timestamp']}.html",
-                'text_file': f"reports/newsletters/newsletter_{report_results['timestamp']}.txt"
-            }
-            
-            logger.info("=== 実行完了 ===")
-            logger.info(f"収集記事数: {summary['collected_articles']}")
-            logger.info(f"分析記事数: {summary['analyzed_articles']}")
-            logger.info(f"高重要度記事: {summary['high_importance']}")
-            logger.info(f"高注目度記事: {summary['high_attention']}")
-            logger.info(f"HTMLレポート: {summary['html_file']}")
-            logger.info(f"テキストレポート: {summary['text_file']}")
+            with self._stage('report'):
+                report_results = self.reporter.generate_newsletter(analysis_results)
+            analysis_summary = analysis_results['summary']
             
+            summary = self._finish_pipeline(collected_count, analysis_summary, report_results)
+            summary['run_id'] = run_id
+            self.checkpoints.save(run_id, 'report', {
+                key: value for key, value in summary.items() if key != 'run_id'
+            })
             return summary
             
         except Exception as e:
-            logger.error(f"パイプライン実行中にエラーが発生: {e}")
-            return {'error': str(e)}
+            logger.error(f"パイプライン実行中にエラーが発生（{stage}段階）: {e}")
+            self.checkpoints.mark_failed(run_id, stage, str(e))
+            if stage != 'collect':
+                logger.info(f"再開するには: python main.py --resume {run_id} --from-stage {stage}")
+                return {'error': str(e), 'run_id': run_id, 'failed_stage': stage}
+            return {'error': str(e), 'run_id': run_id}
+    
+    def _finish_pipeline(self, collected_count: int, analysis_summary: dict, report_results: dict) -> dict:
+        """購読者別ニュースレターの生成と結果サマリーの作成"""
+        from dotenv import load_dotenv
+        from modules.personalizer import PersonalizedRenderer, load_subscribers
+        
+        load_dotenv()
+        
+        if report_results.get('cached'):
+            logger.info("内容に変更がないため既存レポートを再利用しました")
+        logger.info("レポート生成完了")
+        
+        # 購読者別ニュースレター（購読者リストがある場合のみ）
+        subscribers = load_subscribers(os.getenv('SUBSCRIBERS_FILE', 'data/subscribers.json'))
+        if subscribers:
+            logger.info("=== 購読者別ニュースレター生成 ===")
+            PersonalizedRenderer().save_editions(
+                report_results['content'], subscribers, report_results['timestamp']
+            )
+        
+        # 結果サマリー
+        summary = {
+            'collected_articles': collected_count,
+            'analyzed_articles': analysis_summary['total_articles'],
+            'high_importance': analysis_summary['importance_levels'].get('high', 0),
+            'high_attention': analysis_summary['attention_levels'].get('high', 0),
+            'timestamp': report_results['timestamp'],
+            'html_file': f"reports/newsletters/newsletter_{report_results['timestamp']}.html",
+            'text_file': f"reports/newsletters/newsletter_{report_results['timestamp']}.txt",
+            'report_reused': report_results.get('cached', False)
+        }
+        
+        logger.info("=== 実行完了 ===")
+        logger.info(f"収集記事数: {summary['collected_articles']}")
+        logger.info(f"分析記事数: {summary['analyzed_articles']}")
+        logger.info(f"高重要度記事: {summary['high_importance']}")
+        logger.info(f"高注目度記事: {summary['high_attention']}")
+        logger.info(f"HTMLレポート: {summary['html_file']}")
+        logger.info(f"テキストレポート: {summary['text_file']}")
+        
+        return summary
+    
+    def _run_streaming_stages(self):
+        """収集・分析・集計を1件ずつ流し、集計結果からレポートを生成"""
+        logger.info("=== 収集・分析フェーズ（ストリーミング） ===")
+        accumulator = self.reporter.new_accumulator()
+        with self._stage('collect_analyze'):
+            for article in self.analyzer.analyze_stream(self.collector.iter_articles()):
+                accumulator.add(article)
+        self.metrics.set('pipeline_collected_articles', accumulator.total)
+        logger.info(f"収集・分析完了: {accumulator.total}件の記事")
+        
+        if accumulator.total == 0:
+            return None
+        
+        analysis_summary = accumulator.summary.result()
+        self.analyzer.save_summary(analysis_summary)
+        
+        logger.info("=== レポート生成フェーズ ===")
+        with self._stage('report'):
+            report_results = self.reporter.generate_newsletter_from_accumulator(accumulator)
+        return accumulator.total, analysis_summary, report_results
     
     def start_scheduler(self):
         """スケジューラーを開始"""
-        self.scheduler = create_scheduler(self.run_full_pipeline, auto_schedule=True)
+        from modules.scheduler import create_scheduler
+        
+        self.scheduler = create_scheduler(
+            self.run_full_pipeline, auto_schedule=True, maintenance_function=self.run_compaction
+        )
         self.scheduler.start_scheduler()
+        self._publish_status('scheduler')
         
         try:
-            # スケジューラーを継続実行
-            while True:
-                import time
-                time.sleep(60)
+            # 次の実行時刻まではスケジューラーのスレッドが待機するため、ここでは停止まで待つだけ
+            self.scheduler.wait()
         except KeyboardInterrupt:
             logger.info("スケジューラーを停止します")
             if self.scheduler:
                 self.scheduler.stop_scheduler()
+        finally:
+            self.status.stop()
     
-    def run_manual(self):
+    def start_continuous(self, use_queue: bool = False):
+        """
+        ソースごとの継続収集と、蓄積した記事からの週次ニュースレター生成を開始
+        
+        Args:
+            use_queue: 取得をジョブキューに登録し、--mode worker のプロセスに実行させる
+        """
+        from modules.scheduler import ContinuousCollector
+        
+        self._track_source_yield()
+        queue = None
+        if use_queue:
+            from modules.job_queue import SQLiteJobQueue
+            queue = SQLiteJobQueue()
+        
+        self.scheduler = ContinuousCollector(
+            self.collector,
+            lambda: self.run_full_pipeline(from_store=True),
+            maintenance_function=self.run_compaction,
+            queue=queue,
+            yield_tracker=self.yield_tracker
+        )
+        self.scheduler.start()
+        self._publish_status('continuous')
+        
+        try:
+            self.scheduler.wait()
+        except KeyboardInterrupt:
+            logger.info("継続収集を停止します")
+            self.scheduler.stop()
+        finally:
+            self.status.stop()
+    
+    def _publish_status(self, mode: str):
+        """--mode status で別プロセスから読めるよう、状態ファイルの書き出しを開始"""
+        from modules.status import StatusPublisher
+        
+        self.status = StatusPublisher(mode, self.scheduler.get_status)
+        self.status.start()
+        logger.info(f"状態ファイル: {self.status.path}")
+    
+    def run_worker(self, stop_when_empty: bool = False) -> dict:
+        """ジョブキューから取得ジョブをリースして実行（記事は共有の記事ストアに保存）"""
+        from modules.job_queue import SQLiteJobQueue, QueueWorker
+        
+        self._track_source_yield()
+        worker = QueueWorker(SQLiteJobQueue(), self.collector)
+        try:
+            return worker.run(stop_when_empty=stop_when_empty)
+        except KeyboardInterrupt:
+            worker.stop()
+            return {'processed': worker.processed, 'failed': worker.failed}
+    
+    def _track_source_yield(self):
+        """ソースごとの新着状況の記録を開始（collector を最初に使う前に呼ぶ）"""
+        if ADAPTIVE_POLL_CONFIG['enabled']:
+            from modules.source_yield import SourceYieldTracker
+            self.yield_tracker = SourceYieldTracker()
+    
+    def run_compaction(self) -> dict:
+        """実行ごとのデータファイルをまとめ、保持期間を過ぎたデータを削除"""
+        from modules.compactor import Compactor
+        
+        compactor = Compactor(
+            store=self.analyzer.store,
+            repository=self.repository,
+            reports_dir=self.reporter.reports_dir,
+            search_index=self.reporter.search_index
+        )
+        return compactor.run()
+    
+    def run_manual(self, streaming: bool = False, resume_run_id: Optional[str] = None,
+                   from_stage: Optional[str] = None, from_store: bool = False):
         """手動実行"""
-        return self.run_full_pipeline()
+        return self.run_full_pipeline(
+            streaming=streaming, resume_run_id=resume_run_id, from_stage=from_stage, from_store=from_store
+        )
     
     def get_status(self) -> dict:
         """システム状態を取得"""
@@ -114,50 +402,245 @@ class AINewsletterSystem:
         if self.scheduler:
             scheduler_status = self.scheduler.get_status()
             status.update(scheduler_status)
+            status['scheduler_running'] = scheduler_status['is_running']
+        else:
+            # 別プロセスで実行中のスケジューラー（状態ファイル）
+            from modules.status import read_status
+            published = read_status()
+            if published:
+                status['scheduler_running'] = published['running']
+                status['next_run_time'] = published['next_run_time']
+                status['scheduler_process'] = published
+        
+        # このプロセスで記録したメトリクス（まだなければ最後に書き出した実行のもの）
+        snapshot = self.metrics.snapshot()
+        if any(snapshot.values()):
+            status['metrics'] = snapshot
+        else:
+            status['metrics'] = load_latest()
         
         return status
 
+def _worker_process(stop_when_empty: bool):
+    """ワーカープロセスのエントリポイント（プロセスごとにコンポーネントを生成）"""
+    AINewsletterSystem().run_worker(stop_when_empty=stop_when_empty)
+
+def run_workers(count: int, stop_when_empty: bool = False):
+    """ワーカーを count プロセス起動し、全て終了するまで待つ"""
+    if count <= 1:
+        return AINewsletterSystem().run_worker(stop_when_empty=stop_when_empty)
+    
+    import multiprocessing
+    processes = [
+        multiprocessing.Process(target=_worker_process, args=(stop_when_empty,), name=f"worker-{index}")
+        for index in range(count)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        logger.info("ワーカーを停止します")
+        for process in processes:
+            process.join()
+
+def print_status():
+    """
+    実行中のスケジューラーが書き出した状態ファイルを表示
+
+    パイプラインのモジュールは読み込まず、ネットワークにもアクセスしない。
+    """
+    from modules.status import read_status
+    
+    status = read_status()
+    print("=== システム状態 ===")
+    print(f"現在時刻: {datetime.now().isoformat()}")
+    if status is None:
+        print("スケジューラー実行中: False（状態ファイルがありません）")
+    else:
+        print(f"スケジューラー実行中: {status['running']}（{status['mode']}, PID {status['pid']}@{status['hostname']}, "
+              f"{status['age_seconds']:.0f}秒前に更新）")
+        if status['next_run_time']:
+            print(f"次回実行時刻: {status['next_run_time']}")
+        run = status.get('current_run')
+        if status['running'] and run:
+            print(f"実行中: {run['stage'] or '開始'}（開始 {run['started_at']}）")
+            progress = run.get('progress')
+            if progress:
+                print(f"  進捗: {progress['done']}/{progress['total']} {progress['unit']}")
+        last_run = status.get('last_run')
+        if last_run:
+            result = '成功' if last_run['status'] == 'success' else f"失敗（{last_run['error']}）"
+            print(f"最終実行: {last_run['run_id']} {last_run['finished_at']} {last_run['duration_seconds']:.1f}秒 {result}")
+            for stage, seconds in last_run['metrics'].get('stage_seconds', {}).items():
+                print(f"  {stage}: {seconds:.2f}秒")
+            return
+    
+    # 状態ファイルに最終実行がなければ、最後に書き出したメトリクスを表示
+    metrics = load_latest()
+    if metrics and metrics.get('run_id'):
+        print(f"最終実行のメトリクス: {metrics['run_id']}")
+        for entry in metrics['gauges'].get('pipeline_stage_last_seconds', []):
+            print(f"  {entry['labels']['stage']}: {entry['value']:.2f}秒")
+
+def print_source_yield():
+    """
+    継続収集で記録したソースごとの新着状況と取得間隔を表示
+
+    取得回数の削減は、記録を始めてから同じ期間を基準の間隔で取得した場合との差。
+    取りこぼしの可能性は、取得した記事が全て新着だった（前回の取得と重なりがない）回数。
+    """
+    from modules.source_yield import SourceYieldTracker
+    
+    rows = SourceYieldTracker().report()
+    print("=== ソース別の新着状況 ===")
+    if not rows:
+        print("記録がありません（--mode continuous / worker の取得で記録されます）")
+        return
+    print(f"{'ソース':<32}{'基準(分)':>9}{'現在(分)':>9}{'取得':>6}{'新着':>6}{'新着/取得':>10}{'連続失敗':>9}"
+          f"{'削減':>7}{'重なりなし':>11}{'平均遅延(分)':>13}  最終新着")
+    for row in rows:
+        delay = f"{row['mean_delay_seconds'] / 60:.1f}" if row['mean_delay_seconds'] is not None else '-'
+        print(f"{row['key'][:31]:<32}{row['base_interval'] / 60:>9.0f}{row['interval'] / 60:>9.0f}{row['fetches']:>6}"
+              f"{row['new_articles']:>6}{row['yield_per_fetch']:>10.2f}{row['failure_streak']:>9}"
+              f"{row['fetches_saved']:>7.0f}{row['no_overlap_fetches']:>11}{delay:>13}  {row['last_change_at'] or '-'}")
+    
+    fetches = sum(row['fetches'] for row in rows)
+    baseline = sum(row['baseline_fetches'] for row in rows)
+    print(f"\n取得回数: {fetches}回（基準の間隔では約{baseline:.0f}回、削減 {baseline - fetches:.0f}回）")
+    print(f"新着記事: {sum(row['new_articles'] for row in rows)}件  "
+          f"取りこぼしの可能性: {sum(row['no_overlap_fetches'] for row in rows)}回")
+
 def main():
     """メイン関数"""
     parser = argparse.ArgumentParser(description='AI最新情報キャッチアップシステム')
-    parser.add_argument('--mode', choices=['manual', 'scheduler', 'status'], 
+    parser.add_argument('--mode', choices=['manual', 'scheduler', 'continuous', 'worker', 'status', 'source-yield', 'backfill-trends', 'rescore', 'compact'], 
                        default='manual', help='実行モード')
     parser.add_argument('--auto-schedule', action='store_true', 
                        help='自動スケジューリングを有効にする')
+    parser.add_argument('--stream', action='store_true',
+                       help='記事を全件保持せずストリーミングで処理する')
+    parser.add_argument('--days', type=int, default=7,
+                       help='rescoreモードで再分析する日数')
+    parser.add_argument('--from-store', action='store_true',
+                       help='収集せず、継続収集で蓄積した記事からニュースレターを生成する')
+    parser.add_argument('--use-queue', action='store_true',
+                       help='continuousモードで取得をジョブキューに登録し、workerモードのプロセスに実行させる')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='workerモードで起動するワーカープロセス数')
+    parser.add_argument('--exit-when-empty', action='store_true',
+                       help='workerモードでキューが空になったら終了する')
+    parser.add_argument('--capture', action='store_true',
+                       help='収集時の生レスポンスをアーカイブに保存する')
+    parser.add_argument('--replay', metavar='RUN_ID',
+                       help='ネットワークの代わりにアーカイブ済みのレスポンスを使う')
+    parser.add_argument('--profile', action='store_true',
+                       help='段階ごとのCPUプロファイルを data/profiles に保存する')
+    parser.add_argument('--profile-mode', choices=['cprofile', 'sampling'],
+                       help='プロファイラー（cprofile: 関数ごとの集計とサンプリング / sampling: サンプリングのみで低負荷）')
+    parser.add_argument('--trace', action='store_true',
+                       help='実行・段階・ソース・HTTPリクエストのスパンを data/traces に保存する')
+    parser.add_argument('--resume', metavar='RUN_ID',
+                       help='指定した実行IDのチェックポイントから再開する')
+    parser.add_argument('--from-stage', choices=['analyze', 'report'],
+                       help='再開する段階（省略時は最後に完了した段階の次）')
     
     args = parser.parse_args()
+    if args.from_stage and not args.resume:
+        parser.error('--from-stage は --resume と一緒に指定してください')
+    if args.from_store and args.stream:
+        parser.error('--from-store と --stream は同時に指定できません')
+    if args.resume and args.stream:
+        parser.error('--stream の実行はチェックポイントを作らないため --resume できません')
+    
+    if args.capture and args.replay:
+        parser.error('--capture と --replay は同時に指定できません')
+    if args.profile and args.mode != 'manual':
+        parser.error('--profile は manual モードでのみ指定できます')
+    if args.trace and args.mode != 'manual':
+        parser.error('--trace は manual モードでのみ指定できます')
+    
+    if args.mode == 'status':
+        print_status()
+        return
+    if args.mode == 'source-yield':
+        print_source_yield()
+        return
     
     # システム初期化
-    system = AINewsletterSystem()
+    archive = None
+    if args.capture:
+        archive = ResponseArchive('capture')
+        logger.info(f"レスポンスをアーカイブに保存します: {archive.run_id}")
+    elif args.replay:
+        archive = ResponseArchive('replay', run_id=args.replay)
+    profiler = None
+    if args.profile:
+        from modules.profiler import PipelineProfiler
+        profiler = PipelineProfiler(mode=args.profile_mode)
+    system = AINewsletterSystem(archive=archive, profiler=profiler)
     
     if args.mode == 'manual':
         logger.info("手動実行モード")
-        result = system.run_manual()
+        tracer = tracing.start() if args.trace else None
+        result = system.run_manual(
+            streaming=args.stream, resume_run_id=args.resume, from_stage=args.from_stage, from_store=args.from_store
+        )
+        if profiler:
+            profiler.save()
+            print(f"プロファイル: {profiler.output_dir}/report.txt（フレームグラフ: pipeline.collapsed）")
+        if tracer:
+            tracing.stop()
+            paths = tracer.export(result.get('run_id'))
+            print(f"トレース: {paths['jsonl']}（Chrome トレース: {paths['chrome']}）")
         
         if 'error' in result:
             logger.error(f"実行エラー: {result['error']}")
+            if result.get('failed_stage'):
+                print(f"再開: python main.py --resume {result['run_id']} --from-stage {result['failed_stage']}")
             sys.exit(1)
         else:
             logger.info("手動実行完了")
             print(f"\n=== 実行結果 ===")
+            if result.get('run_id'):
+                print(f"実行ID: {result['run_id']}")
             print(f"収集記事数: {result['collected_articles']}")
             print(f"分析記事数: {result['analyzed_articles']}")
             print(f"高重要度記事: {result['high_importance']}")
             print(f"高注目度記事: {result['high_attention']}")
             print(f"HTMLレポート: {result['html_file']}")
             print(f"テキストレポート: {result['text_file']}")
+            if args.capture:
+                print(f"レスポンスアーカイブ: {archive.run_id}（再生: python main.py --replay {archive.run_id}）")
     
     elif args.mode == 'scheduler':
         logger.info("スケジューラーモード")
         system.start_scheduler()
     
-    elif args.mode == 'status':
-        status = system.get_status()
-        print("=== システム状態 ===")
-        print(f"現在時刻: {status['system_time']}")
-        print(f"スケジューラー実行中: {status['scheduler_running']}")
-        if status['next_run_time']:
-            print(f"次回実行時刻: {status['next_run_time']}")
+    elif args.mode == 'continuous':
+        logger.info("継続収集モード")
+        system.start_continuous(use_queue=args.use_queue)
+    
+    elif args.mode == 'worker':
+        logger.info(f"ワーカーモード（{args.workers}プロセス）")
+        run_workers(args.workers, stop_when_empty=args.exit_when_empty)
+    
+    elif args.mode == 'backfill-trends':
+        weeks = system.reporter.trend_store.backfill(store=system.analyzer.store)
+        print(f"トレンドストアをバックフィルしました: {weeks}週")
+    
+    elif args.mode == 'rescore':
+        results = system.analyzer.rescore(start_date=date.today() - timedelta(days=args.days))
+        print(f"再スコアリング完了: {len(results['articles'])}件")
+    
+    elif args.mode == 'compact':
+        result = system.run_compaction()
+        print("=== コンパクション結果 ===")
+        print(f"旧形式ファイル取り込み: {result['legacy_files']}件")
+        print(f"まとめたパーティション: {result['compacted_partitions']}件（{result['merged_files']}ファイル, 重複{result['duplicates']}件）")
+        print(f"保持期間切れで削除したパーティション: {result['dropped_partitions']}件")
+        print(f"削除したレポート: {result['pruned_reports']}号")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
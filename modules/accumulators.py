@@ -0,0 +1,136 @@
+"""
+集計アキュムレーターモジュール
+記事を1件ずつ受け取り、上位k件と件数集計だけを保持する（ストリーミング処理用）
+"""
+
+import heapq
+from typing import List, Dict, Any, Callable, Generic, TypeVar
+
+from config.categories import CATEGORIES
+from modules.article import Article, Level
+
+T = TypeVar('T')
+
+
+class TopK(Generic[T]):
+    def __init__(self, k: int, key: Callable[[T], float]):
+        """
+        スコア上位k件を保持するヒープ
+
+        同じスコアの場合は先に追加されたものを残す（安定ソートの結果と一致させる）。
+        """
+        self.k = k
+        self.key = key
+        self._heap = []
+        self._seq = 0
+
+    def add(self, item: T):
+        entry = (self.key(item), -self._seq, item)
+        self._seq += 1
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+    def items(self) -> List[T]:
+        """スコアの高い順"""
+        return [entry[2] for entry in sorted(self._heap, key=lambda e: e[:2], reverse=True)]
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+
+class SummaryAccumulator:
+    def __init__(self, categories: Dict[str, Any] = None, top_count: int = 10):
+        """分析結果のサマリー（カテゴリ・レベル別件数とトップ記事）を逐次集計"""
+        self.categories = categories or CATEGORIES
+        self.total = 0
+        self.category_counts = {
+            category_id: {'count': 0, 'high_importance': 0, 'high_attention': 0}
+            for category_id in self.categories
+        }
+        self.importance_levels = {level.value: 0 for level in Level}
+        self.attention_levels = {level.value: 0 for level in Level}
+        self.top_articles = TopK(top_count, key=lambda a: a.combined_score)
+
+    def add(self, article: Article):
+        self.total += 1
+
+        counts = self.category_counts.get(article.category)
+        if counts is not None:
+            counts['count'] += 1
+            counts['high_importance'] += article.importance_level is Level.HIGH
+            counts['high_attention'] += article.attention_level is Level.HIGH
+
+        if article.importance_level is not None:
+            self.importance_levels[article.importance_level.value] += 1
+        if article.attention_level is not None:
+            self.attention_levels[article.attention_level.value] += 1
+
+        self.top_articles.add(article)
+
+    def result(self) -> Dict[str, Any]:
+        """NewsAnalyzer のサマリーと同じ形式"""
+        return {
+            'total_articles': self.total,
+            'categories': {
+                category_id: dict(name=self.categories[category_id]['name'], **counts)
+                for category_id, counts in self.category_counts.items()
+            },
+            'importance_levels': dict(self.importance_levels),
+            'attention_levels': dict(self.attention_levels),
+            'top_articles': [
+                {
+                    'title': a.title,
+                    'link': a.link,
+                    'category': a.category_name,
+                    'importance_score': a.importance_score or 0.0,
+                    'attention_score': a.attention_score or 0.0,
+                    'source': a.source
+                }
+                for a in self.top_articles.items()
+            ],
+            'category_breakdown': {}
+        }
+
+
+class NewsletterAccumulator:
+    def __init__(self, trend_store, topic_detector, week: str,
+                 candidates_per_category: int = 30, important_count: int = 15):
+        """
+        ニュースレター生成に必要な分だけを逐次集計
+
+        Args:
+            trend_store: 週次集計行の作成に使う TrendStore
+            topic_detector: 語の出現数カウンタの作成に使う TopicDetector
+            week: 集計対象の週キー
+            candidates_per_category: カテゴリごとに保持する候補数（重複除去で減る分を見込む）
+            important_count: 保持する重要記事数
+        """
+        self.trend_store = trend_store
+        self.topic_detector = topic_detector
+        self.summary = SummaryAccumulator()
+        self.by_category = {
+            category_id: TopK(candidates_per_category, key=lambda a: a.combined_score)
+            for category_id in CATEGORIES
+        }
+        self.important = TopK(important_count, key=lambda a: a.combined_score)
+        self.trend_row = trend_store.new_row(week)
+        self.term_counter = topic_detector.new_counter()
+
+    @property
+    def total(self) -> int:
+        return self.summary.total
+
+    def add(self, article: Article):
+        self.summary.add(article)
+
+        candidates = self.by_category.get(article.category or 'llm_chatbot')
+        if candidates is not None:
+            candidates.add(article)
+
+        if article.importance_level is Level.HIGH or article.attention_level is Level.HIGH:
+            self.important.add(article)
+
+        self.trend_store.add_to_row(self.trend_row, article)
+        self.topic_detector.add_terms(self.term_counter, article)
@@ -3,93 +3,143 @@
 収集した記事のカテゴリ分類と重要度評価
 """
 
-import pandas as pd
-import numpy as np
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Iterable, Iterator
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
+import time
 import json
 import os
 import re
 
 from config.categories import CATEGORIES, IMPORTANCE_CRITERIA
+from modules.article_store import ArticleStore, article_id
+from modules.article import Article, Level, Priority, to_articles, to_dicts
+from modules.accumulators import SummaryAccumulator
+from modules.metrics import MetricsRegistry
 
 logger = logging.getLogger(__name__)
 
+# 分析結果として保存する列（タイトル等の元データは収集段階で保存済み）
+ANALYSIS_FIELDS = [
+    'id', 'category', 'category_score',
+    'importance_score', 'importance_level',
+    'attention_score', 'attention_level'
+]
+# 値の種類が少なく辞書符号化する列
+ANALYSIS_DICTIONARY_FIELDS = ['category', 'importance_level', 'attention_level']
+
 class NewsAnalyzer:
-    def __init__(self):
+    def __init__(self, repository=None, metrics: MetricsRegistry = None):
         self.categories = CATEGORIES
         self.importance_criteria = IMPORTANCE_CRITERIA
+        self.store = ArticleStore()
+        self.repository = repository
+        self.metrics = metrics or MetricsRegistry()
         
         # 翻訳・サマリー機能は削除済み
     
-    def analyze_articles(self, articles: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """記事の分析を実行"""
+    def analyze_articles(self, articles: List[Article]) -> Dict[str, Any]:
+        """記事の分析を実行（辞書で渡された記事は Article に変換）"""
         logger.info("記事分析開始")
+        start = time.perf_counter()
+        articles = to_articles(articles)
         
         # カテゴリ分類
-        categorized_articles = self._categorize_articles(articles)
+        self._categorize_articles(articles)
         
         # 重要度評価
-        analyzed_articles = self._evaluate_importance(categorized_articles)
+        self._evaluate_importance(articles)
         
         # 注目度計算
-        articles_with_attention = self._calculate_attention_score(analyzed_articles)
+        self._calculate_attention_score(articles)
         
         # 翻訳・サマリー機能は削除（必要最小限の機能のみ）
-        articles_with_enhancements = articles_with_attention
         
         # 分析結果の集計
-        summary = self._create_analysis_summary(articles_with_enhancements)
+        summary = self._create_analysis_summary(articles)
+        self._record_throughput(len(articles), time.perf_counter() - start)
         
         # 結果保存
-        self._save_analysis_results(articles_with_enhancements, summary)
+        self._save_analysis_results(articles, summary)
         
         return {
-            'articles': articles_with_enhancements,
+            'articles': articles,
             'summary': summary
         }
     
-    def _categorize_articles(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """記事をカテゴリに分類"""
-        categorized_articles = []
+    def analyze_stream(self, articles: Iterable[Article]) -> Iterator[Article]:
+        """
+        記事を1件ずつ分析して返す（ストリーミング用）
+        
+        分析結果はバッチ単位で記事ストア・リポジトリに書き込む。サマリーは呼び出し側で
+        SummaryAccumulator などに集計し、save_summary で保存する。
+        """
+        logger.info("記事分析開始（ストリーミング）")
+        run_id = datetime.now().strftime('%Y%m%d_%H%M%S')
+        batch = []
+        batch_no = 0
         
         for article in articles:
-            title = article.get('title', '') or ''
-            description = article.get('description', '') or ''
-            content = f"{title.lower()} {description.lower()}"
-            
-            # 各カテゴリのキーワードとのマッチング
-            best_category = None
-            best_score = 0
+            if not isinstance(article, Article):
+                article = Article.from_dict(article)
+            start = time.perf_counter()
+            self._categorize_article(article)
+            self._evaluate_article_importance(article)
+            self._calculate_article_attention(article)
+            self.metrics.inc('analyzer_seconds_total', time.perf_counter() - start)
+            self.metrics.inc('analyzer_articles_total')
+            batch.append(article)
             
-            for category_id, category_info in self.categories.items():
-                score = self._calculate_category_score(content, category_info['keywords'])
-                
-                if score > best_score:
-                    best_score = score
-                    best_category = category_id
+            if len(batch) >= self.store.batch_size:
+                self._save_analysis_batch(batch, f"{run_id}_{batch_no:04d}")
+                batch_no += 1
+                yield from batch
+                batch = []
+        
+        if batch:
+            self._save_analysis_batch(batch, f"{run_id}_{batch_no:04d}")
+            yield from batch
+    
+    def _record_throughput(self, count: int, elapsed: float):
+        """分析した記事数と所要時間（保存を除く）を記録"""
+        self.metrics.inc('analyzer_articles_total', count)
+        self.metrics.inc('analyzer_seconds_total', elapsed)
+        self.metrics.set('analyzer_articles_per_second', count / elapsed if elapsed > 0 else 0.0)
+    
+    def _categorize_articles(self, articles: List[Article]) -> List[Article]:
+        """記事をカテゴリに分類"""
+        for article in articles:
+            self._categorize_article(article)
+        return articles
+    
+    def _categorize_article(self, article: Article):
+        """記事1件をカテゴリに分類"""
+        content = f"{article.title.lower()} {article.description.lower()}"
+        
+        # 各カテゴリのキーワードとのマッチング
+        best_category = None
+        best_score = 0
+        
+        for category_id, category_info in self.categories.items():
+            score = self._calculate_category_score(content, category_info['keywords'])
             
-            # スコアが閾値を超える場合のみカテゴリを設定（閾値を下げて分類精度向上）
-            if best_score > 0.05:  # 5%以上のマッチング（より多くの記事を分類）
-                article['category'] = best_category
-                article['category_score'] = best_score
-                article['category_name'] = self.categories[best_category]['name']
+            if score > best_score:
+                best_score = score
+                best_category = category_id
+        
+        # スコアが閾値を超える場合のみカテゴリを設定（閾値を下げて分類精度向上）
+        if best_score > 0.05:  # 5%以上のマッチング（より多くの記事を分類）
+            article.category = best_category
+            article.category_score = best_score
+        else:
+            # 一般カテゴリは削除し、最もスコアの高いカテゴリに分類
+            if best_category:
+                article.category = best_category
+                article.category_score = best_score
             else:
-                # 一般カテゴリは削除し、最もスコアの高いカテゴリに分類
-                if best_category:
-                    article['category'] = best_category
-                    article['category_score'] = best_score
-                    article['category_name'] = self.categories[best_category]['name']
-                else:
-                    # どのカテゴリにもマッチしない場合のみ一般に分類
-                    article['category'] = 'llm_chatbot'  # デフォルトでLLMカテゴリに
-                    article['category_score'] = 0
-                    article['category_name'] = self.categories['llm_chatbot']['name']
-            
-            categorized_articles.append(article)
-        
-        return categorized_articles
+                # どのカテゴリにもマッチしない場合のみ一般に分類
+                article.category = 'llm_chatbot'  # デフォルトでLLMカテゴリに
+                article.category_score = 0.0
     
     def _calculate_category_score(self, content: str, keywords: List[str]) -> float:
         """カテゴリとのマッチングスコアを計算"""
@@ -105,45 +155,39 @@ class NewsAnalyzer:
         
         return matches / total_keywords if total_keywords > 0 else 0.0
     
-    def _evaluate_importance(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _evaluate_importance(self, articles: List[Article]) -> List[Article]:
         """記事の重要度を評価"""
-        evaluated_articles = []
-        
         for article in articles:
-            importance_score = self._calculate_importance_score(article)
-            importance_level = self._determine_importance_level(importance_score)
-            
-            article['importance_score'] = importance_score
-            article['importance_level'] = importance_level
-            article['importance_description'] = self.importance_criteria[importance_level]['description']
-            
-            evaluated_articles.append(article)
-        
-        return evaluated_articles
+            self._evaluate_article_importance(article)
+        return articles
+    
+    def _evaluate_article_importance(self, article: Article):
+        """記事1件の重要度を評価"""
+        importance_score = self._calculate_importance_score(article)
+        article.importance_score = importance_score
+        article.importance_level = self._determine_importance_level(importance_score)
     
-    def _calculate_importance_score(self, article: Dict[str, Any]) -> float:
+    def _calculate_importance_score(self, article: Article) -> float:
         """重要度スコアを計算"""
         score = 0.0
         
         # ソースの信頼性
-        source_priority = article.get('priority', 'medium')
-        if source_priority == 'high':
+        if article.priority is Priority.HIGH:
             score += 0.3
-        elif source_priority == 'medium':
+        elif article.priority is Priority.MEDIUM:
             score += 0.2
         else:
             score += 0.1
         
         # カテゴリスコア
-        category_score = article.get('category_score', 0)
-        score += category_score * 0.3
+        score += (article.category_score or 0.0) * 0.3
         
         # タイトルの重要キーワード
-        title_importance = self._analyze_title_importance(article.get('title', ''))
+        title_importance = self._analyze_title_importance(article.title)
         score += title_importance * 0.2
         
         # 内容の詳細度
-        content_detail = self._analyze_content_detail(article.get('description', ''))
+        content_detail = self._analyze_content_detail(article.description)
         score += content_detail * 0.2
         
         return min(score, 1.0)  # 最大1.0に制限
@@ -190,42 +234,39 @@ class NewsAnalyzer:
         
         return (length_score + technical_score) / 2
     
-    def _determine_importance_level(self, score: float) -> str:
+    def _determine_importance_level(self, score: float) -> Level:
         """重要度レベルを決定"""
         if score >= 0.7:
-            return 'high'
+            return Level.HIGH
         elif score >= 0.4:
-            return 'medium'
+            return Level.MEDIUM
         else:
-            return 'low'
+            return Level.LOW
     
-    def _calculate_attention_score(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _calculate_attention_score(self, articles: List[Article]) -> List[Article]:
         """注目度スコアを計算"""
-        articles_with_attention = []
-        
         for article in articles:
-            attention_score = self._calculate_attention_metrics(article)
-            article['attention_score'] = attention_score
-            article['attention_level'] = self._determine_attention_level(attention_score)
-            
-            articles_with_attention.append(article)
-        
-        return articles_with_attention
+            self._calculate_article_attention(article)
+        return articles
     
-    def _calculate_attention_metrics(self, article: Dict[str, Any]) -> float:
+    def _calculate_article_attention(self, article: Article):
+        """記事1件の注目度スコアを計算"""
+        attention_score = self._calculate_attention_metrics(article)
+        article.attention_score = attention_score
+        article.attention_level = self._determine_attention_level(attention_score)
+    
+    def _calculate_attention_metrics(self, article: Article) -> float:
         """注目度メトリクスを計算"""
         score = 0.0
         
         # 重要度スコア
-        importance_score = article.get('importance_score', 0)
-        score += importance_score * 0.4
+        score += (article.importance_score or 0.0) * 0.4
         
         # カテゴリスコア
-        category_score = article.get('category_score', 0)
-        score += category_score * 0.3
+        score += (article.category_score or 0.0) * 0.3
         
         # 時事性（新しい記事ほど高スコア）
-        days_old = self._calculate_days_old(article.get('published_date'))
+        days_old = self._calculate_days_old(article.published_date)
         recency_score = max(0, 1 - (days_old / 7))  # 1週間以内
         score += recency_score * 0.3
         
@@ -246,8 +287,7 @@ class NewsAnalyzer:
         now = datetime.now()
         if pub_date.tzinfo is not None:
             # pub_dateがタイムゾーン情報を持つ場合、nowもタイムゾーン対応にする
-            import pytz
-            now = now.replace(tzinfo=pytz.UTC)
+            now = now.replace(tzinfo=timezone.utc)
         elif now.tzinfo is not None:
             # nowがタイムゾーン情報を持つ場合、pub_dateのタイムゾーン情報を削除
             pub_date = pub_date.replace(tzinfo=None)
@@ -255,83 +295,60 @@ class NewsAnalyzer:
         days_old = (now - pub_date).days
         return max(0, days_old)
     
-    def _determine_attention_level(self, score: float) -> str:
+    def _determine_attention_level(self, score: float) -> Level:
         """注目度レベルを決定"""
         if score >= 0.7:
-            return 'high'
+            return Level.HIGH
         elif score >= 0.4:
-            return 'medium'
+            return Level.MEDIUM
         else:
-            return 'low'
+            return Level.LOW
     
-    def _create_analysis_summary(self, articles: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _create_analysis_summary(self, articles: List[Article]) -> Dict[str, Any]:
         """分析結果のサマリーを作成"""
-        summary = {
-            'total_articles': len(articles),
-            'categories': {},
-            'importance_levels': {},
-            'attention_levels': {},
-            'top_articles': [],
-            'category_breakdown': {}
-        }
-        
-        # カテゴリ別集計
-        for category_id, category_info in self.categories.items():
-            category_articles = [a for a in articles if a.get('category') == category_id]
-            summary['categories'][category_id] = {
-                'name': category_info['name'],
-                'count': len(category_articles),
-                'high_importance': len([a for a in category_articles if a.get('importance_level') == 'high']),
-                'high_attention': len([a for a in category_articles if a.get('attention_level') == 'high'])
-            }
-        
-        # 重要度レベル別集計
-        for level in ['high', 'medium', 'low']:
-            level_articles = [a for a in articles if a.get('importance_level') == level]
-            summary['importance_levels'][level] = len(level_articles)
-        
-        # 注目度レベル別集計
-        for level in ['high', 'medium', 'low']:
-            level_articles = [a for a in articles if a.get('attention_level') == level]
-            summary['attention_levels'][level] = len(level_articles)
-        
-        # トップ記事（重要度・注目度が高いもの）
-        top_articles = sorted(
-            articles,
-            key=lambda x: (x.get('importance_score', 0) + x.get('attention_score', 0)),
-            reverse=True
-        )[:10]
-        
-        summary['top_articles'] = [
-            {
-                'title': a.get('title', ''),
-                'link': a.get('link', ''),
-                'category': a.get('category_name', ''),
-                'importance_score': a.get('importance_score', 0),
-                'attention_score': a.get('attention_score', 0),
-                'source': a.get('source', '')
-            }
-            for a in top_articles
-        ]
-        
-        return summary
+        accumulator = SummaryAccumulator(self.categories)
+        for article in articles:
+            accumulator.add(article)
+        return accumulator.result()
     
-    def _save_analysis_results(self, articles: List[Dict[str, Any]], summary: Dict[str, Any]):
-        """分析結果を保存"""
+    def _save_analysis_results(self, articles: List[Article], summary: Dict[str, Any]):
+        """分析結果を記事IDをキーにした差分として記事ストアに追記"""
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         
-        # 記事データ保存
-        articles_filename = f"data/collected/analyzed_articles_{timestamp}.json"
-        os.makedirs(os.path.dirname(articles_filename), exist_ok=True)
-        
-        with open(articles_filename, 'w', encoding='utf-8') as f:
-            json.dump(articles, f, ensure_ascii=False, indent=2, default=str)
+        articles_path = self._save_analysis_batch(articles, timestamp)
+        summary_path = self.save_summary(summary, timestamp)
         
-        # サマリー保存
-        summary_filename = f"data/collected/analysis_summary_{timestamp}.json"
-        with open(summary_filename, 'w', encoding='utf-8') as f:
-            json.dump(summary, f, ensure_ascii=False, indent=2, default=str)
-        
-        logger.info(f"分析結果保存完了: {articles_filename}, {summary_filename}")
+        logger.info(f"分析結果保存完了: {articles_path}, {summary_path}")
+    
+    def _save_analysis_batch(self, articles: List[Article], run_id: str) -> str:
+        """スコアとレベルのみを列指向で保存（元データとは読み込み時に結合）"""
+        records = to_dicts(articles)
+        for article, record in zip(articles, records):
+            article.id = article.id or article_id(record)
+            record['id'] = article.id
+        
+        path = self.store.write_columns(
+            'analysis', records, ANALYSIS_FIELDS,
+            dictionary_fields=ANALYSIS_DICTIONARY_FIELDS,
+            run_id=run_id
+        )
+        
+        if self.repository is not None:
+            self.repository.upsert_articles(records)
+        
+        return path
+    
+    def save_summary(self, summary: Dict[str, Any], run_id: str = None) -> str:
+        """分析サマリーを記事ストアに追記"""
+        run_id = run_id or datetime.now().strftime('%Y%m%d_%H%M%S')
+        return self.store.write('summaries', [dict(summary, run_id=run_id)], run_id=run_id)
+    
+    def load_analyzed_articles(self, start_date=None, end_date=None) -> List[Article]:
+        """保存済みの収集記事と分析結果を結合して読み込み"""
+        return to_articles(self.store.read_joined('articles', 'analysis', start_date, end_date))
     
- 
\ No newline at end of file
+    def rescore(self, start_date=None, end_date=None) -> Dict[str, Any]:
+        """保存済みの収集記事を再分析（書き込むのはスコアの差分のみ）"""
+        articles = self.store.read_articles(start_date, end_date)
+        logger.info(f"再スコアリング対象: {len(articles)}件")
+        return self.analyze_articles(articles)
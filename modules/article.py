@@ -0,0 +1,178 @@
+"""
+記事レコードモジュール
+パイプライン内で受け渡す記事を __slots__ 付きのデータクラスで表現（辞書との変換はJSON・テンプレートの境界でのみ行う）
+"""
+
+import sys
+from enum import Enum
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Dict, Any, Iterable, Optional, Union
+
+from config.categories import CATEGORIES, IMPORTANCE_CRITERIA
+
+
+class _ValueEnum(str, Enum):
+    """文字列として比較・JSON化でき、テンプレートでは値がそのまま表示される列挙型"""
+
+    def __str__(self) -> str:
+        return self.value
+
+
+class SourceType(_ValueEnum):
+    RSS = 'rss'
+    API = 'api'
+    SCRAPING = 'scraping'
+    ARXIV = 'arxiv'
+    OTHER = 'other'
+
+
+class Priority(_ValueEnum):
+    HIGH = 'high'
+    MEDIUM = 'medium'
+    LOW = 'low'
+
+
+class Level(_ValueEnum):
+    HIGH = 'high'
+    MEDIUM = 'medium'
+    LOW = 'low'
+
+
+# 専用の属性を持つキー（これ以外のキーは extra に保持）
+FIELDS = [
+    'id', 'title', 'link', 'description', 'published_date',
+    'source', 'source_type', 'priority', 'keyword',
+    'category', 'category_score',
+    'importance_score', 'importance_level',
+    'attention_score', 'attention_level'
+]
+
+# 記事から計算できるため保持しないキー（辞書への変換時に付与）
+DERIVED_FIELDS = ['category_name', 'importance_description', 'combined_score']
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    """ソース名・カテゴリIDなど種類の少ない文字列を1つのオブジェクトに共有"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _enum(enum_type, value, default=None):
+    if value is None or isinstance(value, enum_type):
+        return value if value is not None else default
+    try:
+        return enum_type(value)
+    except ValueError:
+        return default
+
+
+def _float(value: Any) -> Optional[float]:
+    return float(value) if value is not None else None
+
+
+def _parse_datetime(value: Any) -> Any:
+    """ISO形式の文字列は datetime に戻す（それ以外はそのまま）"""
+    if isinstance(value, str) and value:
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return value
+    return value or None
+
+
+@dataclass(slots=True, eq=False)
+class Article:
+    title: str
+    link: str = ''
+    description: str = ''
+    published_date: Optional[Union[datetime, str]] = None
+    source: str = ''
+    source_type: SourceType = SourceType.OTHER
+    priority: Priority = Priority.MEDIUM
+    keyword: Optional[str] = None
+    id: Optional[str] = None
+
+    # 分析結果（未分析のものは None）
+    category: Optional[str] = None
+    category_score: Optional[float] = None
+    importance_score: Optional[float] = None
+    importance_level: Optional[Level] = None
+    attention_score: Optional[float] = None
+    attention_level: Optional[Level] = None
+
+    extra: Optional[Dict[str, Any]] = None
+
+    @property
+    def category_name(self) -> str:
+        category = CATEGORIES.get(self.category)
+        return category['name'] if category else ''
+
+    @property
+    def importance_description(self) -> str:
+        criteria = IMPORTANCE_CRITERIA.get(self.importance_level)
+        return criteria['description'] if criteria else ''
+
+    @property
+    def combined_score(self) -> float:
+        """重要度と注目度の合計（並び替え用）"""
+        return (self.importance_score or 0.0) + (self.attention_score or 0.0)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Article':
+        """辞書（収集結果・ストア・リポジトリの行）から生成"""
+        extra = {
+            key: value for key, value in data.items()
+            if key not in FIELDS and key not in DERIVED_FIELDS
+        }
+        return cls(
+            title=data.get('title') or '',
+            link=data.get('link') or '',
+            description=data.get('description') or '',
+            published_date=_parse_datetime(data.get('published_date')),
+            source=_intern(data.get('source') or ''),
+            source_type=_enum(SourceType, data.get('source_type'), SourceType.OTHER),
+            priority=_enum(Priority, data.get('priority'), Priority.MEDIUM),
+            keyword=_intern(data.get('keyword')),
+            id=data.get('id'),
+            category=_intern(data.get('category')),
+            category_score=_float(data.get('category_score')),
+            importance_score=_float(data.get('importance_score')),
+            importance_level=_enum(Level, data.get('importance_level')),
+            attention_score=_float(data.get('attention_score')),
+            attention_level=_enum(Level, data.get('attention_level')),
+            extra=extra or None
+        )
+
+    def to_dict(self, derived: bool = False) -> Dict[str, Any]:
+        """
+        JSON・テンプレート用の辞書に変換（値が None の項目は含めない）
+
+        Args:
+            derived: カテゴリ名・重要度の説明・合計スコアも含める
+        """
+        data = {}
+        for field in FIELDS:
+            value = getattr(self, field)
+            if value is None:
+                continue
+            data[field] = value.value if isinstance(value, Enum) else value
+        if self.extra:
+            data.update(self.extra)
+        if derived:
+            data['category_name'] = self.category_name
+            data['importance_description'] = self.importance_description
+            data['combined_score'] = self.combined_score
+        return data
+
+
+def to_articles(items: Iterable[Union[Article, Dict[str, Any]]]) -> List[Article]:
+    """辞書が混ざっていれば Article に変換"""
+    return [item if isinstance(item, Article) else Article.from_dict(item) for item in items]
+
+
+def to_dicts(articles: Iterable[Union[Article, Dict[str, Any]]], derived: bool = False) -> List[Dict[str, Any]]:
+    """Article を辞書に変換（辞書はそのまま）"""
+    return [
+        article.to_dict(derived) if isinstance(article, Article) else article
+        for article in articles
+    ]
@@ -0,0 +1,198 @@
+"""
+記事リポジトリモジュール
+収集・分析・レポート生成の各段階で共有するSQLite（WALモード）の記事データベース
+"""
+
+import os
+import json
+import sqlite3
+import threading
+from datetime import datetime, date
+from typing import List, Dict, Any, Iterable, Optional
+import logging
+
+from config.storage import STORAGE_CONFIG
+from modules.article_store import canonical_url, article_id
+
+logger = logging.getLogger(__name__)
+
+# テーブルの列（これ以外のキーは extra にJSONで保存）
+COLUMNS = [
+    'id', 'canonical_url', 'title', 'link', 'description', 'published_date', 'collected_at',
+    'source', 'source_type', 'priority', 'keyword',
+    'category', 'category_name', 'category_score',
+    'importance_score', 'importance_level', 'importance_description',
+    'attention_score', 'attention_level', 'combined_score'
+]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id TEXT PRIMARY KEY,
+    canonical_url TEXT NOT NULL,
+    title TEXT NOT NULL,
+    link TEXT,
+    description TEXT,
+    published_date TEXT,
+    collected_at TEXT,
+    source TEXT,
+    source_type TEXT,
+    priority TEXT,
+    keyword TEXT,
+    category TEXT,
+    category_name TEXT,
+    category_score REAL,
+    importance_score REAL,
+    importance_level TEXT,
+    importance_description TEXT,
+    attention_score REAL,
+    attention_level TEXT,
+    combined_score REAL,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_articles_canonical_url ON articles (canonical_url);
+CREATE INDEX IF NOT EXISTS idx_articles_published_date ON articles (published_date);
+CREATE INDEX IF NOT EXISTS idx_articles_category_score ON articles (category, combined_score DESC);
+CREATE INDEX IF NOT EXISTS idx_articles_importance ON articles (importance_level, importance_score DESC);
+"""
+
+# 既存の値を新しい値がNULLのときは保持する（収集段階の再登録でスコアを消さない）
+_UPSERT_SQL = (
+    f"INSERT INTO articles ({', '.join(COLUMNS)}, extra) "
+    f"VALUES ({', '.join('?' for _ in COLUMNS)}, ?) "
+    "ON CONFLICT(id) DO UPDATE SET "
+    + ', '.join(
+        f"{column} = COALESCE(excluded.{column}, articles.{column})"
+        for column in COLUMNS if column not in ('id', 'collected_at')
+    )
+    + ", extra = COALESCE(excluded.extra, articles.extra)"
+)
+
+_TOP_BY_CATEGORY_SQL = (
+    "SELECT * FROM articles "
+    "WHERE category = ? AND published_date >= ? "
+    "ORDER BY combined_score DESC LIMIT ?"
+)
+
+_SINCE_SQL = "SELECT * FROM articles WHERE published_date >= ? ORDER BY published_date"
+
+
+def _to_iso(value: Any) -> Optional[str]:
+    """日時をタイムゾーンなしのISO文字列に揃える（文字列比較で範囲検索するため）"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return value
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone().replace(tzinfo=None)
+        return value.isoformat(timespec='seconds')
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+class ArticleRepository:
+    def __init__(self, db_path: str = None):
+        """
+        記事リポジトリを初期化
+
+        Args:
+            db_path: SQLiteデータベースのパス
+        """
+        self.db_path = db_path or STORAGE_CONFIG['repository_path']
+        self._local = threading.local()
+
+        os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+        conn = self._connection()
+        conn.executescript(_SCHEMA)
+        conn.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        """スレッドごとの接続（WALモードで読み込みと書き込みを並行可能にする）"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, cached_statements=64)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def upsert_articles(self, articles: Iterable[Dict[str, Any]]) -> int:
+        """記事を一括登録・更新（記事IDが同じものは上書き）"""
+        collected_at = datetime.now().isoformat(timespec='seconds')
+        rows = [self._to_row(article, collected_at) for article in articles]
+
+        conn = self._connection()
+        with conn:
+            conn.executemany(_UPSERT_SQL, rows)
+
+        logger.info(f"記事リポジトリ更新: {len(rows)}件")
+        return len(rows)
+
+    def top_by_category(self, categories: Iterable[str], since: datetime,
+                        limit: int = 10) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        カテゴリごとにスコア上位の記事を取得（カテゴリ・スコアの索引を使用）
+
+        Args:
+            categories: 対象カテゴリID
+            since: この日時以降に公開された記事を対象にする
+            limit: カテゴリごとの最大件数
+        """
+        conn = self._connection()
+        since_iso = _to_iso(since)
+        return {
+            category: [
+                self._from_row(row)
+                for row in conn.execute(_TOP_BY_CATEGORY_SQL, (category, since_iso, limit))
+            ]
+            for category in categories
+        }
+
+    def articles_since(self, since: datetime) -> List[Dict[str, Any]]:
+        """指定日時以降に公開された記事を取得"""
+        conn = self._connection()
+        return [self._from_row(row) for row in conn.execute(_SINCE_SQL, (_to_iso(since),))]
+
+    def delete_before(self, before: datetime) -> int:
+        """指定日時より前に公開された記事を削除"""
+        conn = self._connection()
+        with conn:
+            cursor = conn.execute("DELETE FROM articles WHERE published_date < ?", (_to_iso(before),))
+        logger.info(f"記事リポジトリから削除: {cursor.rowcount}件")
+        return cursor.rowcount
+
+    def count(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _to_row(self, article: Dict[str, Any], collected_at: str) -> tuple:
+        """記事辞書をテーブルの行に変換"""
+        values = dict(article)
+        values['id'] = values.get('id') or article_id(article)
+        values['canonical_url'] = canonical_url(values.get('link', '') or '')
+        values['published_date'] = _to_iso(values.get('published_date'))
+        values['collected_at'] = collected_at
+        if values.get('combined_score') is None and values.get('importance_score') is not None:
+            values['combined_score'] = values.get('importance_score', 0) + (values.get('attention_score') or 0)
+
+        extra = {k: v for k, v in values.items() if k not in COLUMNS}
+        row = [values.get(column) for column in COLUMNS]
+        row.append(json.dumps(extra, ensure_ascii=False, default=str) if extra else None)
+        return tuple(row)
+
+    def _from_row(self, row: sqlite3.Row) -> Dict[str, Any]:
+        """テーブルの行を記事辞書に戻す"""
+        article = {column: row[column] for column in COLUMNS if row[column] is not None}
+        if row['extra']:
+            article.update(json.loads(row['extra']))
+        return article
@@ -0,0 +1,362 @@
+"""
+記事ストアモジュール
+日付パーティション分割された追記専用のJSONLストア（バッチ書き込み・列指定読み込み）
+分析結果などの差分データは記事IDをキーにした列指向ファイルで保存し、読み込み時に結合する
+"""
+
+import os
+import re
+import json
+import hashlib
+import itertools
+from datetime import datetime, date
+from typing import List, Dict, Any, Iterable, Iterator, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+import logging
+
+from config.storage import STORAGE_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# 正規化時に除去するトラッキング用クエリパラメータ
+_TRACKING_PARAMS = re.compile(r'^(utm_.*|fbclid|gclid|ref|ref_src|source)$')
+_PARTITION_RE = re.compile(r'^date=(\d{4}-\d{2}-\d{2})$')
+
+
+def canonical_url(url: str) -> str:
+    """URLを正規化（スキーム・ホストの小文字化、トラッキングパラメータ・フラグメント・末尾スラッシュの除去）"""
+    if not url:
+        return ''
+
+    parts = urlsplit(url.strip())
+    query = urlencode(sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not _TRACKING_PARAMS.match(k)
+    ))
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, query, ''))
+
+
+def article_id(article: Dict[str, Any]) -> str:
+    """正規化URL（なければタイトル）から記事IDを生成"""
+    key = canonical_url(article.get('link', '') or '') or (article.get('title', '') or '').lower()
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def encode_columns(records: Iterable[Dict[str, Any]], fields: List[str],
+                   dictionary_fields: Iterable[str] = (), precision: int = 4) -> Dict[str, Any]:
+    """レコードを列指向（columnar-v1）の辞書に変換"""
+    dictionary_fields = set(dictionary_fields)
+    dictionaries: Dict[str, List[Any]] = {field: [] for field in dictionary_fields}
+    codes: Dict[str, Dict[Any, int]] = {field: {} for field in dictionary_fields}
+    columns: Dict[str, List[Any]] = {field: [] for field in fields}
+
+    row_count = 0
+    for record in records:
+        row_count += 1
+        for field in fields:
+            value = record.get(field)
+            if field in dictionary_fields:
+                if value not in codes[field]:
+                    codes[field][value] = len(dictionaries[field])
+                    dictionaries[field].append(value)
+                value = codes[field][value]
+            elif isinstance(value, float):
+                value = round(value, precision)
+            columns[field].append(value)
+
+    return {
+        'format': 'columnar-v1',
+        'rows': row_count,
+        'dictionaries': dictionaries,
+        'columns': columns
+    }
+
+
+class ArticleStore:
+    def __init__(self, base_dir: str = None, batch_size: int = None):
+        """
+        記事ストアを初期化
+
+        Args:
+            base_dir: ストアのルート（<base_dir>/<データセット>/date=YYYY-MM-DD/part-<実行ID>.jsonl）
+            batch_size: 1回の書き込みでまとめるレコード数
+        """
+        self.base_dir = base_dir or STORAGE_CONFIG['store_dir']
+        self.batch_size = batch_size or STORAGE_CONFIG['batch_size']
+
+    def write(self, dataset: str, records: Iterable[Dict[str, Any]],
+              run_id: Optional[str] = None, partition_date: Optional[date] = None) -> str:
+        """
+        レコードをバッチ単位で追記
+
+        Args:
+            dataset: データセット名（articles, analyzed など）
+            records: 書き込むレコード
+            run_id: 実行ID（パーティション内のファイル名になる）
+            partition_date: パーティションの日付（省略時は今日）
+
+        Returns:
+            書き込んだファイルのパス
+        """
+        run_id = run_id or datetime.now().strftime('%Y%m%d_%H%M%S')
+        partition_date = partition_date or date.today()
+        path = self._part_path(dataset, partition_date, run_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        count = 0
+        batch = []
+        with open(path, 'a', encoding='utf-8') as f:
+            if self._has_torn_tail(path):
+                # 前回の追記が途中で止まった行に続けて書かないよう改行を入れる
+                f.write('\n')
+            for record in records:
+                batch.append(json.dumps(record, ensure_ascii=False, separators=(',', ':'), default=_json_default))
+                if len(batch) >= self.batch_size:
+                    f.write('\n'.join(batch) + '\n')
+                    count += len(batch)
+                    batch = []
+            if batch:
+                f.write('\n'.join(batch) + '\n')
+                count += len(batch)
+
+        logger.info(f"ストア書き込み完了: {path} ({count}件)")
+        return path
+
+    def read(self, dataset: str, columns: Optional[List[str]] = None,
+             start_date: Optional[date] = None, end_date: Optional[date] = None) -> Iterator[Dict[str, Any]]:
+        """
+        レコードを順に読み込み
+
+        Args:
+            dataset: データセット名
+            columns: 取得する列（省略時は全列）
+            start_date: 読み込むパーティションの開始日（含む）
+            end_date: 読み込むパーティションの終了日（含む）
+
+        Yields:
+            レコード（columns指定時はその列のみ）
+        """
+        for path in self.part_files(dataset, start_date, end_date):
+            for record in self._load_part(path):
+                if columns:
+                    record = {column: record.get(column) for column in columns}
+                yield record
+
+    def write_columns(self, dataset: str, records: Iterable[Dict[str, Any]], fields: List[str],
+                      dictionary_fields: Iterable[str] = (), run_id: Optional[str] = None,
+                      partition_date: Optional[date] = None, precision: int = 4) -> str:
+        """
+        レコードの指定列だけを列指向で保存
+
+        Args:
+            dataset: データセット名
+            records: 書き込むレコード（fields 以外のキーは保存しない）
+            fields: 保存する列
+            dictionary_fields: 辞書符号化する列（値の種類が少ない文字列列）
+            run_id: 実行ID
+            partition_date: パーティションの日付（省略時は今日）
+            precision: 浮動小数点の丸め桁数
+
+        Returns:
+            書き込んだファイルのパス
+        """
+        run_id = run_id or datetime.now().strftime('%Y%m%d_%H%M%S')
+        partition_date = partition_date or date.today()
+        base_path = self._part_path(dataset, partition_date, run_id)[:-len('.jsonl')]
+        os.makedirs(os.path.dirname(base_path), exist_ok=True)
+
+        data = encode_columns(records, fields, dictionary_fields, precision)
+
+        # 同じ実行ID（同じ秒の実行）のファイルがあれば上書きせず連番を付ける
+        # （"_01" は "." より後に並ぶため、後から書いた差分が優先される）
+        path = f"{base_path}.json"
+        for suffix in itertools.count(1):
+            try:
+                f = open(path, 'x', encoding='utf-8')
+            except FileExistsError:
+                path = f"{base_path}_{suffix:02d}.json"
+                continue
+            with f:
+                json.dump(data, f, ensure_ascii=False, separators=(',', ':'), default=_json_default)
+            break
+
+        logger.info(f"ストア書き込み完了: {path} ({data['rows']}件, 列指向)")
+        return path
+
+    def read_joined(self, base_dataset: str, delta_dataset: str,
+                    start_date: Optional[date] = None, end_date: Optional[date] = None,
+                    columns: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        元データに記事IDで差分データを結合しながら読み込み
+
+        差分は start_date 以降の全パーティションから集め、同じIDは後から書かれたものを優先する
+        （後日の再スコアリング結果も反映される）。差分は小さいため先に索引化し、元データは順に読む。
+        """
+        deltas = {}
+        for record in self.read(delta_dataset, start_date=start_date):
+            deltas[record['id']] = record
+
+        for record in self.read(base_dataset, columns, start_date, end_date):
+            delta = deltas.get(record.get('id'))
+            if delta:
+                record = dict(record, **delta)
+            yield record
+
+    def read_articles(self, start_date: Optional[date] = None, end_date: Optional[date] = None,
+                      columns: Optional[List[str]] = None, dataset: str = 'articles') -> List[Dict[str, Any]]:
+        """期間内の記事を記事IDで重複除去して取得（後から書かれたものを優先）"""
+        read_columns = columns if not columns or 'id' in columns else ['id'] + columns
+        articles = {}
+        for record in self.read(dataset, read_columns, start_date, end_date):
+            articles[record.get('id') or article_id(record)] = record
+        return list(articles.values())
+
+    def partitions(self, dataset: str, start_date: Optional[date] = None,
+                   end_date: Optional[date] = None) -> List[str]:
+        """期間内のパーティションディレクトリ（日付順）"""
+        dataset_dir = os.path.join(self.base_dir, dataset)
+        if not os.path.isdir(dataset_dir):
+            return []
+
+        selected = []
+        for name in sorted(os.listdir(dataset_dir)):
+            match = _PARTITION_RE.match(name)
+            if not match:
+                continue
+            partition_date = date.fromisoformat(match.group(1))
+            if start_date and partition_date < start_date:
+                continue
+            if end_date and partition_date > end_date:
+                continue
+            selected.append(os.path.join(dataset_dir, name))
+        return selected
+
+    def part_files(self, dataset: str, start_date: Optional[date] = None,
+                   end_date: Optional[date] = None) -> List[str]:
+        """期間内のパーティションファイル（日付・ファイル名順）"""
+        files = []
+        for partition_dir in self.partitions(dataset, start_date, end_date):
+            files.extend(
+                os.path.join(partition_dir, name) for name in sorted(os.listdir(partition_dir))
+                if name.endswith('.jsonl') or name.endswith('.json')
+            )
+        return files
+
+    def rewrite_partition(self, dataset: str, partition_date: date, records: Iterable[Dict[str, Any]],
+                          fields: Optional[List[str]] = None, dictionary_fields: Iterable[str] = ()) -> str:
+        """
+        パーティション内のファイルを1つのファイルに置き換え（コンパクション用）
+
+        新しいファイルを一時ファイル経由で書き込んでから、元のファイルを削除する。
+
+        Args:
+            dataset: データセット名
+            partition_date: パーティションの日付
+            records: パーティションの全レコード
+            fields: 指定時は列指向で保存する列
+            dictionary_fields: 辞書符号化する列
+
+        Returns:
+            書き込んだファイルのパス
+        """
+        partition_dir = os.path.dirname(self._part_path(dataset, partition_date, ''))
+        old_paths = self.part_files(dataset, partition_date, partition_date)
+
+        # "compacted-" は "part-" より前に並ぶため、後から追記された実行分が優先される
+        name = f"compacted-{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        os.makedirs(partition_dir, exist_ok=True)
+        if fields:
+            path = os.path.join(partition_dir, f"{name}.json")
+            with open(f"{path}.tmp", 'w', encoding='utf-8') as f:
+                json.dump(encode_columns(records, fields, dictionary_fields), f,
+                          ensure_ascii=False, separators=(',', ':'), default=_json_default)
+        else:
+            path = os.path.join(partition_dir, f"{name}.jsonl")
+            with open(f"{path}.tmp", 'w', encoding='utf-8') as f:
+                for record in records:
+                    f.write(json.dumps(record, ensure_ascii=False, separators=(',', ':'), default=_json_default) + '\n')
+        os.replace(f"{path}.tmp", path)
+
+        for old_path in old_paths:
+            if old_path != path:
+                os.remove(old_path)
+
+        return path
+
+    def drop_partition(self, dataset: str, partition_date: date) -> int:
+        """パーティションを削除し、削除したファイル数を返す"""
+        partition_dir = os.path.dirname(self._part_path(dataset, partition_date, ''))
+        if not os.path.isdir(partition_dir):
+            return 0
+        names = os.listdir(partition_dir)
+        for name in names:
+            os.remove(os.path.join(partition_dir, name))
+        os.rmdir(partition_dir)
+        return len(names)
+
+    def datasets(self) -> List[str]:
+        """ストア内のデータセット名"""
+        if not os.path.isdir(self.base_dir):
+            return []
+        return sorted(
+            name for name in os.listdir(self.base_dir)
+            if os.path.isdir(os.path.join(self.base_dir, name))
+        )
+
+    def _load_part(self, path: str) -> List[Dict[str, Any]]:
+        """パーティションファイルを一括でパース（行ごとのjson.loadsより高速）"""
+        if path.endswith('.json'):
+            return self._load_columnar_part(path)
+
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = [line for line in f.read().split('\n') if line.strip()]
+        try:
+            return json.loads('[' + ','.join(lines) + ']') if lines else []
+        except ValueError:
+            return self._load_lines(path, lines)
+
+    def _has_torn_tail(self, path: str) -> bool:
+        """ファイルが改行で終わっていない（追記が途中で止まった）か"""
+        if not os.path.getsize(path):
+            return False
+        with open(path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) != b'\n'
+
+    def _load_lines(self, path: str, lines: List[str]) -> List[Dict[str, Any]]:
+        """
+        1行ずつパースし、読めない行は警告して飛ばす
+
+        追記中にプロセスが止まると末尾に途中までの行が残るため、その行以外を読めるようにする。
+        """
+        records = []
+        for number, line in enumerate(lines, 1):
+            try:
+                records.append(json.loads(line))
+            except ValueError as e:
+                logger.warning(f"パーティションファイルの壊れた行を飛ばします: {path} {number}行目: {e}")
+        return records
+
+    def _load_columnar_part(self, path: str) -> List[Dict[str, Any]]:
+        """列指向ファイルをレコードのリストに戻す"""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        columns = data['columns']
+        for field, dictionary in data['dictionaries'].items():
+            columns[field] = [dictionary[code] for code in columns[field]]
+
+        fields = list(columns)
+        return [dict(zip(fields, values)) for values in zip(*(columns[field] for field in fields))]
+
+    def _part_path(self, dataset: str, partition_date: date, run_id: str) -> str:
+        return os.path.join(
+            self.base_dir, dataset, f"date={partition_date.isoformat()}", f"part-{run_id}.jsonl"
+        )
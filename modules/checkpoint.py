@@ -0,0 +1,149 @@
+"""
+チェックポイントモジュール
+パイプラインの各段階の出力を実行IDごとに保存し、失敗した段階から再開できるようにする
+"""
+
+import os
+import json
+import shutil
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+import logging
+
+from config.storage import CHECKPOINT_CONFIG
+from modules.article import Article, to_articles, to_dicts
+
+logger = logging.getLogger(__name__)
+
+# 実行順の段階（各段階の出力が次の段階の入力になる）
+STAGES = ['collect', 'analyze', 'report']
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+class CheckpointStore:
+    def __init__(self, base_dir: str = None, keep_runs: int = None):
+        """
+        チェックポイントの保存先を初期化
+
+        Args:
+            base_dir: 保存先ディレクトリ（data/checkpoints/<run_id>/ に段階ごとのファイルを置く）
+            keep_runs: 保持する実行数（古い実行から削除）
+        """
+        self.base_dir = base_dir or CHECKPOINT_CONFIG['checkpoint_dir']
+        self.keep_runs = keep_runs if keep_runs is not None else CHECKPOINT_CONFIG['keep_runs']
+
+    def new_run_id(self) -> str:
+        return datetime.now().strftime('%Y%m%d_%H%M%S')
+
+    def save_articles(self, run_id: str, stage: str, articles: List[Article],
+                      extra: Optional[Dict[str, Any]] = None) -> str:
+        """記事リスト（と付随データ）を段階の出力として保存"""
+        payload = dict(extra or {}, articles=to_dicts(articles))
+        return self.save(run_id, stage, payload)
+
+    def load_articles(self, run_id: str, stage: str) -> Dict[str, Any]:
+        """保存した段階の出力を読み込み、記事を Article に戻す"""
+        payload = self.load(run_id, stage)
+        payload['articles'] = to_articles(payload.get('articles', []))
+        return payload
+
+    def save(self, run_id: str, stage: str, payload: Dict[str, Any]) -> str:
+        """
+        段階の出力を保存し、マニフェストに完了を記録
+
+        書き込みは一時ファイル経由で行い、途中で失敗しても前回の内容が壊れないようにする。
+        """
+        run_dir = os.path.join(self.base_dir, run_id)
+        os.makedirs(run_dir, exist_ok=True)
+
+        path = os.path.join(run_dir, f"{stage}.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False, separators=(',', ':'), default=_json_default)
+        os.replace(tmp_path, path)
+
+        manifest = self._load_manifest(run_id)
+        manifest['stages'][stage] = {
+            'file': os.path.basename(path),
+            'saved_at': datetime.now().isoformat(timespec='seconds')
+        }
+        manifest.pop('failed', None)
+        self._save_manifest(run_id, manifest)
+
+        logger.info(f"チェックポイント保存: {run_id}/{stage}")
+        self._prune()
+        return path
+
+    def load(self, run_id: str, stage: str) -> Dict[str, Any]:
+        """段階の出力を読み込み（完了していない段階は FileNotFoundError）"""
+        manifest = self._load_manifest(run_id)
+        if stage not in manifest['stages']:
+            raise FileNotFoundError(f"チェックポイントがありません: {run_id}/{stage}")
+
+        with open(os.path.join(self.base_dir, run_id, manifest['stages'][stage]['file']), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def mark_failed(self, run_id: str, stage: str, error: str):
+        """失敗した段階とエラー内容を記録"""
+        manifest = self._load_manifest(run_id)
+        manifest['failed'] = {
+            'stage': stage,
+            'error': error,
+            'failed_at': datetime.now().isoformat(timespec='seconds')
+        }
+        self._save_manifest(run_id, manifest)
+
+    def completed_stages(self, run_id: str) -> List[str]:
+        manifest = self._load_manifest(run_id)
+        return [stage for stage in STAGES if stage in manifest['stages']]
+
+    def resume_stage(self, run_id: str) -> Optional[str]:
+        """
+        再開する段階（最後に完了した段階の次）
+
+        Returns:
+            段階名。全段階が完了済み、またはチェックポイントがない場合は None
+        """
+        completed = self.completed_stages(run_id)
+        if not completed:
+            return None
+        index = STAGES.index(completed[-1]) + 1
+        return STAGES[index] if index < len(STAGES) else None
+
+    def runs(self) -> List[str]:
+        """保存されている実行ID（古い順）"""
+        if not os.path.isdir(self.base_dir):
+            return []
+        return sorted(
+            name for name in os.listdir(self.base_dir)
+            if os.path.exists(os.path.join(self.base_dir, name, 'manifest.json'))
+        )
+
+    def _prune(self):
+        """保持数を超えた古い実行のチェックポイントを削除"""
+        if not self.keep_runs:
+            return
+        for run_id in self.runs()[:-self.keep_runs]:
+            shutil.rmtree(os.path.join(self.base_dir, run_id), ignore_errors=True)
+
+    def _load_manifest(self, run_id: str) -> Dict[str, Any]:
+        path = os.path.join(self.base_dir, run_id, 'manifest.json')
+        if not os.path.exists(path):
+            return {'run_id': run_id, 'stages': {}}
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _save_manifest(self, run_id: str, manifest: Dict[str, Any]):
+        manifest['updated_at'] = datetime.now().isoformat(timespec='seconds')
+        run_dir = os.path.join(self.base_dir, run_id)
+        os.makedirs(run_dir, exist_ok=True)
+        path = os.path.join(run_dir, 'manifest.json')
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
@@ -4,14 +4,17 @@ RSSフィード、API、Webスクレイピングによる情報収集
 """
 
 import requests
-import feedparser
-import pandas as pd
-from bs4 import BeautifulSoup
-from datetime import datetime, timedelta
+from datetime import datetime, date, timedelta
 import time
 import json
+import itertools
 import os
-from typing import List, Dict, Any
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+from typing import List, Dict, Any, Iterator, Optional, Set, Callable
 import logging
 from dotenv import load_dotenv
 
@@ -19,230 +22,571 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from config.sources import RSS_SOURCES, API_SOURCES, SCRAPING_SOURCES, ADDITIONAL_SOURCES, COLLECTION_CONFIG
+from modules.article_store import ArticleStore, article_id
+from modules.article import Article, to_dicts
+from modules.response_archive import ResponseArchive
+from modules.response_body import ByteBudget, ResponseBody, read_feed
+from modules.metrics import MetricsRegistry
+from modules import tracing
 
 # ログ設定
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 並行収集でソースが失敗した場合のログの見出し
+ERROR_LABELS = {
+    'rss': 'RSS収集エラー',
+    'api': 'API収集エラー',
+    'scraping': 'スクレイピングエラー',
+    'arxiv': 'arXiv収集エラー'
+}
+
 class NewsCollector:
-    def __init__(self):
+    def __init__(self, repository=None, archive: ResponseArchive = None, metrics: MetricsRegistry = None,
+                 sources: Optional[Dict[str, Any]] = None, config: Optional[Dict[str, Any]] = None,
+                 progress: Optional[Callable[[int, int], None]] = None, yield_tracker=None):
+        """
+        収集器を初期化
+        
+        Args:
+            repository: 記事リポジトリ
+            archive: レスポンスアーカイブ（capture では取得した本文を保存、replay ではネットワークの代わりに使用）
+            metrics: ソースごとの取得時間・件数の記録先
+            sources: 収集するソース（rss / api / scraping / additional。省略時は config/sources.py）
+            config: COLLECTION_CONFIG の上書き
+            progress: ソースの取得が終わるごとに (完了数, ソース数) で呼ぶ関数
+            yield_tracker: poll_source の取得ごとの新着数・失敗を記録する SourceYieldTracker
+        """
+        self.config = dict(COLLECTION_CONFIG, **(config or {}))
+        self.progress = progress
+        self.yield_tracker = yield_tracker
+        self.sources = sources or {
+            'rss': RSS_SOURCES,
+            'api': API_SOURCES,
+            'scraping': SCRAPING_SOURCES,
+            'additional': ADDITIONAL_SOURCES
+        }
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
+        # 並行収集のスレッド数だけ同じホストへの接続を使い回せるようにする
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=self.config['max_workers'])
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._host_lock = threading.Lock()
+        self._host_next_request: Dict[str, float] = {}
+        self.budget = ByteBudget(self.config['max_inflight_bytes'])
         self.collected_data = []
+        self.store = ArticleStore()
+        self.repository = repository
+        self.archive = archive
+        self.metrics = metrics or MetricsRegistry()
     
     def collect_rss_feeds(self) -> List[Dict[str, Any]]:
         """RSSフィードから情報を収集"""
-        articles = []
-        
-        for source in RSS_SOURCES:
+        return list(self.iter_rss_feeds())
+    
+    def iter_rss_feeds(self) -> Iterator[Dict[str, Any]]:
+        """RSSフィードから情報を収集（1件ずつ返す）"""
+        for source in self.sources['rss']:
             try:
-                logger.info(f"RSS収集開始: {source['name']}")
-                feed = feedparser.parse(source['url'])
-                
-                for entry in feed.entries[:COLLECTION_CONFIG['max_articles_per_source']]:
-                    # 日付フィルタリング
-                    pub_date = self._parse_date(entry.get('published', ''))
-                    if not self._is_recent(pub_date):
-                        continue
-                    
-                    article = {
-                        'title': entry.get('title', ''),
-                        'link': entry.get('link', ''),
-                        'description': entry.get('summary', ''),
-                        'published_date': pub_date,
-                        'source': source['name'],
-                        'source_type': 'rss',
-                        'category': source['category'],
-                        'priority': source['priority']
-                    }
-                    
-                    # 除外キーワードチェック
-                    if not self._should_exclude(article['title']):
-                        articles.append(article)
-                
-                time.sleep(1)  # レート制限対策
+                yield from self.iter_rss_source(source)
                 
             except Exception as e:
                 logger.error(f"RSS収集エラー {source['name']}: {e}")
+    
+    def iter_rss_source(self, source: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """1つのRSSフィードから収集（エラーは呼び出し側で処理）"""
+        import feedparser  # 収集時のみ読み込む（起動時間の短縮）
         
-        return articles
+        logger.info(f"RSS収集開始: {source['name']}")
+        with self._fetch(source['url'], source=source['name']) as body, \
+                tracing.span('feedparser', 'parse', source=source['name']) as span:
+            # 停止したフィード（404 など）を新着なしではなく失敗として扱う
+            body.raise_for_status()
+            # 使う件数のエントリーを読んだ時点で取得を打ち切り、その部分だけをパースする
+            feed = feedparser.parse(read_feed(body, self.config['max_articles_per_source']))
+            span.set(bytes=body.size, complete=body.complete, items=len(feed.entries))
+        
+        entries = feed.entries[:self.config['max_articles_per_source']]
+        self.metrics.inc('collector_articles_parsed_total', len(entries), source=source['name'])
+        for entry in entries:
+            # 日付フィルタリング
+            pub_date = self._parse_date(entry.get('published', ''))
+            if not self._is_recent(pub_date):
+                self.metrics.inc('collector_articles_excluded_total', source=source['name'], reason='stale')
+                continue
+            
+            article = {
+                'title': entry.get('title', ''),
+                'link': entry.get('link', ''),
+                'description': entry.get('summary', ''),
+                'published_date': pub_date,
+                'source': source['name'],
+                'source_type': 'rss',
+                'category': source['category'],
+                'priority': source['priority']
+            }
+            
+            # 除外キーワードチェック
+            if self._accept(article, source['name']):
+                yield article
     
     def collect_api_news(self) -> List[Dict[str, Any]]:
         """APIからニュースを収集"""
-        articles = []
-        
-        for source in API_SOURCES:
+        return list(self.iter_api_news())
+    
+    def iter_api_news(self) -> Iterator[Dict[str, Any]]:
+        """APIからニュースを収集（1件ずつ返す）"""
+        for source in self.sources['api']:
             try:
-                api_key = os.getenv(source['api_key_env'])
-                if not api_key:
-                    logger.warning(f"APIキーが見つかりません: {source['api_key_env']}")
-                    continue
-                
-                logger.info(f"API収集開始: {source['name']}")
-                
-                # 各キーワードで検索
-                for keyword in source['keywords']:
-                    params = source['params'].copy()
-                    params['q'] = keyword
-                    params['apiKey'] = api_key
-                    
-                    response = self.session.get(source['base_url'], params=params)
-                    response.raise_for_status()
-                    
-                    data = response.json()
-                    
-                    for article_data in data.get('articles', [])[:5]:  # 明示的に5件制限
-                        pub_date = self._parse_date(article_data.get('publishedAt', ''))
-                        if not self._is_recent(pub_date):
-                            continue
-                        
-                        article = {
-                            'title': article_data.get('title', ''),
-                            'link': article_data.get('url', ''),
-                            'description': article_data.get('description', ''),
-                            'published_date': pub_date,
-                            'source': article_data.get('source', {}).get('name', source['name']),
-                            'source_type': 'api',
-                            'category': 'general',
-                            'priority': 'medium',
-                            'keyword': keyword
-                        }
-                        
-                        if not self._should_exclude(article['title']):
-                            articles.append(article)
-                    
-                    time.sleep(1)  # レート制限対策
+                yield from self.iter_api_source(source)
                 
             except Exception as e:
                 logger.error(f"API収集エラー {source['name']}: {e}")
+    
+    def iter_api_source(self, source: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """1つのAPIソースからキーワードごとに収集（エラーは呼び出し側で処理）"""
+        api_key = os.getenv(source['api_key_env'])
+        if not api_key and self._replaying:
+            api_key = 'replay'  # 再生時はキーを送らないため不要
+        if not api_key:
+            logger.warning(f"APIキーが見つかりません: {source['api_key_env']}")
+            return
         
-        return articles
+        logger.info(f"API収集開始: {source['name']}")
+        
+        # 各キーワードで検索
+        for keyword in source['keywords']:
+            params = source['params'].copy()
+            params['q'] = keyword
+            params['apiKey'] = api_key
+            
+            with self._fetch(source['base_url'], params=params, source=source['name']) as body:
+                body.raise_for_status()
+                with tracing.span('json', 'parse', source=source['name']) as span:
+                    data = json.loads(body.read())
+                    span.set(bytes=body.size, items=len(data.get('articles', [])))
+            
+            entries = data.get('articles', [])[:5]  # 明示的に5件制限
+            self.metrics.inc('collector_articles_parsed_total', len(entries), source=source['name'])
+            for article_data in entries:
+                pub_date = self._parse_date(article_data.get('publishedAt', ''))
+                if not self._is_recent(pub_date):
+                    self.metrics.inc('collector_articles_excluded_total', source=source['name'], reason='stale')
+                    continue
+                
+                article = {
+                    'title': article_data.get('title', ''),
+                    'link': article_data.get('url', ''),
+                    'description': article_data.get('description', ''),
+                    'published_date': pub_date,
+                    'source': article_data.get('source', {}).get('name', source['name']),
+                    'source_type': 'api',
+                    'category': 'general',
+                    'priority': 'medium',
+                    'keyword': keyword
+                }
+                
+                if self._accept(article, source['name']):
+                    yield article
     
     def collect_scraping_news(self) -> List[Dict[str, Any]]:
         """Webスクレイピングでニュースを収集"""
-        articles = []
-        
-        for source in SCRAPING_SOURCES:
+        return list(self.iter_scraping_news())
+    
+    def iter_scraping_news(self) -> Iterator[Dict[str, Any]]:
+        """Webスクレイピングでニュースを収集（1件ずつ返す）"""
+        for source in self.sources['scraping']:
             try:
-                logger.info(f"スクレイピング開始: {source['name']}")
-                
-                response = self.session.get(source['url'])
-                response.raise_for_status()
-                
-                soup = BeautifulSoup(response.content, 'html.parser')
-                elements = soup.select(source['selector'])
-                
-                for element in elements[:COLLECTION_CONFIG['max_articles_per_source']]:
-                    title_elem = element.select_one(source['title_selector'])
-                    link_elem = element.select_one(source['link_selector'])
-                    
-                    if title_elem and link_elem:
-                        title = title_elem.get_text(strip=True)
-                        link = link_elem.get('href', '')
-                        
-                        # 相対URLを絶対URLに変換
-                        if link.startswith('/'):
-                            link = f"{source['url'].rstrip('/')}{link}"
-                        
-                        article = {
-                            'title': title,
-                            'link': link,
-                            'description': '',
-                            'published_date': datetime.now(),
-                            'source': source['name'],
-                            'source_type': 'scraping',
-                            'category': source['category'],
-                            'priority': source['priority']
-                        }
-                        
-                        if not self._should_exclude(article['title']):
-                            articles.append(article)
-                
-                time.sleep(2)  # スクレイピングの間隔
+                yield from self.iter_scraping_source(source)
                 
             except Exception as e:
                 logger.error(f"スクレイピングエラー {source['name']}: {e}")
+    
+    def iter_scraping_source(self, source: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """1つのWebページから収集（エラーは呼び出し側で処理）"""
+        from bs4 import BeautifulSoup  # 収集時のみ読み込む（起動時間の短縮）
         
-        return articles
+        logger.info(f"スクレイピング開始: {source['name']}")
+        
+        with self._fetch(source['url'], source=source['name']) as body:
+            body.raise_for_status()
+            
+            with tracing.span('html', 'parse', source=source['name']) as span:
+                soup = BeautifulSoup(body.read(), 'html.parser')
+                elements = soup.select(source['selector'])[:self.config['max_articles_per_source']]
+                span.set(bytes=body.size, items=len(elements))
+            
+            # 記事を返す前に文書のツリーを解放する（呼び出し側が次の記事を要求するまで残らないように）
+            links = []
+            for element in elements:
+                title_elem = element.select_one(source['title_selector'])
+                link_elem = element.select_one(source['link_selector'])
+                if title_elem and link_elem:
+                    links.append((title_elem.get_text(strip=True), link_elem.get('href', '')))
+            soup.decompose()
+        self.metrics.inc('collector_articles_parsed_total', len(elements), source=source['name'])
+        
+        for title, link in links:
+            # 相対URLを絶対URLに変換
+            if link.startswith('/'):
+                link = f"{source['url'].rstrip('/')}{link}"
+            
+            article = {
+                'title': title,
+                'link': link,
+                'description': '',
+                'published_date': datetime.now(),
+                'source': source['name'],
+                'source_type': 'scraping',
+                'category': source['category'],
+                'priority': source['priority']
+            }
+            
+            if self._accept(article, source['name']):
+                yield article
     
     def collect_additional_sources(self) -> List[Dict[str, Any]]:
         """追加ソースから情報を収集"""
-        articles = []
-        
+        return list(self.iter_additional_sources())
+    
+    def iter_additional_sources(self) -> Iterator[Dict[str, Any]]:
+        """追加ソースから情報を収集（1件ずつ返す）"""
         try:
             # arXiv APIから論文情報を取得
-            arxiv_source = ADDITIONAL_SOURCES['arxiv']
-            logger.info(f"arXiv収集開始: {arxiv_source['name']}")
+            yield from self.iter_arxiv_source(self.sources['additional']['arxiv'])
             
-            response = self.session.get(arxiv_source['url'])
-            response.raise_for_status()
+        except Exception as e:
+            logger.error(f"arXiv収集エラー: {e}")
+    
+    def iter_arxiv_source(self, source: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """arXiv APIから論文情報を収集（エラーは呼び出し側で処理）"""
+        logger.info(f"arXiv収集開始: {source['name']}")
+        
+        with self._fetch(source['url'], source=source['name']) as body:
+            body.raise_for_status()
             
             # XMLパース（簡易版）
-            content = response.text
-            import re
+            # 使うのは先頭5件のため、フィードのタイトルの分も含めて6件を読んだ時点で取得を打ち切る
+            content = read_feed(body, 6).decode(body.encoding or 'utf-8', errors='replace')
             
             # 論文タイトルを抽出
-            titles = re.findall(r'<title>(.*?)</title>', content)
-            links = re.findall(r'<id>(.*?)</id>', content)
-            
-            for i, (title, link) in enumerate(zip(titles[1:], links[:5])):  # 最初のタイトルは除外
-                if 'AI' in title or 'artificial intelligence' in title.lower():
-                    article = {
-                        'title': title,
-                        'link': link,
-                        'description': f"arXiv論文: {title}",
-                        'published_date': datetime.now(),
-                        'source': arxiv_source['name'],
-                        'source_type': 'arxiv',
-                        'category': arxiv_source['category'],
-                        'priority': arxiv_source['priority']
-                    }
-                    articles.append(article)
-            
-            logger.info(f"arXiv収集完了: {len(articles)}件")
-            
-        except Exception as e:
-            logger.error(f"arXiv収集エラー: {e}")
+            with tracing.span('arxiv', 'parse', source=source['name'], bytes=len(content)) as span:
+                titles = re.findall(r'<title>(.*?)</title>', content)
+                links = re.findall(r'<id>(.*?)</id>', content)
+                span.set(items=len(titles))
         
-        return articles
-    
-    def collect_all(self) -> List[Dict[str, Any]]:
-        """全てのソースから情報を収集"""
-        logger.info("情報収集開始")
+        count = 0
+        candidates = list(zip(titles[1:], links[:5]))  # 最初のタイトルは除外
+        self.metrics.inc('collector_articles_parsed_total', len(candidates), source=source['name'])
+        for i, (title, link) in enumerate(candidates):
+            if 'AI' in title or 'artificial intelligence' in title.lower():
+                article = {
+                    'title': title,
+                    'link': link,
+                    'description': f"arXiv論文: {title}",
+                    'published_date': datetime.now(),
+                    'source': source['name'],
+                    'source_type': 'arxiv',
+                    'category': source['category'],
+                    'priority': source['priority']
+                }
+                count += 1
+                yield article
         
-        all_articles = []
+        self.metrics.inc('collector_articles_accepted_total', count, source=source['name'])
+        self.metrics.inc('collector_articles_excluded_total', len(candidates) - count, source=source['name'], reason='keyword')
+        logger.info(f"arXiv収集完了: {count}件")
+    
+    def collect_all(self) -> List[Article]:
+        """
+        全てのソースから情報を収集
         
-        # RSS収集
-        rss_articles = self.collect_rss_feeds()
-        all_articles.extend(rss_articles)
-        logger.info(f"RSS収集完了: {len(rss_articles)}件")
+        ソースは max_workers 件ずつ並行して取得する（同じホストへは host_interval_seconds の間隔を空ける）。
+        結果はソースの設定順に並べるため、重複除去で残る記事は逐次取得の場合と同じ。
+        """
+        logger.info("情報収集開始")
         
-        # API収集
-        api_articles = self.collect_api_news()
-        all_articles.extend(api_articles)
-        logger.info(f"API収集完了: {len(api_articles)}件")
+        targets = self.poll_targets()
+        with ThreadPoolExecutor(max_workers=self.config['max_workers'], thread_name_prefix='collect') as pool:
+            # ソースのスパンを収集段階のスパンの下に入れる
+            results = []
+            for records in pool.map(tracing.bind(self._collect_target), targets):
+                results.append(records)
+                if self.progress:
+                    self.progress(len(results), len(targets))
+        # 並行取得全体で同時に読み込んでいた本文の最大バイト数（max_inflight_bytes 以下になる）
+        self.metrics.set('collector_inflight_bytes_peak', self.budget.peak)
         
-        # スクレイピング収集
-        scraping_articles = self.collect_scraping_news()
-        all_articles.extend(scraping_articles)
-        logger.info(f"スクレイピング収集完了: {len(scraping_articles)}件")
+        all_articles = []
+        counts = {}
+        for target, records in zip(targets, results):
+            all_articles.extend(records)
+            counts[target['kind']] = counts.get(target['kind'], 0) + len(records)
         
-        # 追加ソース収集
-        additional_articles = self.collect_additional_sources()
-        all_articles.extend(additional_articles)
-        logger.info(f"追加ソース収集完了: {len(additional_articles)}件")
+        logger.info(f"RSS収集完了: {counts.get('rss', 0)}件")
+        logger.info(f"API収集完了: {counts.get('api', 0)}件")
+        logger.info(f"スクレイピング収集完了: {counts.get('scraping', 0)}件")
+        logger.info(f"追加ソース収集完了: {counts.get('arxiv', 0)}件")
         
         # 重複除去
-        unique_articles = self._remove_duplicates(all_articles)
+        unique_articles = [Article.from_dict(a) for a in self._remove_duplicates(all_articles)]
         logger.info(f"重複除去後: {len(unique_articles)}件")
+        self._record_dedup(len(all_articles), len(unique_articles))
         
         # データ保存
         self._save_collected_data(unique_articles)
         
         return unique_articles
     
+    def _collect_target(self, target: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """1つのソースから収集（失敗した場合はそれまでに取得した記事を返す）"""
+        kind, source = target['kind'], target['source']
+        records = []
+        with tracing.span(source['name'], 'source', source_kind=kind) as span:
+            try:
+                for record in self._source_iterator(kind)(source):
+                    records.append(record)
+            except Exception as e:
+                logger.error(f"{ERROR_LABELS[kind]} {source['name']}: {e}")
+                span.set_error(str(e))
+            span.set(items=len(records))
+        return records
+    
+    def _source_iterator(self, kind: str):
+        """ソース種別ごとの収集関数"""
+        return {
+            'rss': self.iter_rss_source,
+            'api': self.iter_api_source,
+            'scraping': self.iter_scraping_source,
+            'arxiv': self.iter_arxiv_source
+        }[kind]
+    
+    def iter_articles(self) -> Iterator[Article]:
+        """
+        全てのソースから収集した記事を順に返す（ストリーミング用）
+        
+        タイトルの重複除去にはハッシュ値のみを保持し、記事ストア・リポジトリへは
+        バッチ単位で書き込んでから後段に渡す。
+        """
+        logger.info("情報収集開始（ストリーミング）")
+        
+        sources = itertools.chain(
+            self.iter_rss_feeds(),
+            self.iter_api_news(),
+            self.iter_scraping_news(),
+            self.iter_additional_sources()
+        )
+        run_id = datetime.now().strftime('%Y%m%d_%H%M%S')
+        seen_titles = set()
+        batch = []
+        count = 0
+        duplicates = 0
+        
+        for record in sources:
+            title = record.get('title', '')
+            if not title:
+                continue
+            title_hash = hash(title.lower())
+            if title_hash in seen_titles:
+                duplicates += 1
+                continue
+            seen_titles.add(title_hash)
+            
+            batch.append(Article.from_dict(record))
+            if len(batch) >= self.store.batch_size:
+                self._save_collected_data(batch, run_id)
+                count += len(batch)
+                yield from batch
+                batch = []
+        
+        if batch:
+            self._save_collected_data(batch, run_id)
+            count += len(batch)
+            yield from batch
+        
+        self._record_dedup(count + duplicates, count)
+        logger.info(f"収集完了（ストリーミング）: {count}件")
+    
+    @property
+    def _replaying(self) -> bool:
+        return self.archive is not None and self.archive.replaying
+    
+    def _fetch(self, url: str, params: Dict[str, Any] = None, source: str = None) -> ResponseBody:
+        """
+        HTTP GET（アーカイブの再生中は保存済みのレスポンスを返す）
+        
+        本文はストリームで読み込む ResponseBody として返し、呼び出し側は with で閉じる。
+        ヘッダーを受け取った時点で本文の見込みサイズを max_inflight_bytes から確保し（空きがなければ待つ）、
+        max_response_bytes を超える本文は読み込みを中止する（ResponseTooLarge）。
+        capture 時はステータスに関わらず本文を全て読み込んで保存してから返す。
+        429/503 に Retry-After が付いていれば、その秒数だけ待って max_retries 回まで再試行する。
+        取得時間・バイト数・HTTPステータスはソース名ごとに記録する。
+        """
+        source = source or url
+        for attempt in range(self.config['max_retries'] + 1):
+            self._wait_for_host(url)
+            start = time.perf_counter()
+            with tracing.span('GET', 'http', source=source, url=url, attempt=attempt + 1) as span:
+                try:
+                    if self._replaying:
+                        response = self.archive.replay(url, params)
+                    else:
+                        response = self.session.get(
+                            url, params=params, timeout=self.config['request_timeout'], stream=True
+                        )
+                except Exception as e:
+                    self.metrics.inc('collector_fetch_errors_total', source=source, error=type(e).__name__)
+                    raise
+                # 本文の読み込みはパースのスパンに含まれる
+                span.set(status=response.status_code, content_length=response.headers.get('Content-Length'))
+            self.metrics.inc('collector_fetch_responses_total', source=source, status=response.status_code)
+            
+            retry_after = self._retry_after(response)
+            if retry_after is None or attempt == self.config['max_retries']:
+                break
+            response.close()
+            self.metrics.inc('collector_fetch_retries_total', source=source)
+            logger.warning(f"{source}: HTTP {response.status_code}、{retry_after:.0f}秒後に再試行します")
+            self._sleep(retry_after)
+        
+        body = None
+        try:
+            body = ResponseBody(
+                response, self.budget, self.config['max_response_bytes'], self.config['stream_chunk_bytes'],
+                on_close=lambda body: self._record_body(source, body, start)
+            )
+            if self.archive is not None and not self._replaying:
+                self.archive.record(url, params, body)
+        except Exception as e:
+            self.metrics.inc('collector_fetch_errors_total', source=source, error=type(e).__name__)
+            if body is not None:
+                body.close()
+            response.close()
+            raise
+        return body
+    
+    def _record_body(self, source: str, body: ResponseBody, start: float):
+        """本文を閉じた時点の取得時間・読み込んだバイト数（打ち切り・中止も記録）"""
+        self.metrics.observe('collector_fetch_seconds', time.perf_counter() - start, source=source)
+        self.metrics.inc('collector_fetch_bytes_total', body.size, source=source)
+        if body.aborted:
+            self.metrics.inc('collector_fetch_aborted_total', source=source, reason='too_large')
+        elif not body.complete:
+            self.metrics.inc('collector_fetch_truncated_total', source=source)
+    
+    def _retry_after(self, response) -> Optional[float]:
+        """再試行までの秒数（429/503 で Retry-After が許容範囲内の場合のみ）"""
+        if response.status_code not in (429, 503):
+            return None
+        value = response.headers.get('Retry-After')
+        if not value:
+            return None
+        try:
+            seconds = float(value)
+        except ValueError:
+            try:
+                seconds = (parsedate_to_datetime(value) - datetime.now(parsedate_to_datetime(value).tzinfo)).total_seconds()
+            except (TypeError, ValueError):
+                return None
+        seconds = max(0.0, seconds)
+        return seconds if seconds <= self.config['max_retry_after_seconds'] else None
+    
+    def _wait_for_host(self, url: str):
+        """同じホストへのリクエストが host_interval_seconds 以上空くまで待つ（再生中は待たない）"""
+        interval = self.config['host_interval_seconds']
+        if interval <= 0 or self._replaying:
+            return
+        host = urlsplit(url).netloc
+        with self._host_lock:
+            now = time.monotonic()
+            next_request = max(now, self._host_next_request.get(host, now))
+            self._host_next_request[host] = next_request + interval
+        if next_request > now:
+            time.sleep(next_request - now)
+    
+    def _sleep(self, seconds: float):
+        """レート制限の待機（アーカイブの再生中は待たない）"""
+        if not self._replaying:
+            time.sleep(seconds)
+    
+    def poll_targets(self) -> List[Dict[str, Any]]:
+        """継続収集で個別に取得するソース（kind: rss / api / scraping / arxiv）"""
+        targets = [{'kind': 'rss', 'source': source} for source in self.sources['rss']]
+        targets += [{'kind': 'api', 'source': source} for source in self.sources['api']]
+        targets += [{'kind': 'scraping', 'source': source} for source in self.sources['scraping']]
+        targets.append({'kind': 'arxiv', 'source': self.sources['additional']['arxiv']})
+        return targets
+    
+    def poll_source(self, kind: str, source: Dict[str, Any], seen_ids: Set[str]) -> List[Article]:
+        """
+        1つのソースを取得し、未取得の記事だけを記事ストア・リポジトリに保存
+        
+        Args:
+            kind: ソース種別（rss / api / scraping / arxiv）
+            source: ソース設定
+            seen_ids: 取得済みの記事ID（呼び出し側で今回の記事IDを追加する。
+                      claim を持つ場合（ワーカー間で共有する SeenIds）は保存前に登録し、
+                      他のワーカーが先に登録した記事を除く）
+        
+        Returns:
+            新しく保存した記事
+        """
+        articles = []
+        titles = set()
+        fetched = 0
+        with tracing.span(source['name'], 'source', source_kind=kind) as span:
+            try:
+                for record in self._source_iterator(kind)(source):
+                    fetched += 1
+                    record['id'] = article_id(record)
+                    title = record.get('title', '').lower()
+                    if not title or record['id'] in seen_ids or title in titles:
+                        continue
+                    titles.add(title)
+                    articles.append(Article.from_dict(record))
+            except Exception as e:
+                if self.yield_tracker is not None:
+                    self.yield_tracker.record_failure(kind, source, str(e))
+                raise
+            claim = getattr(seen_ids, 'claim', None)
+            if claim is not None and articles:
+                claimed = claim([article.id for article in articles])
+                articles = [article for article in articles if article.id in claimed]
+            span.set(items=fetched, new_items=len(articles))
+        
+        if self.yield_tracker is not None:
+            self.yield_tracker.record_fetch(kind, source, fetched, len(articles), self._discovery_delays(kind, articles))
+        self.metrics.inc('collector_poll_new_articles_total', len(articles), source=source['name'])
+        if articles:
+            slug = re.sub(r'[^0-9A-Za-z]+', '-', source['name']).strip('-').lower()
+            self._save_collected_data(articles, f"{datetime.now():%Y%m%d_%H%M%S}_{kind}_{slug}")
+        
+        logger.info(f"継続収集 {source['name']}: 新着{len(articles)}件")
+        return articles
+    
+    def _discovery_delays(self, kind: str, articles: List[Article]) -> List[float]:
+        """公開から取得までの秒数（公開日時を持たないスクレイピング・arXivは除く）"""
+        if kind not in ('rss', 'api'):
+            return []
+        delays = []
+        for article in articles:
+            published = article.published_date
+            if isinstance(published, datetime):
+                delay = (datetime.now(published.tzinfo) - published).total_seconds()
+                if delay >= 0:
+                    delays.append(delay)
+        return delays
+    
+    def load_collected(self, start_date: Optional[date] = None, end_date: Optional[date] = None) -> List[Article]:
+        """記事ストアに蓄積した記事を読み込み、タイトルで重複除去（ネットワークは使わない）"""
+        records = self.store.read_articles(start_date, end_date)
+        articles = [Article.from_dict(record) for record in self._remove_duplicates(records)]
+        logger.info(f"蓄積済みの記事を読み込み: {len(articles)}件")
+        return articles
+    
     def _parse_date(self, date_str: str) -> datetime:
         """日付文字列をパース"""
         try:
@@ -272,8 +616,8 @@ class NewsCollector:
         if not pub_date:
             return False
         
-        # タイムゾーン情報を統一
-        now = datetime.now()
+        # タイムゾーン情報を統一（再生中は取得した時点を基準にする）
+        now = self.archive.captured_at if self._replaying else datetime.now()
         if pub_date.tzinfo is None:
             pub_date = pub_date.replace(tzinfo=now.tzinfo)
         if now.tzinfo is None:
@@ -282,10 +626,23 @@ class NewsCollector:
         min_date = now - timedelta(days=7)
         return pub_date >= min_date
     
+    def _accept(self, article: Dict[str, Any], source: str) -> bool:
+        """除外キーワードを判定し、採用・除外の件数を記録"""
+        if self._should_exclude(article['title']):
+            self.metrics.inc('collector_articles_excluded_total', source=source, reason='keyword')
+            return False
+        self.metrics.inc('collector_articles_accepted_total', source=source)
+        return True
+    
+    def _record_dedup(self, total: int, unique: int):
+        """タイトルの重複除去の件数と比率を記録"""
+        self.metrics.inc('collector_duplicates_total', total - unique)
+        self.metrics.set('collector_dedup_ratio', (total - unique) / total if total else 0.0)
+    
     def _should_exclude(self, title: str) -> bool:
         """除外すべき記事かどうかチェック"""
         title_lower = title.lower()
-        for keyword in COLLECTION_CONFIG['exclude_keywords']:
+        for keyword in self.config['exclude_keywords']:
             if keyword.lower() in title_lower:
                 return True
         return False
@@ -306,20 +663,18 @@ class NewsCollector:
         
         return unique_articles
     
-    def _save_collected_data(self, articles: List[Dict[str, Any]]):
-        """収集データを保存"""
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"data/collected/articles_{timestamp}.json"
-        
-        os.makedirs(os.path.dirname(filename), exist_ok=True)
+    def _save_collected_data(self, articles: List[Article], run_id: str = None):
+        """収集データを記事ストアに追記（同じ実行IDなら同じファイルに追記）"""
+        timestamp = run_id or datetime.now().strftime('%Y%m%d_%H%M%S')
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(articles, f, ensure_ascii=False, indent=2, default=str)
+        # 後段の分析結果と結合できるよう記事IDを付与
+        records = to_dicts(articles)
+        for article, record in zip(articles, records):
+            article.id = article.id or article_id(record)
+            record['id'] = article.id
         
-        logger.info(f"データ保存完了: {filename}")
+        path = self.store.write('articles', records, run_id=timestamp)
+        logger.info(f"データ保存完了: {path}")
         
-        # CSV形式でも保存
-        df = pd.DataFrame(articles)
-        csv_filename = f"data/collected/articles_{timestamp}.csv"
-        df.to_csv(csv_filename, index=False, encoding='utf-8')
-        logger.info(f"CSV保存完了: {csv_filename}") 
\ No newline at end of file
+        if self.repository is not None:
+            self.repository.upsert_articles(records)
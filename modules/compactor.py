@@ -0,0 +1,264 @@
+"""
+コンパクションモジュール
+実行ごとの小さなファイルをパーティション単位にまとめ、重複除去と保持期間の適用を行う
+"""
+
+import os
+import re
+import json
+import shutil
+from datetime import datetime, date, timedelta
+from typing import List, Dict, Any, Optional
+import logging
+
+from config.storage import RETENTION_CONFIG
+from modules.article_store import ArticleStore, article_id
+from modules.analyzer import ANALYSIS_FIELDS, ANALYSIS_DICTIONARY_FIELDS
+
+logger = logging.getLogger(__name__)
+
+# 列指向で保存するデータセット（列, 辞書符号化する列）
+COLUMNAR_DATASETS = {
+    'analysis': (ANALYSIS_FIELDS, ANALYSIS_DICTIONARY_FIELDS),
+}
+
+# 分析段階で付与される列（収集記事として取り込む際は除く）
+_DERIVED_FIELDS = set(ANALYSIS_FIELDS) - {'id'} | {'category_name', 'importance_description'}
+
+_LEGACY_FILE_RE = re.compile(r'^(articles|analyzed_articles|analysis_summary)_(\d{8}_\d{6})\.(json|csv)$')
+_REPORT_FILE_RE = re.compile(r'^newsletter_(\d{8}_\d{6})\.(html|txt)$')
+
+
+class Compactor:
+    def __init__(self, store: Optional[ArticleStore] = None, repository=None,
+                 reports_dir: str = "reports/newsletters", search_index=None,
+                 personalized_dir: str = "data/personalized", config: Optional[Dict[str, Any]] = None):
+        """
+        コンパクションを初期化
+
+        Args:
+            store: 記事ストア
+            repository: 記事リポジトリ（保持期間を過ぎた記事を削除する）
+            reports_dir: ニュースレターの保存先
+            search_index: アーカイブ検索インデックス（レポート削除時に号を外す）
+            personalized_dir: 購読者別ニュースレターの保存先
+            config: RETENTION_CONFIG の上書き
+        """
+        self.store = store or ArticleStore()
+        self.repository = repository
+        self.reports_dir = reports_dir
+        self.search_index = search_index
+        self.personalized_dir = personalized_dir
+        self.config = dict(RETENTION_CONFIG, **(config or {}))
+        self.index_path = self.config['index_path']
+
+    def run(self, today: Optional[date] = None) -> Dict[str, Any]:
+        """
+        旧形式の取り込み・パーティションのコンパクション・保持期間の適用を順に実行
+
+        Returns:
+            今回の実行結果
+        """
+        today = today or date.today()
+        index = self._load_index()
+        result = {
+            'started_at': datetime.now().isoformat(timespec='seconds'),
+            'legacy_files': self.import_legacy(index),
+            'migrated_partitions': self.migrate_analyzed(index),
+            'compacted_partitions': 0,
+            'merged_files': 0,
+            'duplicates': 0,
+            'dropped_partitions': 0,
+            'pruned_reports': 0
+        }
+
+        compact_before = today - timedelta(days=self.config['compact_after_days'])
+        for dataset in self.store.datasets():
+            for partition_dir in self.store.partitions(dataset, end_date=compact_before - timedelta(days=1)):
+                stats = self._compact_partition(dataset, partition_dir)
+                if stats:
+                    index['partitions'][f"{dataset}/{os.path.basename(partition_dir)}"] = stats
+                    result['compacted_partitions'] += 1
+                    result['merged_files'] += stats['source_files']
+                    result['duplicates'] += stats['duplicates']
+
+        result['dropped_partitions'] = self.apply_retention(index, today)
+        result['pruned_reports'] = self.prune_reports(index, today)
+        result['finished_at'] = datetime.now().isoformat(timespec='seconds')
+
+        index['runs'] = (index['runs'] + [result])[-30:]
+        self._save_index(index)
+
+        logger.info(
+            f"コンパクション完了: 旧形式{result['legacy_files']}ファイル取り込み, "
+            f"{result['compacted_partitions']}パーティション（{result['merged_files']}ファイル, 重複{result['duplicates']}件）, "
+            f"削除{result['dropped_partitions']}パーティション, レポート削除{result['pruned_reports']}件"
+        )
+        return result
+
+    def import_legacy(self, index: Dict[str, Any]) -> int:
+        """data/collected の実行ごとのJSON/CSVをストアに取り込んで削除"""
+        legacy_dir = self.config['legacy_dir']
+        if not os.path.isdir(legacy_dir):
+            return 0
+
+        imported = 0
+        for filename in sorted(os.listdir(legacy_dir)):
+            match = _LEGACY_FILE_RE.match(filename)
+            if not match:
+                continue
+            kind, timestamp, ext = match.groups()
+            path = os.path.join(legacy_dir, filename)
+            partition_date = datetime.strptime(timestamp, '%Y%m%d_%H%M%S').date()
+
+            if ext == 'csv':
+                # CSVはJSONと同じ内容のため、JSONがあれば（取り込み済みも含む）削除のみ
+                if f"articles_{timestamp}.json" not in index['legacy_imported'] and \
+                        not os.path.exists(os.path.join(legacy_dir, f"articles_{timestamp}.json")):
+                    continue
+            else:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                run_id = f"legacy_{timestamp}"
+                if kind == 'analysis_summary':
+                    self.store.write('summaries', [dict(data, run_id=timestamp)], run_id, partition_date)
+                elif kind == 'articles':
+                    self.store.write('articles', self._with_ids(data), run_id, partition_date)
+                else:
+                    self._write_analyzed(self._with_ids(data), run_id, partition_date)
+
+            os.remove(path)
+            index['legacy_imported'][filename] = partition_date.isoformat()
+            imported += 1
+
+        return imported
+
+    def migrate_analyzed(self, index: Dict[str, Any]) -> int:
+        """全列で保存していた旧 analyzed データセットを収集記事と分析結果の差分に分けて移行"""
+        migrated = 0
+        for partition_dir in self.store.partitions('analyzed'):
+            partition_date = self._partition_date(partition_dir)
+            records = self._with_ids(self.store.read('analyzed', start_date=partition_date, end_date=partition_date))
+            self._write_analyzed(records, f"migrated_{partition_date:%Y%m%d}", partition_date)
+            self.store.drop_partition('analyzed', partition_date)
+            index['partitions'].pop(f"analyzed/{os.path.basename(partition_dir)}", None)
+            migrated += 1
+        return migrated
+
+    def apply_retention(self, index: Dict[str, Any], today: date) -> int:
+        """保持期間を過ぎたパーティションと記事リポジトリの記事を削除"""
+        dropped = 0
+        for dataset, days in self.config['dataset_retention_days'].items():
+            if days is None:
+                continue
+            cutoff = today - timedelta(days=days)
+            for partition_dir in self.store.partitions(dataset, end_date=cutoff - timedelta(days=1)):
+                partition = os.path.basename(partition_dir)
+                self.store.drop_partition(dataset, self._partition_date(partition_dir))
+                index['partitions'].pop(f"{dataset}/{partition}", None)
+                index['dropped_partitions'].append(f"{dataset}/{partition}")
+                dropped += 1
+
+            if dataset == 'articles' and self.repository is not None:
+                self.repository.delete_before(datetime.combine(cutoff, datetime.min.time()))
+
+        return dropped
+
+    def prune_reports(self, index: Dict[str, Any], today: date) -> int:
+        """保持期間を過ぎたニュースレター・購読者別ニュースレターを削除（既定では無効）"""
+        days = self.config['report_retention_days']
+        if days is None or not os.path.isdir(self.reports_dir):
+            return 0
+
+        cutoff = (today - timedelta(days=days)).strftime('%Y%m%d')
+        pruned_editions = set()
+        for filename in sorted(os.listdir(self.reports_dir)):
+            match = _REPORT_FILE_RE.match(filename)
+            if match and match.group(1)[:8] < cutoff:
+                os.remove(os.path.join(self.reports_dir, filename))
+                pruned_editions.add(match.group(1))
+
+        if os.path.isdir(self.personalized_dir):
+            for name in os.listdir(self.personalized_dir):
+                if re.match(r'^\d{8}_\d{6}$', name) and name[:8] < cutoff:
+                    shutil.rmtree(os.path.join(self.personalized_dir, name))
+                    pruned_editions.add(name)
+
+        # 検索結果から削除した号へのリンクが出ないようにする
+        if self.search_index is not None and pruned_editions:
+            self.search_index.remove_editions(pruned_editions)
+
+        index['pruned_reports'].extend(sorted(pruned_editions))
+        return len(pruned_editions)
+
+    def _compact_partition(self, dataset: str, partition_dir: str) -> Optional[Dict[str, Any]]:
+        """パーティション内の複数ファイルを記事ID（なければ実行ID）で重複除去して1ファイルにまとめる"""
+        partition_date = self._partition_date(partition_dir)
+        files = self.store.part_files(dataset, partition_date, partition_date)
+        if not files or (len(files) == 1 and os.path.basename(files[0]).startswith('compacted-')):
+            return None
+
+        records = {}
+        total = 0
+        for record in self.store.read(dataset, start_date=partition_date, end_date=partition_date):
+            total += 1
+            key = record.get('id') or record.get('run_id') or json.dumps(record, sort_keys=True, default=str)
+            records.pop(key, None)  # 後から書かれたものを優先し、並び順も後ろに移す
+            records[key] = record
+
+        fields, dictionary_fields = COLUMNAR_DATASETS.get(dataset, (None, ()))
+        path = self.store.rewrite_partition(
+            dataset, partition_date, records.values(), fields=fields, dictionary_fields=dictionary_fields
+        )
+
+        return {
+            'file': os.path.basename(path),
+            'records': len(records),
+            'source_files': len(files),
+            'duplicates': total - len(records),
+            'bytes': os.path.getsize(path),
+            'compacted_at': datetime.now().isoformat(timespec='seconds')
+        }
+
+    def _write_analyzed(self, articles: List[Dict[str, Any]], run_id: str, partition_date: date):
+        """分析済み記事を収集記事と分析結果の差分に分けて書き込み"""
+        self.store.write(
+            'articles',
+            ({k: v for k, v in article.items() if k not in _DERIVED_FIELDS} for article in articles),
+            run_id, partition_date
+        )
+        self.store.write_columns(
+            'analysis', articles, ANALYSIS_FIELDS, dictionary_fields=ANALYSIS_DICTIONARY_FIELDS,
+            run_id=run_id, partition_date=partition_date
+        )
+
+    def _with_ids(self, articles) -> List[Dict[str, Any]]:
+        result = []
+        for article in articles:
+            article.setdefault('id', article_id(article))
+            result.append(article)
+        return result
+
+    def _partition_date(self, partition_dir: str) -> date:
+        return date.fromisoformat(os.path.basename(partition_dir).replace('date=', ''))
+
+    def _load_index(self) -> Dict[str, Any]:
+        index = {
+            'partitions': {},
+            'legacy_imported': {},
+            'dropped_partitions': [],
+            'pruned_reports': [],
+            'runs': []
+        }
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index.update(json.load(f))
+        return index
+
+    def _save_index(self, index: Dict[str, Any]):
+        index['updated_at'] = datetime.now().isoformat(timespec='seconds')
+        os.makedirs(os.path.dirname(self.index_path) or '.', exist_ok=True)
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.index_path)
@@ -0,0 +1,412 @@
+"""
+ジョブキューモジュール
+SQLiteのローカルジョブキューでソースごとの取得ジョブを配布し、複数のワーカープロセス・ノードで実行する
+"""
+
+import os
+import json
+import time
+import socket
+import sqlite3
+import logging
+import threading
+from typing import List, Dict, Any, Optional, Callable, Iterable, Set
+
+from config.scheduler import QUEUE_CONFIG
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    dedupe_key TEXT,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    run_at REAL NOT NULL,
+    lease_owner TEXT,
+    lease_expires REAL,
+    created_at REAL NOT NULL,
+    finished_at REAL,
+    last_error TEXT,
+    result TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_ready ON jobs(status, run_at);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_dedupe ON jobs(dedupe_key)
+    WHERE dedupe_key IS NOT NULL AND status IN ('queued', 'leased');
+CREATE TABLE IF NOT EXISTS seen_ids (
+    id TEXT PRIMARY KEY,
+    seen_at REAL NOT NULL
+);
+"""
+
+
+class JobQueue:
+    """
+    ジョブキューのインターフェース
+
+    外部サービスのキューを使う場合も同じメソッドを実装すればワーカー・スケジューラーはそのまま使える。
+    """
+
+    def enqueue(self, kind: str, payload: Dict[str, Any], dedupe_key: Optional[str] = None,
+                delay: float = 0) -> Optional[int]:
+        raise NotImplementedError
+
+    def lease(self, worker_id: str, lease_seconds: Optional[float] = None,
+              kinds: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def extend(self, job_id: int, worker_id: str, lease_seconds: Optional[float] = None) -> bool:
+        raise NotImplementedError
+
+    def ack(self, job_id: int, worker_id: str, result: Any = None) -> bool:
+        raise NotImplementedError
+
+    def fail(self, job_id: int, worker_id: str, error: str) -> str:
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, int]:
+        raise NotImplementedError
+
+    def pending(self) -> int:
+        raise NotImplementedError
+
+    def purge(self, older_than_days: Optional[float] = None) -> int:
+        raise NotImplementedError
+
+
+class SQLiteJobQueue(JobQueue):
+    def __init__(self, db_path: str = None, config: Optional[Dict[str, Any]] = None):
+        """
+        SQLiteのジョブキューを初期化
+
+        同じファイルを開いた複数のプロセスが、書き込みロック（BEGIN IMMEDIATE）の下で
+        ジョブを取り合う。リース期限を過ぎたジョブは別のワーカーが再取得する。
+
+        Args:
+            db_path: データベースのパス（複数ノードで使う場合は共有ファイルシステム上に置く）
+            config: QUEUE_CONFIG の上書き
+        """
+        self.config = dict(QUEUE_CONFIG, **(config or {}))
+        self.db_path = db_path or self.config['db_path']
+        self._local = threading.local()
+
+        os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+        self._connection().executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """スレッドごとの接続（トランザクションは明示的に開始する）"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _transaction(self, work: Callable[[sqlite3.Connection], Any]) -> Any:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = work(conn)
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return result
+
+    def enqueue(self, kind: str, payload: Dict[str, Any], dedupe_key: Optional[str] = None,
+                delay: float = 0) -> Optional[int]:
+        """
+        ジョブを登録
+
+        Args:
+            kind: ジョブの種類（ワーカーのハンドラー名）
+            payload: ジョブの引数（JSON化できる値）
+            dedupe_key: 同じキーのジョブが待機中・実行中なら登録しない
+            delay: 実行可能になるまでの秒数
+
+        Returns:
+            ジョブID（重複で登録しなかった場合は None）
+        """
+        now = time.time()
+        cursor = self._connection().execute(
+            "INSERT OR IGNORE INTO jobs (kind, payload, dedupe_key, max_attempts, run_at, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (kind, json.dumps(payload, ensure_ascii=False), dedupe_key,
+             self.config['max_attempts'], now + delay, now)
+        )
+        return cursor.lastrowid if cursor.rowcount else None
+
+    def lease(self, worker_id: str, lease_seconds: Optional[float] = None,
+              kinds: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        実行可能な最も古いジョブを1件リース
+
+        Returns:
+            ジョブ（id, kind, payload, attempts）。実行可能なジョブがなければ None
+        """
+        lease_seconds = lease_seconds or self.config['lease_seconds']
+
+        def work(conn):
+            now = time.time()
+            self._expire_leases(conn, now)
+
+            sql = "SELECT * FROM jobs WHERE status = 'queued' AND run_at <= ?"
+            params = [now]
+            if kinds:
+                sql += f" AND kind IN ({','.join('?' * len(kinds))})"
+                params += list(kinds)
+            row = conn.execute(sql + " ORDER BY run_at, id LIMIT 1", params).fetchone()
+            if row is None:
+                return None
+
+            conn.execute(
+                "UPDATE jobs SET status = 'leased', lease_owner = ?, lease_expires = ?, attempts = attempts + 1 "
+                "WHERE id = ?",
+                (worker_id, now + lease_seconds, row['id'])
+            )
+            return {
+                'id': row['id'],
+                'kind': row['kind'],
+                'payload': json.loads(row['payload']),
+                'attempts': row['attempts'] + 1
+            }
+
+        return self._transaction(work)
+
+    def extend(self, job_id: int, worker_id: str, lease_seconds: Optional[float] = None) -> bool:
+        """長時間かかるジョブのリース期限を延長"""
+        cursor = self._connection().execute(
+            "UPDATE jobs SET lease_expires = ? WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+            (time.time() + (lease_seconds or self.config['lease_seconds']), job_id, worker_id)
+        )
+        return cursor.rowcount > 0
+
+    def ack(self, job_id: int, worker_id: str, result: Any = None) -> bool:
+        """
+        ジョブの完了を記録
+
+        Returns:
+            リースが有効だった場合は True（期限切れで別のワーカーに渡っていれば False）
+        """
+        cursor = self._connection().execute(
+            "UPDATE jobs SET status = 'done', finished_at = ?, result = ?, lease_owner = NULL "
+            "WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+            (time.time(), json.dumps(result, ensure_ascii=False, default=str), job_id, worker_id)
+        )
+        return cursor.rowcount > 0
+
+    def fail(self, job_id: int, worker_id: str, error: str) -> str:
+        """
+        ジョブの失敗を記録し、試行回数が残っていれば待機時間を指数的に延ばして再登録
+
+        Returns:
+            失敗後の状態（queued / dead）。リースが無効だった場合は空文字
+        """
+        def work(conn):
+            row = conn.execute(
+                "SELECT attempts, max_attempts FROM jobs WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (job_id, worker_id)
+            ).fetchone()
+            if row is None:
+                return ''
+
+            now = time.time()
+            if row['attempts'] >= row['max_attempts']:
+                conn.execute(
+                    "UPDATE jobs SET status = 'dead', finished_at = ?, last_error = ?, lease_owner = NULL WHERE id = ?",
+                    (now, error, job_id)
+                )
+                return 'dead'
+
+            backoff = self.config['retry_base_seconds'] * 2 ** (row['attempts'] - 1)
+            conn.execute(
+                "UPDATE jobs SET status = 'queued', run_at = ?, last_error = ?, lease_owner = NULL, "
+                "lease_expires = NULL WHERE id = ?",
+                (now + backoff, error, job_id)
+            )
+            return 'queued'
+
+        return self._transaction(work)
+
+    def stats(self) -> Dict[str, int]:
+        """状態ごとのジョブ数"""
+        rows = self._connection().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        counts = {'queued': 0, 'leased': 0, 'done': 0, 'dead': 0}
+        counts.update({status: count for status, count in rows})
+        return counts
+
+    def pending(self) -> int:
+        """待機中・実行中のジョブ数"""
+        return self._connection().execute(
+            "SELECT COUNT(*) FROM jobs WHERE status IN ('queued', 'leased')"
+        ).fetchone()[0]
+
+    def purge(self, older_than_days: Optional[float] = None) -> int:
+        """
+        完了・失敗したジョブと古い取得済み記事IDを削除（継続収集のメンテナンスジョブから毎日呼ぶ）
+
+        Returns:
+            削除したジョブ数
+        """
+        days = older_than_days if older_than_days is not None else self.config['keep_done_days']
+        now = time.time()
+
+        def work(conn):
+            deleted = conn.execute(
+                "DELETE FROM jobs WHERE status IN ('done', 'dead') AND finished_at < ?", (now - days * 86400,)
+            ).rowcount
+            conn.execute("DELETE FROM seen_ids WHERE seen_at < ?", (now - self.config['keep_seen_days'] * 86400,))
+            return deleted
+
+        return self._transaction(work)
+
+    def seen_ids(self) -> 'SeenIds':
+        """ワーカー間で共有する取得済みの記事ID"""
+        return SeenIds(self)
+
+    def _expire_leases(self, conn: sqlite3.Connection, now: float):
+        """リース期限を過ぎたジョブを再登録（試行回数を使い切っていれば dead）"""
+        conn.execute(
+            "UPDATE jobs SET status = CASE WHEN attempts >= max_attempts THEN 'dead' ELSE 'queued' END, "
+            "lease_owner = NULL, last_error = 'lease expired', "
+            "finished_at = CASE WHEN attempts >= max_attempts THEN ? ELSE NULL END "
+            "WHERE status = 'leased' AND lease_expires <= ?",
+            (now, now)
+        )
+
+
+class SeenIds:
+    def __init__(self, queue: SQLiteJobQueue):
+        """
+        キューのデータベースに記録する取得済みの記事ID
+
+        in 演算子は取得中の絞り込みに使い、新着の確定は claim で行う（複数のワーカーが同じ記事を
+        同時に取得しても、新着として保存するのは先に登録したワーカーだけ）。
+        """
+        self.queue = queue
+
+    def __contains__(self, article_id: str) -> bool:
+        return self.queue._connection().execute(
+            "SELECT 1 FROM seen_ids WHERE id = ?", (article_id,)
+        ).fetchone() is not None
+
+    def claim(self, article_ids: Iterable[str]) -> Set[str]:
+        """
+        記事IDを登録し、このワーカーが新しく登録したIDを返す
+
+        Returns:
+            まだ登録されていなかった記事ID（他のワーカーが先に登録したIDは含まない）
+        """
+        def work(conn):
+            now = time.time()
+            return {
+                article_id for article_id in article_ids
+                if conn.execute(
+                    "INSERT OR IGNORE INTO seen_ids (id, seen_at) VALUES (?, ?)", (article_id, now)
+                ).rowcount
+            }
+
+        return self.queue._transaction(work)
+
+
+class QueueWorker:
+    def __init__(self, queue: JobQueue, collector, worker_id: Optional[str] = None,
+                 poll_seconds: Optional[float] = None, lease_seconds: Optional[float] = None):
+        """
+        キューからジョブをリースして実行するワーカー
+
+        Args:
+            queue: ジョブキュー
+            collector: NewsCollector（取得した記事は共有の記事ストア・リポジトリに保存）
+            worker_id: ワーカーの識別子（省略時はホスト名とプロセスID）
+            poll_seconds: ジョブがない時にキューを確認する間隔（省略時は QUEUE_CONFIG）
+            lease_seconds: リース期限（省略時は QUEUE_CONFIG。実行中は1/3ごとに延長）
+        """
+        self.queue = queue
+        self.collector = collector
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.poll_seconds = poll_seconds or QUEUE_CONFIG['poll_seconds']
+        self.lease_seconds = lease_seconds or QUEUE_CONFIG['lease_seconds']
+        self.handlers: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+            'fetch_source': self._fetch_source,
+        }
+        self.seen = queue.seen_ids() if isinstance(queue, SQLiteJobQueue) else set()
+        self.processed = 0
+        self.failed = 0
+        self._stopped = threading.Event()
+
+    def run(self, stop_when_empty: bool = False, max_jobs: Optional[int] = None) -> Dict[str, int]:
+        """
+        ジョブがなくなるか stop() が呼ばれるまで実行
+
+        Args:
+            stop_when_empty: 待機中・実行中のジョブがなくなったら終了する
+            max_jobs: 実行するジョブ数の上限
+        """
+        logger.info(f"ワーカー開始: {self.worker_id}")
+
+        while not self._stopped.is_set():
+            if max_jobs is not None and self.processed + self.failed >= max_jobs:
+                break
+            if self.run_once():
+                continue
+            if stop_when_empty and self.queue.pending() == 0:
+                break
+            # 再試行待ちのジョブや他のワーカーの実行中ジョブを待つ
+            self._stopped.wait(self.poll_seconds)
+
+        logger.info(f"ワーカー終了: {self.worker_id}（成功{self.processed}件, 失敗{self.failed}件）")
+        return {'processed': self.processed, 'failed': self.failed}
+
+    def run_once(self) -> bool:
+        """ジョブを1件実行（実行可能なジョブがなければ False）"""
+        job = self.queue.lease(self.worker_id, self.lease_seconds, kinds=list(self.handlers))
+        if job is None:
+            return False
+
+        # 実行中はリースを延長し続け、取得が長引いても別のワーカーに渡らないようにする
+        finished = threading.Event()
+        keeper = threading.Thread(target=self._keep_lease, args=(job['id'], finished),
+                                  name=f"lease-{job['id']}", daemon=True)
+        keeper.start()
+        try:
+            result = self.handlers[job['kind']](job['payload'])
+        except Exception as e:
+            status = self.queue.fail(job['id'], self.worker_id, str(e))
+            self.failed += 1
+            logger.error(f"ジョブ失敗: {job['kind']}#{job['id']}（{job['attempts']}回目, {status}）: {e}")
+            return True
+        finally:
+            finished.set()
+            keeper.join()
+
+        self.queue.ack(job['id'], self.worker_id, result)
+        self.processed += 1
+        return True
+
+    def stop(self):
+        self._stopped.set()
+
+    def _keep_lease(self, job_id: int, finished: threading.Event):
+        """ジョブが終わるまでリース期限の1/3ごとに延長"""
+        while not finished.wait(self.lease_seconds / 3):
+            if not self.queue.extend(job_id, self.worker_id, self.lease_seconds):
+                logger.warning(f"リースを延長できません（期限切れで別のワーカーに渡った可能性）: #{job_id}")
+                return
+
+    def _fetch_source(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """ソースを1つ取得し、新着の記事を共有の記事ストアに保存"""
+        articles = self.collector.poll_source(payload['kind'], payload['source'], self.seen)
+        if not isinstance(self.seen, SeenIds):
+            self.seen.update(article.id for article in articles)
+        return {'new_articles': len(articles)}
+
+
+def fetch_job_key(kind: str, source: Dict[str, Any]) -> str:
+    """同じソースの取得ジョブを重複して登録しないためのキー"""
+    return f"fetch:{kind}:{source['name']}"
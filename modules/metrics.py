@@ -0,0 +1,214 @@
+"""
+メトリクスモジュール
+収集・分析・レポート生成のカウンター・ゲージ・ヒストグラムを記録し、
+実行ごとに Prometheus テキスト形式と JSON スナップショットに書き出す
+"""
+
+import os
+import json
+import time
+import bisect
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+
+from config.storage import METRICS_CONFIG
+
+# 所要時間（秒）のヒストグラムの既定の区切り
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> _LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(key: _LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    escaped = (value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class MetricsRegistry:
+    def __init__(self, prefix: str = 'newsletter', metrics_dir: str = None):
+        """
+        メトリクスの登録先
+
+        記録は辞書の更新のみ（ロック1回）で、本番でも常時有効にできる。
+        カウンターはプロセスの起動からの累積値。
+
+        Args:
+            prefix: メトリクス名の接頭辞
+            metrics_dir: 書き出し先ディレクトリ
+        """
+        self.prefix = prefix
+        self.metrics_dir = metrics_dir or METRICS_CONFIG['metrics_dir']
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[_LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[_LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[_LabelKey, List]] = {}
+        self._buckets: Dict[str, Tuple[float, ...]] = {}
+
+    def set_buckets(self, name: str, buckets: Tuple[float, ...]):
+        """ヒストグラムの区切りを変更（最初の記録より前に呼ぶ）"""
+        self._buckets[name] = tuple(sorted(buckets))
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """カウンターを加算"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def set(self, name: str, value: float, **labels):
+        """ゲージを設定"""
+        key = _label_key(labels)
+        with self._lock:
+            self._gauges.setdefault(name, {})[key] = value
+
+    def observe(self, name: str, value: float, **labels):
+        """ヒストグラムに値を記録"""
+        key = _label_key(labels)
+        buckets = self._buckets.get(name, DEFAULT_BUCKETS)
+        index = bisect.bisect_left(buckets, value)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            entry = series.get(key)
+            if entry is None:
+                # [区切りごとの件数（最後は +Inf）, 合計, 件数]
+                entry = series[key] = [[0] * (len(buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """ブロックの所要時間（秒）をヒストグラムに記録"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def value(self, name: str, **labels) -> float:
+        """カウンター・ゲージの現在値（未記録なら0）"""
+        key = _label_key(labels)
+        with self._lock:
+            for metrics in (self._counters, self._gauges):
+                if key in metrics.get(name, {}):
+                    return metrics[name][key]
+        return 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON化できるスナップショット"""
+        with self._lock:
+            def series(metrics):
+                return {
+                    name: [{'labels': dict(key), 'value': value} for key, value in values.items()]
+                    for name, values in sorted(metrics.items())
+                }
+
+            histograms = {}
+            for name, values in sorted(self._histograms.items()):
+                buckets = self._buckets.get(name, DEFAULT_BUCKETS)
+                histograms[name] = [
+                    {
+                        'labels': dict(key),
+                        'buckets': dict(zip([str(b) for b in buckets] + ['+Inf'], counts)),
+                        'sum': total,
+                        'count': count
+                    }
+                    for key, (counts, total, count) in values.items()
+                ]
+
+            return {
+                'counters': series(self._counters),
+                'gauges': series(self._gauges),
+                'histograms': histograms
+            }
+
+    def to_prometheus(self) -> str:
+        """Prometheus のテキスト形式（node_exporter の textfile collector で読み込める）"""
+        lines = []
+        with self._lock:
+            for kind, metrics in (('counter', self._counters), ('gauge', self._gauges)):
+                for name, values in sorted(metrics.items()):
+                    full_name = f"{self.prefix}_{name}"
+                    lines.append(f"# TYPE {full_name} {kind}")
+                    for key, value in sorted(values.items()):
+                        lines.append(f"{full_name}{_format_labels(key)} {_format_value(value)}")
+
+            for name, values in sorted(self._histograms.items()):
+                full_name = f"{self.prefix}_{name}"
+                buckets = self._buckets.get(name, DEFAULT_BUCKETS) + (float('inf'),)
+                lines.append(f"# TYPE {full_name} histogram")
+                for key, (counts, total, count) in sorted(values.items()):
+                    cumulative = 0
+                    for bound, bucket_count in zip(buckets, counts):
+                        cumulative += bucket_count
+                        le = ('le', _format_value(bound) if bound == float('inf') else repr(bound))
+                        lines.append(f"{full_name}_bucket{_format_labels(key, le)} {cumulative}")
+                    lines.append(f"{full_name}_sum{_format_labels(key)} {_format_value(total)}")
+                    lines.append(f"{full_name}_count{_format_labels(key)} {count}")
+        return '\n'.join(lines) + '\n'
+
+    def export(self, run_id: Optional[str] = None) -> Dict[str, str]:
+        """
+        実行ごとのファイルと最新のファイル（latest.prom / latest.json）に書き出し
+
+        Returns:
+            書き出したファイルのパス（prom / json）
+        """
+        run_id = run_id or datetime.now().strftime('%Y%m%d_%H%M%S')
+        os.makedirs(self.metrics_dir, exist_ok=True)
+
+        snapshot = dict(self.snapshot(), run_id=run_id, exported_at=datetime.now().isoformat())
+        contents = {
+            'prom': self.to_prometheus(),
+            'json': json.dumps(snapshot, ensure_ascii=False, indent=2)
+        }
+
+        paths = {}
+        for extension, content in contents.items():
+            for name in (f"run_{run_id}", 'latest'):
+                path = os.path.join(self.metrics_dir, f"{name}.{extension}")
+                tmp_path = f"{path}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    f.write(content)
+                os.replace(tmp_path, path)
+            paths[extension] = os.path.join(self.metrics_dir, f"run_{run_id}.{extension}")
+
+        self._prune()
+        return paths
+
+    def _prune(self):
+        """保持数を超えた古い実行のファイルを削除"""
+        runs = sorted({
+            os.path.splitext(name)[0]
+            for name in os.listdir(self.metrics_dir)
+            if name.startswith('run_') and name.endswith(('.prom', '.json'))
+        })
+        for name in runs[:-METRICS_CONFIG['keep_runs']]:
+            for extension in ('prom', 'json'):
+                path = os.path.join(self.metrics_dir, f"{name}.{extension}")
+                if os.path.exists(path):
+                    os.remove(path)
+
+
+def load_latest(metrics_dir: str = None) -> Optional[Dict[str, Any]]:
+    """最後に書き出したスナップショット（なければ None）"""
+    path = os.path.join(metrics_dir or METRICS_CONFIG['metrics_dir'], 'latest.json')
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
@@ -0,0 +1,128 @@
+"""
+購読者別ニュースレター生成モジュール
+カテゴリブロックと注目記事カードを一度だけレンダリングし、購読者ごとに組み立てる
+"""
+
+import os
+import json
+from datetime import datetime
+from typing import List, Dict, Any, Iterator, Tuple
+import logging
+from jinja2 import Environment, FileSystemLoader
+
+from config.categories import CATEGORIES
+
+logger = logging.getLogger(__name__)
+
+
+def load_subscribers(path: str = "data/subscribers.json") -> List[Dict[str, Any]]:
+    """
+    購読者リストを読み込み
+
+    形式: [{"id": "u001", "name": "山田", "categories": ["llm_chatbot", "ai_coding"]}, ...]
+    categoriesが空の購読者には全カテゴリを配信する。
+    """
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+class PersonalizedRenderer:
+    def __init__(self, template_dir: str = "templates", output_dir: str = "data/personalized",
+                 top_count: int = 3):
+        """
+        購読者別レンダラーを初期化
+
+        Args:
+            template_dir: personalized.html のあるディレクトリ
+            output_dir: 購読者別HTMLの保存先
+            top_count: 購読者ごとの注目記事カード数
+        """
+        self.output_dir = output_dir
+        self.top_count = top_count
+        env = Environment(loader=FileSystemLoader(template_dir), autoescape=True)
+        self.macros = env.get_template("personalized.html").module
+
+    def render_editions(self, content: Dict[str, Any],
+                        subscribers: List[Dict[str, Any]]) -> Iterator[Tuple[str, str]]:
+        """
+        購読者ごとのHTMLを順に生成
+
+        Args:
+            content: NewsletterReporter のニュースレターコンテンツ
+            subscribers: 購読者リスト
+
+        Yields:
+            (購読者ID, HTML)
+        """
+        week_summary = content['week_summary']
+        categorized_articles = content['categorized_articles']
+        important_articles = content['important_articles']
+
+        # 号全体で共通のフラグメント
+        header = str(self.macros.edition_header(week_summary))
+        footer = str(self.macros.edition_footer(week_summary))
+        top_heading = str(self.macros.top_heading())
+        category_heading = str(self.macros.category_heading())
+        section_end = str(self.macros.section_end())
+
+        # カテゴリブロックと注目記事カードは初回利用時にのみレンダリング
+        category_fragments: Dict[str, str] = {}
+        card_fragments: Dict[Tuple[int, int], str] = {}
+        all_categories = [cid for cid in CATEGORIES if categorized_articles.get(cid)]
+
+        for subscriber in subscribers:
+            followed = [cid for cid in (subscriber.get('categories') or CATEGORIES) if cid in CATEGORIES]
+            followed_set = set(followed)
+
+            parts = [header, str(self.macros.reader_note(
+                subscriber.get('name', subscriber['id']),
+                [CATEGORIES[cid]['name'] for cid in followed]
+            ))]
+
+            # フォロー中カテゴリの注目記事カード
+            top_indexes = [
+                i for i, article in enumerate(important_articles)
+                if article.get('category') in followed_set
+            ][:self.top_count]
+            if top_indexes:
+                parts.append(top_heading)
+                for rank, index in enumerate(top_indexes, 1):
+                    key = (index, rank)
+                    if key not in card_fragments:
+                        card_fragments[key] = str(self.macros.top_card(important_articles[index], rank))
+                    parts.append(card_fragments[key])
+                parts.append(section_end)
+
+            # フォロー中カテゴリの記事リスト
+            blocks = [cid for cid in all_categories if cid in followed_set]
+            if blocks:
+                parts.append(category_heading)
+                for category_id in blocks:
+                    if category_id not in category_fragments:
+                        category_fragments[category_id] = str(self.macros.category_block(
+                            CATEGORIES[category_id]['name'], categorized_articles[category_id]
+                        ))
+                    parts.append(category_fragments[category_id])
+                parts.append(section_end)
+
+            parts.append(footer)
+            yield subscriber['id'], ''.join(parts)
+
+    def save_editions(self, content: Dict[str, Any], subscribers: List[Dict[str, Any]],
+                      timestamp: str = None) -> int:
+        """購読者別HTMLを output_dir/<timestamp>/<購読者ID>.html に保存"""
+        timestamp = timestamp or datetime.now().strftime('%Y%m%d_%H%M%S')
+        edition_dir = os.path.join(self.output_dir, timestamp)
+        os.makedirs(edition_dir, exist_ok=True)
+
+        count = 0
+        for subscriber_id, html in self.render_editions(content, subscribers):
+            filename = os.path.basename(str(subscriber_id))
+            with open(os.path.join(edition_dir, f"{filename}.html"), 'w', encoding='utf-8') as f:
+                f.write(html)
+            count += 1
+
+        logger.info(f"購読者別ニュースレター保存完了: {edition_dir} ({count}件)")
+        return count
@@ -0,0 +1,198 @@
+"""
+プロファイラーモジュール
+パイプラインの段階ごとに cProfile とスタックのサンプリングで CPU 時間の内訳を記録し、
+pstats ファイル・上位関数のレポート・フレームグラフ用の collapsed stack 形式で書き出す
+"""
+
+import os
+import io
+import sys
+import time
+import shutil
+import pstats
+import cProfile
+import logging
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+
+from config.storage import PROFILE_CONFIG
+
+logger = logging.getLogger(__name__)
+
+MODES = ['cprofile', 'sampling']
+
+
+class StackSampler:
+    def __init__(self, interval: float):
+        """
+        一定間隔でスタックを取得し、段階ごとに件数を数えるサンプリングプロファイラー
+
+        関数呼び出しごとのフックを使わないため、cProfile より実行への影響が小さい。
+        対象は start() を呼んだスレッドと、その後に起動したスレッド（スレッドプールなど）。
+
+        Args:
+            interval: サンプリング間隔（秒）
+        """
+        self.interval = interval
+        self.stage = 'pipeline'
+        self.samples: Dict[str, Counter] = {}
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._ignored: Set[int] = set()
+
+    def start(self):
+        # 開始前から動いているスレッド（HTTPサーバーなど）は対象外
+        self._ignored = {thread.ident for thread in threading.enumerate()} - {threading.get_ident()}
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stopped.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            counter = self.samples.setdefault(self.stage, Counter())
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or thread_id in self._ignored:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                counter[';'.join(reversed(stack))] += 1
+
+
+class PipelineProfiler:
+    def __init__(self, mode: str = None, output_dir: str = None, top_n: int = None):
+        """
+        パイプラインの段階ごとのプロファイラー
+
+        Args:
+            mode: cprofile（関数ごとの呼び出し回数・時間とサンプリング）/ sampling（サンプリングのみ）
+            output_dir: 書き出し先（省略時は PROFILE_CONFIG の profile_dir/<日時>）
+            top_n: 段階ごとのレポートに載せる関数の数
+        """
+        self.mode = mode or PROFILE_CONFIG['mode']
+        if self.mode not in MODES:
+            raise ValueError(f"未対応のプロファイルモード: {self.mode}")
+        self.output_dir = output_dir or os.path.join(
+            PROFILE_CONFIG['profile_dir'], datetime.now().strftime('%Y%m%d_%H%M%S')
+        )
+        self.top_n = top_n or PROFILE_CONFIG['top_n']
+        self.sampler = StackSampler(PROFILE_CONFIG['sample_interval_ms'] / 1000)
+        self.profiles: Dict[str, cProfile.Profile] = {}
+        self.durations: Dict[str, float] = {}
+        self._started = False
+
+    @contextmanager
+    def stage(self, name: str):
+        """段階の実行中だけプロファイルを取る"""
+        if not self._started:
+            self.sampler.start()
+            self._started = True
+
+        profile = None
+        if self.mode == 'cprofile':
+            profile = self.profiles.setdefault(name, cProfile.Profile())
+            profile.enable()
+        self.sampler.stage = name
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.durations[name] = self.durations.get(name, 0.0) + time.perf_counter() - start
+            self.sampler.stage = 'pipeline'
+            if profile is not None:
+                profile.disable()
+
+    def save(self) -> List[str]:
+        """
+        段階ごとのファイルと全体のレポートを書き出し
+
+        Returns:
+            書き出したファイルのパス
+        """
+        self.sampler.stop()
+        os.makedirs(self.output_dir, exist_ok=True)
+        paths = []
+
+        report = [f"プロファイル: {self.mode}（サンプリング間隔 {self.sampler.interval * 1000:.0f} ms）", ""]
+        for name, seconds in self.durations.items():
+            report.append(f"=== {name}: {seconds:.2f}秒 ===")
+            if name in self.profiles:
+                path = os.path.join(self.output_dir, f"{name}.pstats")
+                self.profiles[name].dump_stats(path)
+                paths.append(path)
+                report.append(self._top_functions(pstats.Stats(self.profiles[name])))
+            report.extend(self._top_samples(self.sampler.samples.get(name, Counter())))
+            report.append("")
+
+        # 段階をまとめた全体の pstats（snakeviz などで開く）
+        if self.profiles:
+            combined = None
+            for profile in self.profiles.values():
+                if combined is None:
+                    combined = pstats.Stats(profile)
+                else:
+                    combined.add(profile)
+            path = os.path.join(self.output_dir, 'pipeline.pstats')
+            combined.dump_stats(path)
+            paths.append(path)
+
+        # フレームグラフ用（flamegraph.pl / speedscope で読み込める）。先頭に段階名を付ける
+        path = os.path.join(self.output_dir, 'pipeline.collapsed')
+        with open(path, 'w', encoding='utf-8') as f:
+            for name, counter in self.sampler.samples.items():
+                for stack, count in counter.most_common():
+                    f.write(f"{name};{stack} {count}\n")
+        paths.append(path)
+
+        path = os.path.join(self.output_dir, 'report.txt')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(report))
+        paths.append(path)
+
+        self._prune()
+        logger.info(f"プロファイル保存完了: {self.output_dir}")
+        return paths
+
+    def _top_functions(self, stats: pstats.Stats) -> str:
+        """累積時間と自身の時間それぞれの上位関数"""
+        stream = io.StringIO()
+        stats.stream = stream
+        stats.strip_dirs()
+        for sort_key in ('cumulative', 'tottime'):
+            stream.write(f"--- 上位{self.top_n}関数（{sort_key}） ---\n")
+            stats.sort_stats(sort_key).print_stats(self.top_n)
+        return stream.getvalue()
+
+    def _top_samples(self, counter: Counter) -> List[str]:
+        """サンプル中にスタックの末端にあった回数の多い関数"""
+        total = sum(counter.values())
+        if not total:
+            return []
+        leaves = Counter()
+        for stack, count in counter.items():
+            leaves[stack.rsplit(';', 1)[-1]] += count
+        lines = [f"--- サンプリング上位{self.top_n}関数（{total}サンプル） ---"]
+        for function, count in leaves.most_common(self.top_n):
+            lines.append(f"{count / total:7.1%}  {function}")
+        return lines
+
+    def _prune(self):
+        """保持数を超えた古いプロファイルを削除"""
+        base_dir = os.path.dirname(self.output_dir)
+        runs = sorted(name for name in os.listdir(base_dir) if os.path.isdir(os.path.join(base_dir, name)))
+        for name in runs[:-PROFILE_CONFIG['keep_runs']]:
+            shutil.rmtree(os.path.join(base_dir, name), ignore_errors=True)
@@ -0,0 +1,101 @@
+"""
+レンダリングキャッシュモジュール
+ニュースレター内容とテンプレートのハッシュから、生成済みレポートの再利用を判定
+"""
+
+import os
+import json
+import hashlib
+from datetime import datetime
+from typing import Dict, Any, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 内容が同じでも実行ごとに変わる項目（フィンガープリントから除外）
+# published_date はテンプレート・テキスト・検索インデックスに出力されず、日付のないスクレイピング・arXiv の
+# 記事やパースできない日付には収集時刻が入るため、含めると再実行のたびにキャッシュを外れる
+VOLATILE_FIELDS = {'generated_date', 'recorded_at', 'published_date'}
+
+
+class RenderCache:
+    def __init__(self, cache_path: str = "data/cache/render_cache.json", max_entries: int = 100):
+        """
+        レンダリングキャッシュを初期化
+
+        Args:
+            cache_path: フィンガープリント→タイムスタンプ対応表の保存先
+            max_entries: 保持するエントリ数の上限
+        """
+        self.cache_path = cache_path
+        self.max_entries = max_entries
+
+    def fingerprint(self, content: Dict[str, Any], template_path: str) -> str:
+        """正規化したニュースレター内容とテンプレートのハッシュ"""
+        digest = hashlib.sha256()
+
+        normalized = json.dumps(
+            self._normalize(content), ensure_ascii=False, sort_keys=True, default=str
+        )
+        digest.update(normalized.encode('utf-8'))
+
+        if os.path.exists(template_path):
+            with open(template_path, 'rb') as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+
+        return digest.hexdigest()
+
+    def lookup(self, fingerprint: str, reports_dir: str) -> Optional[str]:
+        """生成済みレポートが残っていればそのタイムスタンプを返す"""
+        entry = self._load().get(fingerprint)
+        if not entry:
+            return None
+
+        timestamp = entry['timestamp']
+        for ext in ('html', 'txt'):
+            if not os.path.exists(os.path.join(reports_dir, f"newsletter_{timestamp}.{ext}")):
+                return None
+
+        return timestamp
+
+    def store(self, fingerprint: str, timestamp: str):
+        """フィンガープリントと生成したレポートのタイムスタンプを記録"""
+        entries = self._load()
+        entries[fingerprint] = {
+            'timestamp': timestamp,
+            'created_at': datetime.now().isoformat(timespec='seconds')
+        }
+
+        # 古いエントリから削除
+        if len(entries) > self.max_entries:
+            ordered = sorted(entries.items(), key=lambda x: x[1]['created_at'])
+            entries = dict(ordered[-self.max_entries:])
+
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entries, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.cache_path)
+
+    def _normalize(self, value: Any) -> Any:
+        """実行ごとに変わる項目を除き、浮動小数点を丸める"""
+        if isinstance(value, dict):
+            return {
+                str(k): self._normalize(v) for k, v in value.items()
+                if k not in VOLATILE_FIELDS
+            }
+        if isinstance(value, (list, tuple)):
+            return [self._normalize(v) for v in value]
+        if isinstance(value, float):
+            return round(value, 6)
+        return value
+
+    def _load(self) -> Dict[str, Any]:
+        if not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"レンダリングキャッシュを読み込めません: {e}")
+            return {}
@@ -8,15 +8,28 @@ import json
 from datetime import datetime, timedelta
 from typing import List, Dict, Any
 import logging
-from jinja2 import Template
-import pandas as pd
+
+from modules.search_index import SearchIndex
+from modules.trend_store import TrendStore, week_key
+from modules.topic_detector import TopicDetector
+from modules.render_cache import RenderCache
+from modules.article import Article, Level, to_articles, to_dicts
+from modules.accumulators import NewsletterAccumulator
+from modules.metrics import MetricsRegistry
+from modules import tracing
 
 logger = logging.getLogger(__name__)
 
 class NewsletterReporter:
-    def __init__(self):
+    def __init__(self, repository=None, metrics: MetricsRegistry = None):
         self.template_dir = "templates"
         self.reports_dir = "reports/newsletters"
+        self.search_index = SearchIndex("reports/search")
+        self.trend_store = TrendStore("data/trends")
+        self.topic_detector = TopicDetector("data/trends/topic_baseline.json")
+        self.render_cache = RenderCache("data/cache/render_cache.json")
+        self.repository = repository
+        self.metrics = metrics or MetricsRegistry()
         
         # ディレクトリ作成
         os.makedirs(self.reports_dir, exist_ok=True)
@@ -25,7 +38,7 @@ class NewsletterReporter:
         """週次ニュースレターを生成"""
         logger.info("ニュースレター生成開始")
         
-        articles = analysis_results['articles']
+        articles = to_articles(analysis_results['articles'])
         summary = analysis_results['summary']
         
         # カテゴリ別記事の整理
@@ -37,32 +50,121 @@ class NewsletterReporter:
         # トレンド分析
         trends = self._analyze_trends(articles)
         
+        return self._render_newsletter(summary, categorized_articles, important_articles, trends)
+    
+    def new_accumulator(self) -> NewsletterAccumulator:
+        """ストリーミング処理用のアキュムレーター（今週分として集計）"""
+        return NewsletterAccumulator(self.trend_store, self.topic_detector, week_key(datetime.now()))
+    
+    def generate_newsletter_from_accumulator(self, accumulator: NewsletterAccumulator) -> Dict[str, Any]:
+        """
+        逐次集計した結果から週次ニュースレターを生成
+        
+        カテゴリ別記事はカテゴリごとのスコア上位候補から重複除去して選ぶため、
+        同じタイトルの記事はスコアの高いものが残る。
+        """
+        logger.info("ニュースレター生成開始（ストリーミング）")
+        
+        summary = accumulator.summary.result()
+        
+        categorized_articles = None
+        if self.repository is not None:
+            try:
+                categorized_articles = self._organize_from_repository(accumulator.by_category.keys())
+            except Exception as e:
+                logger.error(f"記事リポジトリからの取得エラー（集計済みの候補で続行）: {e}")
+        if categorized_articles is None:
+            categorized_articles = {
+                category_id: self._remove_duplicates_by_title(candidates.items())[:10]
+                for category_id, candidates in accumulator.by_category.items()
+            }
+        
+        important_articles = accumulator.important.items()
+        trends = self._build_trends(accumulator.trend_row, accumulator.term_counter, accumulator.total)
+        
+        return self._render_newsletter(summary, categorized_articles, important_articles, trends)
+    
+    def _render_newsletter(self, summary: Dict[str, Any],
+                           categorized_articles: Dict[str, List[Article]],
+                           important_articles: List[Article],
+                           trends: Dict[str, Any]) -> Dict[str, Any]:
+        """コンテンツを作成してHTML・テキストレポートを生成・保存"""
         # ニュースレターコンテンツ作成
         newsletter_content = self._create_newsletter_content(
             summary, categorized_articles, important_articles, trends
         )
         
+        # 同じ内容・テンプレートで生成済みなら既存レポートを再利用
+        fingerprint = self.render_cache.fingerprint(
+            newsletter_content, os.path.join(self.template_dir, "newsletter.html")
+        )
+        cached_timestamp = self.render_cache.lookup(fingerprint, self.reports_dir)
+        if cached_timestamp:
+            logger.info(f"内容に変更がないため既存レポートを再利用: newsletter_{cached_timestamp}")
+            self.metrics.inc('reporter_cache_hits_total')
+            return self._load_cached_reports(cached_timestamp, summary, newsletter_content)
+        
         # HTMLレポート生成
-        html_report = self._generate_html_report(newsletter_content)
+        with self.metrics.timer('reporter_render_seconds', format='html'), \
+                tracing.span('html', 'render') as span:
+            html_report = self._generate_html_report(newsletter_content)
+            span.set(chars=len(html_report))
         
         # テキストレポート生成
-        text_report = self._generate_text_report(newsletter_content)
+        with self.metrics.timer('reporter_render_seconds', format='text'), \
+                tracing.span('text', 'render') as span:
+            text_report = self._generate_text_report(newsletter_content)
+            span.set(chars=len(text_report))
         
         # レポート保存
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         self._save_reports(html_report, text_report, timestamp)
         
+        # アーカイブ検索インデックスに今号の記事を追加
+        self._update_search_index(timestamp, newsletter_content)
+        
+        self.render_cache.store(fingerprint, timestamp)
+        
+        return {
+            'html_content': html_report,
+            'text_content': text_report,
+            'timestamp': timestamp,
+            'summary': summary,
+            'content': newsletter_content,
+            'cached': False
+        }
+    
+    def _load_cached_reports(self, timestamp: str, summary: Dict[str, Any],
+                             content: Dict[str, Any]) -> Dict[str, Any]:
+        """生成済みレポートを読み込み（再レンダリング・再保存・index.html更新は行わない）"""
+        html_filename = os.path.join(self.reports_dir, f"newsletter_{timestamp}.html")
+        text_filename = os.path.join(self.reports_dir, f"newsletter_{timestamp}.txt")
+        
+        with open(html_filename, 'r', encoding='utf-8') as f:
+            html_report = f.read()
+        with open(text_filename, 'r', encoding='utf-8') as f:
+            text_report = f.read()
+        
         return {
             'html_content': html_report,
             'text_content': text_report,
             'timestamp': timestamp,
-            'summary': summary
+            'summary': summary,
+            'content': content,
+            'cached': True
         }
     
-    def _organize_by_category(self, articles: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    def _organize_by_category(self, articles: List[Article]) -> Dict[str, List[Article]]:
         """記事をカテゴリ別に整理（網羅的に表示、重複除去、トップ10表示）"""
         from config.categories import CATEGORIES
         
+        # リポジトリがあれば今週分をカテゴリ・スコアの索引で取得
+        if self.repository is not None:
+            try:
+                return self._organize_from_repository(CATEGORIES.keys())
+            except Exception as e:
+                logger.error(f"記事リポジトリからの取得エラー（メモリ上の記事で続行）: {e}")
+        
         # 全カテゴリを初期化
         categorized = {}
         for category_id in CATEGORIES.keys():
@@ -72,13 +174,7 @@ class NewsletterReporter:
         # categorized['general'] = []
         
         for article in articles:
-            category = article.get('category', 'llm_chatbot')  # デフォルトはLLMカテゴリ
-            
-            # 重要度と注目度でソート用スコア
-            article['combined_score'] = (
-                article.get('importance_score', 0) + 
-                article.get('attention_score', 0)
-            )
+            category = article.category or 'llm_chatbot'  # デフォルトはLLMカテゴリ
             
             # カテゴリが存在する場合のみ追加
             if category in categorized:
@@ -91,20 +187,33 @@ class NewsletterReporter:
             
             # スコア順にソートしてトップ10を取得
             unique_articles.sort(
-                key=lambda x: x['combined_score'], 
+                key=lambda x: x.combined_score, 
                 reverse=True
             )
             categorized[category] = unique_articles[:10]  # トップ10に制限
         
         return categorized
     
-    def _remove_duplicates_by_title(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _organize_from_repository(self, category_ids) -> Dict[str, List[Article]]:
+        """リポジトリから今週のカテゴリ別上位記事を取得"""
+        since = datetime.now() - timedelta(days=7)
+        
+        # 重複除去で減る分を見込んで多めに取得
+        top_articles = self.repository.top_by_category(category_ids, since, limit=30)
+        
+        categorized = {}
+        for category_id, category_articles in top_articles.items():
+            categorized[category_id] = self._remove_duplicates_by_title(to_articles(category_articles))[:10]
+        
+        return categorized
+    
+    def _remove_duplicates_by_title(self, articles: List[Article]) -> List[Article]:
         """タイトルベースで重複記事を除去"""
         seen_titles = set()
         unique_articles = []
         
         for article in articles:
-            title = article.get('title', '')
+            title = article.title
             if not title:  # タイトルがNoneまたは空の場合はスキップ
                 continue
                 
@@ -122,73 +231,83 @@ class NewsletterReporter:
         
         return unique_articles
     
-    def _extract_important_articles(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _extract_important_articles(self, articles: List[Article]) -> List[Article]:
         """重要記事を抽出（重要度・注目度が高いもの）"""
         important_articles = [
             article for article in articles
-            if (article.get('importance_level') == 'high' or 
-                article.get('attention_level') == 'high')
+            if (article.importance_level is Level.HIGH or 
+                article.attention_level is Level.HIGH)
         ]
         
         # スコア順にソート
-        important_articles.sort(
-            key=lambda x: (x.get('importance_score', 0) + x.get('attention_score', 0)),
-            reverse=True
-        )
+        important_articles.sort(key=lambda x: x.combined_score, reverse=True)
         
         return important_articles[:15]  # 上位15件
     
-    def _analyze_trends(self, articles: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _analyze_trends(self, articles: List[Article]) -> Dict[str, Any]:
         """トレンド分析"""
+        row = self.trend_store.aggregate(articles, week_key(datetime.now()))
+        
+        term_counter = self.topic_detector.new_counter()
+        for article in articles:
+            self.topic_detector.add_terms(term_counter, article)
+        
+        return self._build_trends(row, term_counter, len(articles))
+    
+    def _build_trends(self, row: Dict[str, Any], term_counter, doc_count: int) -> Dict[str, Any]:
+        """今週の集計行と語のカウンタからトレンドを作成"""
+        from config.categories import CATEGORIES
+        
         trends = {
             'top_categories': [],
             'emerging_topics': [],
             'key_companies': [],
-            'technology_focus': []
+            'technology_focus': [],
+            'category_trends': [],
+            'rising_sources': [],
+            'rising_keywords': [],
+            'previous_week': None
         }
         
-        # カテゴリ別記事数
-        category_counts = {}
-        for article in articles:
-            category = article.get('category', 'general')
-            category_counts[category] = category_counts.get(category, 0) + 1
-        
         # 上位カテゴリ
         trends['top_categories'] = sorted(
-            category_counts.items(), 
+            row['categories'].items(), 
             key=lambda x: x[1], 
             reverse=True
         )[:3]
         
-        # キーワード分析
-        all_titles = ' '.join([a.get('title', '') for a in articles])
-        trends['emerging_topics'] = self._extract_emerging_topics(all_titles)
-        
-        return trends
-    
-    def _extract_emerging_topics(self, text: str) -> List[str]:
-        """新興トピックを抽出"""
-        # 簡単なキーワード分析（実際の実装ではより高度な分析が必要）
-        keywords = [
-            'AI', 'machine learning', 'deep learning', 'generative',
-            'automation', 'robotics', 'autonomous', 'intelligent',
-            'neural', 'algorithm', 'model', 'framework'
-        ]
-        
-        emerging = []
-        text_lower = text.lower()
+        # 週次集計を追記し、過去週との比較を取得
+        try:
+            weekly = self.trend_store.record_row(row)
+            trends['previous_week'] = weekly['previous_week']
+            trends['category_trends'] = [
+                dict(item, name=CATEGORIES.get(item['key'], {}).get('name', item['key']))
+                for item in weekly['categories']
+            ]
+            trends['rising_sources'] = [item for item in weekly['sources'] if item['delta'] > 0][:5]
+            trends['rising_keywords'] = [item for item in weekly['keywords'] if item['delta'] > 0][:5]
+        except Exception as e:
+            logger.error(f"週次トレンド集計エラー: {e}")
         
-        for keyword in keywords:
-            if keyword.lower() in text_lower:
-                emerging.append(keyword)
+        # 新興トピック検出（過去週のベースラインに対するバースト度順）
+        try:
+            topics = self.topic_detector.detect_counts(term_counter, doc_count, top_n=5)
+            trends['emerging_topics'] = [topic['term'] for topic in topics]
+        except Exception as e:
+            logger.error(f"新興トピック検出エラー: {e}")
         
-        return emerging[:5]  # 上位5件
+        return trends
     
     def _create_newsletter_content(self, summary: Dict[str, Any], 
-                                 categorized_articles: Dict[str, List[Dict[str, Any]]],
-                                 important_articles: List[Dict[str, Any]],
+                                 categorized_articles: Dict[str, List[Article]],
+                                 important_articles: List[Article],
                                  trends: Dict[str, Any]) -> Dict[str, Any]:
-        """ニュースレターコンテンツを作成"""
+        """ニュースレターコンテンツを作成（記事はテンプレート・JSON用の辞書に変換）"""
+        categorized_articles = {
+            category_id: to_dicts(category_articles, derived=True)
+            for category_id, category_articles in categorized_articles.items()
+        }
+        important_articles = to_dicts(important_articles, derived=True)
         
         # 週次サマリー
         week_summary = {
@@ -261,8 +380,10 @@ class NewsletterReporter:
         
         return template.render(**template_vars)
     
-    def _load_html_template(self) -> Template:
+    def _load_html_template(self) -> 'Template':
         """HTMLテンプレートを読み込み"""
+        from jinja2 import Template  # レポート生成時のみ読み込む
+        
         template_path = os.path.join(self.template_dir, "newsletter.html")
         
         if not os.path.exists(template_path):
@@ -315,6 +436,20 @@ class NewsletterReporter:
             <p><strong>総記事数:</strong> {{ week_summary.total_articles }}件</p>
             <p><strong>高重要度記事:</strong> {{ week_summary.high_importance_count }}件</p>
             <p><strong>高注目度記事:</strong> {{ week_summary.high_attention_count }}件</p>
+            {% if trends.previous_week %}
+            <h3>📈 カテゴリ別トレンド（前週 {{ trends.previous_week }} 比）</h3>
+            <ul>
+            {% for item in trends.category_trends[:5] %}
+                <li>{{ item.name }}: {{ item.count }}件（前週比 {{ "%+d"|format(item.delta) }}{% if item.moving_average is not none %}、移動平均 {{ "%.1f"|format(item.moving_average) }}{% endif %}）</li>
+            {% endfor %}
+            </ul>
+            {% if trends.rising_keywords %}
+            <p><strong>急上昇キーワード:</strong> {{ trends.rising_keywords|map(attribute='key')|join(', ') }}</p>
+            {% endif %}
+            {% endif %}
+            {% if trends.emerging_topics %}
+            <p><strong>🔥 新興トピック:</strong> {{ trends.emerging_topics|join(', ') }}</p>
+            {% endif %}
         </div>
         
         <div class="category">
@@ -437,6 +572,20 @@ class NewsletterReporter:
         text_parts.append(f"高注目度記事: {content['week_summary']['high_attention_count']}件")
         text_parts.append("")
         
+        # 前週比トレンド
+        trends = content['trends']
+        if trends.get('previous_week'):
+            text_parts.append(f"📈【カテゴリ別トレンド（前週 {trends['previous_week']} 比）】")
+            for item in trends['category_trends'][:5]:
+                moving_average = item['moving_average'] or 0
+                text_parts.append(f"  {item['name']}: {item['count']}件 (前週比 {item['delta']:+d}, 移動平均 {moving_average:.1f})")
+            if trends['rising_keywords']:
+                text_parts.append(f"  急上昇キーワード: {', '.join(item['key'] for item in trends['rising_keywords'])}")
+            text_parts.append("")
+        if trends.get('emerging_topics'):
+            text_parts.append(f"🔥【新興トピック】{', '.join(trends['emerging_topics'])}")
+            text_parts.append("")
+        
         # トップ3記事（詳細版）
         text_parts.append("🔥【注目記事トップ3（詳細版）】")
         for i, article in enumerate(content['top_articles'][:3], 1):
@@ -478,17 +627,31 @@ class NewsletterReporter:
         html_filename = os.path.join(self.reports_dir, f"newsletter_{timestamp}.html")
         with open(html_filename, 'w', encoding='utf-8') as f:
             f.write(html_content)
+        self.metrics.inc('reporter_bytes_written_total', os.path.getsize(html_filename), format='html')
         
         # テキストレポート保存
         text_filename = os.path.join(self.reports_dir, f"newsletter_{timestamp}.txt")
         with open(text_filename, 'w', encoding='utf-8') as f:
             f.write(text_content)
+        self.metrics.inc('reporter_bytes_written_total', os.path.getsize(text_filename), format='text')
         
         # index.htmlを更新
         self._update_index_html()
         
         logger.info(f"レポート保存完了: {html_filename}, {text_filename}")
     
+    def _update_search_index(self, timestamp: str, content: Dict[str, Any]):
+        """検索インデックスに今号の掲載記事を追加（差分のみ）"""
+        try:
+            edition_articles = list(content['top_articles']) + list(content['important_articles'])
+            for articles in content['categorized_articles'].values():
+                edition_articles.extend(articles)
+            
+            self.search_index.add_edition(timestamp, f"newsletter_{timestamp}.html", edition_articles)
+            
+        except Exception as e:
+            logger.error(f"検索インデックス更新エラー: {e}")
+    
     def _update_index_html(self):
         """index.htmlを最新の3つのニュースレターで更新"""
         try:
@@ -627,6 +790,42 @@ class NewsletterReporter:
             color: #007acc;
             margin-top: 0;
         }
+        .search-box {
+            margin-bottom: 30px;
+        }
+        .search-box input {
+            width: 100%;
+            box-sizing: border-box;
+            padding: 12px 16px;
+            font-size: 1em;
+            border: 2px solid #e9ecef;
+            border-radius: 8px;
+        }
+        .search-box input:focus {
+            outline: none;
+            border-color: #007acc;
+        }
+        .search-hit {
+            margin: 8px 0;
+            padding: 10px 15px;
+            background: #f8f9fa;
+            border-left: 3px solid #007acc;
+            border-radius: 4px;
+        }
+        .search-hit a {
+            color: #007acc;
+            text-decoration: none;
+        }
+        .search-hit .source {
+            font-size: 0.85em;
+            color: #666;
+            margin-left: 10px;
+        }
+        .search-status {
+            font-size: 0.9em;
+            color: #666;
+            margin-top: 10px;
+        }
     </style>
 </head>
 <body>
@@ -636,6 +835,11 @@ class NewsletterReporter:
             <p>生成AI分野の最新情報を自動収集・分析した週次ニュースレター</p>
         </div>
         
+        <div class="search-box">
+            <input type="search" id="search-input" placeholder="過去のニュースレターを検索（例: Claude, 画像生成）" autocomplete="off">
+            <div id="search-results"></div>
+        </div>
+        
 """
         
         # ニュースレター項目を生成
@@ -671,10 +875,109 @@ class NewsletterReporter:
                 <li><strong>🏷️ AI分析</strong>: 重要度・注目度の自動評価とカテゴリ分類</li>
                 <li><strong>📊 スマート表示</strong>: トップ3記事は詳細、その他はタイトル・リンクのみの効率的な情報提供</li>
                 <li><strong>🔄 自動更新</strong>: 最新3件のニュースレターを自動表示</li>
+                <li><strong>🔎 アーカイブ検索</strong>: 過去の全ニュースレターの記事をキーワード検索</li>
                 <li><strong>🛠️ 技術</strong>: Python、機械学習、自然言語処理を活用した高度な分析システム</li>
             </ul>
         </div>
     </div>
+    <script>
+    // アーカイブ検索（reports/search の転置インデックスを必要なシャードだけ取得）
+    (function () {
+        var BASE = 'reports/search/';
+        var STOPWORDS = {};
+        ('a an and are as at be by for from has in is it its of on or that the this to ' +
+         'was with you your we our how what why').split(' ').forEach(function (w) { STOPWORDS[w] = true; });
+        var cache = {};
+        var input = document.getElementById('search-input');
+        var results = document.getElementById('search-results');
+        var timer = null;
+
+        function fetchJSON(path) {
+            if (!cache[path]) {
+                cache[path] = fetch(BASE + path).then(function (r) { return r.ok ? r.json() : {}; });
+            }
+            return cache[path];
+        }
+
+        function tokenize(text) {
+            var s = text.normalize('NFKC').toLowerCase(), tokens = [];
+            (s.match(/[a-z0-9]+/g) || []).forEach(function (t) {
+                if (t.length > 1 && !STOPWORDS[t]) tokens.push(t);
+            });
+            (s.match(/[\u3040-\u30ff\u3400-\u9fff]+/g) || []).forEach(function (run) {
+                if (run.length === 1) tokens.push(run);
+                for (var i = 0; i + 1 < run.length; i++) tokens.push(run.substr(i, 2));
+            });
+            return tokens.filter(function (t, i) { return tokens.indexOf(t) === i; });
+        }
+
+        function shardOf(token, numShards) {
+            var bytes = new TextEncoder().encode(token), h = 0x811c9dc5;
+            for (var i = 0; i < bytes.length; i++) {
+                h ^= bytes[i];
+                h = Math.imul(h, 0x01000193) >>> 0;
+            }
+            return h % numShards;
+        }
+
+        function escapeHtml(text) {
+            return String(text).replace(/[&<>"']/g, function (c) {
+                return {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'}[c];
+            });
+        }
+
+        function search(query) {
+            var tokens = tokenize(query);
+            if (!tokens.length) { results.innerHTML = ''; return; }
+
+            fetchJSON('manifest.json').then(function (manifest) {
+                var shardFetches = tokens.map(function (t) {
+                    return fetchJSON('shards/' + ('00' + shardOf(t, manifest.shards)).slice(-3) + '.json');
+                });
+                return Promise.all(shardFetches).then(function (shards) {
+                    // 全トークンを含む (号, 記事) の組を積集合で求める
+                    var hits = null;
+                    tokens.forEach(function (t, i) {
+                        var postings = shards[i][t] || [], current = {};
+                        for (var j = 0; j < postings.length; j += 2) {
+                            var key = postings[j] + ':' + postings[j + 1];
+                            if (hits === null || hits[key]) current[key] = [postings[j], postings[j + 1]];
+                        }
+                        hits = current;
+                    });
+                    // 保持期間切れで削除された号（null）は除く
+                    var pairs = Object.keys(hits).map(function (k) { return hits[k]; })
+                        .filter(function (p) { return manifest.editions[p[0]]; });
+                    pairs.sort(function (x, y) { return y[0] - x[0] || x[1] - y[1]; });
+                    var total = pairs.length;
+                    pairs = pairs.slice(0, 30);
+                    return Promise.all(pairs.map(function (p) {
+                        return fetchJSON('docs/' + manifest.editions[p[0]] + '.json');
+                    })).then(function (docs) { render(pairs, docs, total); });
+                });
+            }).catch(function () {
+                results.innerHTML = '<div class="search-status">検索インデックスを読み込めませんでした</div>';
+            });
+        }
+
+        function render(pairs, docs, total) {
+            var html = pairs.map(function (p, i) {
+                var doc = docs[i], article = (doc.articles || [])[p[1]];
+                if (!article) return '';
+                return '<div class="search-hit"><a href="' + escapeHtml(article[1]) + '" target="_blank">' +
+                    escapeHtml(article[0]) + '</a><span class="source">[' + escapeHtml(article[2]) + ']</span>' +
+                    '<span class="source"><a href="reports/newsletters/' + escapeHtml(doc.file) + '" target="_blank">' +
+                    escapeHtml(doc.date) + '号</a></span></div>';
+            }).join('');
+            results.innerHTML = html + '<div class="search-status">' + total + '件ヒット</div>';
+        }
+
+        input.addEventListener('input', function () {
+            clearTimeout(timer);
+            timer = setTimeout(function () { search(input.value); }, 200);
+        });
+    })();
+    </script>
 </body>
 </html>"""
         
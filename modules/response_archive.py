@@ -0,0 +1,180 @@
+"""
+レスポンスアーカイブモジュール
+収集時の生のレスポンス本文を内容のハッシュで圧縮保存し、実行ごとのマニフェストからオフラインで再生する
+"""
+
+import os
+import json
+import gzip
+import hashlib
+import threading
+from collections import defaultdict, deque
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+from urllib.parse import urlencode
+import logging
+
+from config.storage import ARCHIVE_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+class ArchiveMiss(LookupError):
+    """再生中のリクエストがアーカイブに記録されていない"""
+
+
+class ArchivedResponse:
+    def __init__(self, url: str, status_code: int, content: bytes, headers: Dict[str, str]):
+        """アーカイブから再生したレスポンス（収集処理で使う requests.Response の属性のみ）"""
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+        content_type = headers.get('Content-Type', '')
+        self.encoding = content_type.split('charset=')[-1].strip() if 'charset=' in content_type else 'utf-8'
+
+    @property
+    def text(self) -> str:
+        try:
+            return self.content.decode(self.encoding, errors='replace')
+        except LookupError:
+            return self.content.decode('utf-8', errors='replace')
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+    def iter_content(self, chunk_size: int = 1):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def close(self):
+        pass
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            import requests
+            raise requests.HTTPError(f"{self.status_code} (アーカイブ): {self.url}")
+
+
+def request_key(url: str, params: Optional[Dict[str, Any]] = None,
+                redact_params: Optional[List[str]] = None) -> str:
+    """URLとクエリパラメータからリクエストのキーを作成（APIキーなどは除く）"""
+    redact = set(redact_params if redact_params is not None else ARCHIVE_CONFIG['redact_params'])
+    items = sorted((k, str(v)) for k, v in (params or {}).items() if k not in redact)
+    return f"{url}?{urlencode(items)}" if items else url
+
+
+class ResponseArchive:
+    def __init__(self, mode: str, run_id: Optional[str] = None, base_dir: str = None):
+        """
+        レスポンスアーカイブを初期化
+
+        Args:
+            mode: 'capture'（取得したレスポンスを保存）または 'replay'（保存したレスポンスを返す）
+            run_id: 実行ID（capture では省略時に現在時刻、replay では必須）
+            base_dir: 保存先ディレクトリ（blobs/ に本文、runs/ にマニフェストを置く）
+        """
+        if mode not in ('capture', 'replay'):
+            raise ValueError(f"不明なモード: {mode}")
+        if mode == 'replay' and not run_id:
+            raise ValueError("replay には実行IDが必要です")
+
+        self.mode = mode
+        self.base_dir = base_dir or ARCHIVE_CONFIG['archive_dir']
+        self.run_id = run_id or datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.blobs_dir = os.path.join(self.base_dir, 'blobs')
+        self.manifest_path = os.path.join(self.base_dir, 'runs', f"{self.run_id}.jsonl")
+        self._pending = None
+        self.captured_at = None
+        self._lock = threading.Lock()  # 並行収集で本文・マニフェストの書き込みが重ならないようにする
+
+        if mode == 'replay':
+            self._pending = self._load_manifest()
+            fetched = [entry['fetched_at'] for queue in self._pending.values() for entry in queue]
+            self.captured_at = datetime.fromisoformat(min(fetched)) if fetched else datetime.now()
+            logger.info(f"レスポンスアーカイブを再生: {self.run_id}（{sum(len(q) for q in self._pending.values())}件）")
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == 'replay'
+
+    def record(self, url: str, params: Optional[Dict[str, Any]], response) -> str:
+        """
+        レスポンス本文を保存し、マニフェストに1行追記
+
+        Returns:
+            本文のSHA-256
+        """
+        content = response.content or b''
+        digest = hashlib.sha256(content).hexdigest()
+        blob_path = self._blob_path(digest)
+
+        entry = {
+            'key': request_key(url, params),
+            'url': url,
+            'status': response.status_code,
+            'content_type': response.headers.get('Content-Type', ''),
+            'sha256': digest,
+            'size': len(content),
+            'fetched_at': datetime.now().isoformat(timespec='seconds')
+        }
+        # 再生時も同じ待機・再試行になるよう Retry-After を残す
+        if response.headers.get('Retry-After'):
+            entry['retry_after'] = response.headers['Retry-After']
+
+        with self._lock:
+            # 同じ内容の本文は実行をまたいで1つだけ保存
+            if not os.path.exists(blob_path):
+                os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                tmp_path = f"{blob_path}.tmp"
+                with gzip.open(tmp_path, 'wb', compresslevel=ARCHIVE_CONFIG['compress_level']) as f:
+                    f.write(content)
+                os.replace(tmp_path, blob_path)
+
+            os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+            with open(self.manifest_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + '\n')
+
+        return digest
+
+    def replay(self, url: str, params: Optional[Dict[str, Any]] = None) -> ArchivedResponse:
+        """
+        記録されたレスポンスを返す
+
+        同じリクエストが複数回記録されている場合は記録順に返す。
+        """
+        key = request_key(url, params)
+        queue = self._pending.get(key)
+        if not queue:
+            raise ArchiveMiss(f"アーカイブにないリクエスト: {key}")
+
+        entry = queue.popleft()
+        with gzip.open(self._blob_path(entry['sha256']), 'rb') as f:
+            content = f.read()
+
+        headers = {'Content-Type': entry.get('content_type', ''), 'Content-Length': str(len(content))}
+        if entry.get('retry_after'):
+            headers['Retry-After'] = entry['retry_after']
+        return ArchivedResponse(entry['url'], entry['status'], content, headers)
+
+    def runs(self) -> List[str]:
+        """記録されている実行ID（古い順）"""
+        runs_dir = os.path.join(self.base_dir, 'runs')
+        if not os.path.isdir(runs_dir):
+            return []
+        return sorted(name[:-len('.jsonl')] for name in os.listdir(runs_dir) if name.endswith('.jsonl'))
+
+    def _load_manifest(self) -> Dict[str, deque]:
+        if not os.path.exists(self.manifest_path):
+            raise FileNotFoundError(f"アーカイブのマニフェストがありません: {self.manifest_path}")
+
+        pending = defaultdict(deque)
+        with open(self.manifest_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    pending[entry['key']].append(entry)
+        return pending
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.blobs_dir, digest[:2], f"{digest}.gz")
@@ -0,0 +1,229 @@
+"""
+レスポンス本文モジュール
+本文をチャンクごとにストリームで読み込み、1レスポンスの上限と並行取得全体で読み込み中のバイト数の上限を適用する。
+RSS・Atom は expat で逐次パースし、必要な件数のエントリーを読んだ時点で取得を打ち切る
+"""
+
+import threading
+from xml.parsers import expat
+from typing import Callable, Iterator, List, Optional
+
+
+class ResponseTooLarge(Exception):
+    """本文が max_response_bytes を超えたため読み込みを中止した"""
+
+
+class ByteBudget:
+    def __init__(self, limit: int):
+        """
+        並行取得全体で読み込み中の本文のバイト数の上限
+
+        確保できるまで acquire が待つため、上限に達すると新しい本文の読み込みが止まる（サーバー側も送信を待つ）。
+
+        Args:
+            limit: 上限のバイト数
+        """
+        self.limit = limit
+        self.in_use = 0
+        self.peak = 0
+        self.waits = 0
+        self._condition = threading.Condition()
+
+    def acquire(self, size: int) -> int:
+        """
+        size バイトを確保（上限より大きい場合は上限まで）
+
+        他に確保している本文がなければ待たずに確保するため、1つの本文で止まることはない。
+
+        Returns:
+            確保したバイト数（release に渡す）
+        """
+        size = min(size, self.limit)
+        with self._condition:
+            if self.in_use and self.in_use + size > self.limit:
+                self.waits += 1
+                while self.in_use and self.in_use + size > self.limit:
+                    self._condition.wait()
+            self.in_use += size
+            self.peak = max(self.peak, self.in_use)
+        return size
+
+    def release(self, size: int):
+        if size <= 0:
+            return
+        with self._condition:
+            self.in_use -= size
+            self._condition.notify_all()
+
+
+class ResponseBody:
+    def __init__(self, response, budget: ByteBudget, max_bytes: int, chunk_bytes: int,
+                 on_close: Optional[Callable[['ResponseBody'], None]] = None):
+        """
+        stream=True で取得したレスポンスの本文
+
+        作成時に本文の見込みサイズ（Content-Length、なければ max_bytes）を budget から確保し、
+        全て読み込んだ時点で実際のサイズまで減らす。close（with の終了）で確保を解放して接続を閉じる。
+
+        Args:
+            response: requests.Response（stream=True）またはアーカイブから再生したレスポンス
+            budget: 並行取得全体の上限
+            max_bytes: 1レスポンスの上限（超える本文は ResponseTooLarge）
+            chunk_bytes: 1回に読み込むバイト数
+            on_close: 閉じた時に呼ぶ関数（取得時間・バイト数の記録）
+        """
+        self.response = response
+        self.url = response.url
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.encoding = response.encoding
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.complete = False
+        self.aborted = False
+        self._budget = budget
+        self._reserved = 0
+        self._chunks: List[bytes] = []
+        self._stream = response.iter_content(chunk_bytes)
+        self._on_close = on_close
+        self._closed = False
+
+        length = self._content_length()
+        if length is not None and length > max_bytes:
+            self.aborted = True
+            self.close()
+            raise ResponseTooLarge(f"本文が上限を超えています（{length:,} > {max_bytes:,} バイト）: {self.url}")
+        self._reserved = budget.acquire(length if length is not None else max_bytes)
+
+    def __enter__(self) -> 'ResponseBody':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def iter_chunks(self) -> Iterator[bytes]:
+        """本文を先頭からチャンクごとに返す（読み込んだチャンクは read() のために保持する）"""
+        index = 0
+        while True:
+            if index < len(self._chunks):
+                yield self._chunks[index]
+                index += 1
+            elif self.complete or self._read_chunk() is None:
+                return
+
+    def read(self) -> bytes:
+        """残りを全て読み込み、本文全体を返す"""
+        while not self.complete and self._read_chunk() is not None:
+            pass
+        return b''.join(self._chunks)
+
+    @property
+    def content(self) -> bytes:
+        return self.read()
+
+    def buffered(self) -> bytes:
+        """これまでに読み込んだ部分"""
+        return b''.join(self._chunks)
+
+    def raise_for_status(self):
+        self.response.raise_for_status()
+
+    def close(self):
+        """確保を解放して接続を閉じる（読み込んでいない残りは取得しない）"""
+        if self._closed:
+            return
+        self._closed = True
+        self.response.close()
+        self._budget.release(self._reserved)
+        self._reserved = 0
+        self._chunks = []
+        if self._on_close:
+            self._on_close(self)
+
+    def _read_chunk(self) -> Optional[bytes]:
+        chunk = next(self._stream, None)
+        if chunk is None:
+            self.complete = True
+            # 見込みより小さかった分を他の本文に回す
+            if self._reserved > self.size:
+                self._budget.release(self._reserved - self.size)
+                self._reserved = self.size
+            return None
+
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            self.aborted = True
+            self.close()
+            raise ResponseTooLarge(f"本文が上限（{self.max_bytes:,} バイト）を超えたため読み込みを中止しました: {self.url}")
+        self._chunks.append(chunk)
+        return chunk
+
+    def _content_length(self) -> Optional[int]:
+        try:
+            return int(self.headers.get('Content-Length'))
+        except (TypeError, ValueError):
+            return None
+
+
+class _EnoughEntries(Exception):
+    pass
+
+
+# エントリーとして数える要素と、その親要素（RSS 2.0 / RSS 1.0 / Atom）
+_ENTRY_TAGS = ('item', 'entry')
+_ENTRY_PARENTS = ('channel', 'RDF', 'feed')
+
+
+def read_feed(body: ResponseBody, max_entries: int) -> bytes:
+    """
+    RSS・Atom の本文を先頭の max_entries 件のエントリーまで読み込む
+
+    expat でチャンクごとに逐次パースし、max_entries 件目のエントリーが閉じた時点で取得を打ち切って、
+    開いている要素の終了タグを補った文書を返す（feedparser には先頭の max_entries 件だけの文書を渡す）。
+    XMLとして読めない本文（未定義の実体参照・expat が対応していない文字コードなど）は、残りも読み込んで全体を返す。
+
+    Args:
+        body: レスポンスの本文
+        max_entries: 必要なエントリー数
+
+    Returns:
+        feedparser に渡す文書
+    """
+    parser = expat.ParserCreate()
+    stack: List[str] = []
+    state = {'entries': 0, 'cut': None}
+
+    def start(name, attributes):
+        stack.append(name)
+
+    def end(name):
+        stack.pop()
+        if name.rsplit(':', 1)[-1] not in _ENTRY_TAGS:
+            return
+        if not stack or stack[-1].rsplit(':', 1)[-1] not in _ENTRY_PARENTS:
+            return
+        state['entries'] += 1
+        if state['entries'] >= max_entries:
+            # 終了タグの先頭の位置（<item/> の場合は開始タグの先頭）
+            state['cut'] = parser.CurrentByteIndex
+            raise _EnoughEntries
+
+    parser.StartElementHandler = start
+    parser.EndElementHandler = end
+
+    try:
+        for chunk in body.iter_chunks():
+            parser.Parse(chunk, False)
+    except _EnoughEntries:
+        content = body.buffered()
+        # UTF-16 などASCII互換でない文書には終了タグを補えないため全体を使う
+        if content[:2] not in (b'\xff\xfe', b'\xfe\xff'):
+            try:
+                closing = ''.join(f"</{name}>" for name in reversed(stack)).encode('ascii')
+                return content[:content.index(b'>', state['cut']) + 1] + closing
+            except (UnicodeEncodeError, ValueError):
+                pass
+    except expat.ExpatError:
+        pass
+    return body.read()
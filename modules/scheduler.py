@@ -1,107 +1,603 @@
 """
 スケジューリングモジュール
-月曜夜の自動実行を管理
+cron形式・一定間隔の実行予定をヒープで管理し、次の実行時刻まで待機してジョブを実行
 """
 
-import schedule
-import time
+import os
+import json
+import heapq
 import logging
-from datetime import datetime, timedelta
 import threading
-from typing import Callable, Optional
+from datetime import datetime, date, timedelta
+from typing import Callable, Optional, Dict, Any, List, Set
+
+from config.scheduler import SCHEDULER_CONFIG, CONTINUOUS_CONFIG
+from modules.job_queue import fetch_job_key
+from modules.source_yield import base_poll_interval
 
 logger = logging.getLogger(__name__)
 
+_CRON_ALIASES = {
+    '@hourly': '0 * * * *',
+    '@daily': '0 0 * * *',
+    '@midnight': '0 0 * * *',
+    '@weekly': '0 0 * * 0',
+    '@monthly': '0 0 1 * *',
+    '@yearly': '0 0 1 1 *',
+    '@annually': '0 0 1 1 *',
+}
+_MONTH_NAMES = ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
+_DAY_NAMES = ['sun', 'mon', 'tue', 'wed', 'thu', 'fri', 'sat']
+
+
+class CronExpression:
+    def __init__(self, expression: str):
+        """
+        cron形式（分 時 日 月 曜日）の実行予定
+
+        各フィールドは *, 数値, 範囲（1-5）, リスト（1,3）, 間隔（*/15, 0-30/10）と
+        月・曜日の英語略称（jan, mon）に対応。日と曜日の両方を指定した場合はどちらかに一致すれば実行する。
+        """
+        self.expression = expression
+        fields = _CRON_ALIASES.get(expression.strip().lower(), expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"cron形式は5つのフィールドが必要です: {expression}")
+
+        self.minutes = self._parse_field(fields[0], 0, 59)
+        self.hours = self._parse_field(fields[1], 0, 23)
+        self.days = self._parse_field(fields[2], 1, 31)
+        self.months = self._parse_field(fields[3], 1, 12, _MONTH_NAMES, offset=1)
+        # 曜日は 0 と 7 を日曜として扱い、datetime.weekday()（月曜=0）に合わせて保持
+        weekdays = self._parse_field(fields[4], 0, 7, _DAY_NAMES)
+        self.weekdays = {(day - 1) % 7 for day in weekdays}
+        self._any_day = fields[2] == '*'
+        self._any_weekday = fields[4] == '*'
+
+    def next_after(self, after: datetime) -> datetime:
+        """after より後で最初に一致する時刻（分単位）"""
+        current = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = current + timedelta(days=366 * 5)
+
+        while current < limit:
+            if current.month not in self.months:
+                year, month = (current.year + 1, 1) if current.month == 12 else (current.year, current.month + 1)
+                current = current.replace(year=year, month=month, day=1, hour=0, minute=0)
+                continue
+            if not self._day_matches(current):
+                current = current.replace(hour=0, minute=0) + timedelta(days=1)
+                continue
+            if current.hour not in self.hours:
+                current = current.replace(minute=0) + timedelta(hours=1)
+                continue
+            if current.minute not in self.minutes:
+                current += timedelta(minutes=1)
+                continue
+            return current
+
+        raise ValueError(f"一致する時刻がありません: {self.expression}")
+
+    def _day_matches(self, value: datetime) -> bool:
+        day_ok = value.day in self.days
+        weekday_ok = value.weekday() in self.weekdays
+        if self._any_day or self._any_weekday:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+
+    def _parse_field(self, field: str, minimum: int, maximum: int,
+                     names: Optional[List[str]] = None, offset: int = 0) -> Set[int]:
+        values = set()
+        for part in field.lower().split(','):
+            step = 1
+            if '/' in part:
+                part, step_text = part.split('/', 1)
+                step = int(step_text)
+                if step <= 0:
+                    raise ValueError(f"間隔は1以上が必要です: {field}")
+
+            if part == '*':
+                start, end = minimum, maximum
+            elif '-' in part:
+                start_text, end_text = part.split('-', 1)
+                start = self._parse_value(start_text, names, offset)
+                end = self._parse_value(end_text, names, offset)
+            else:
+                start = self._parse_value(part, names, offset)
+                end = maximum if step > 1 else start
+
+            if not (minimum <= start <= maximum and minimum <= end <= maximum and start <= end):
+                raise ValueError(f"範囲外の値です: {field}")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _parse_value(self, text: str, names: Optional[List[str]], offset: int) -> int:
+        if names and text[:3] in names:
+            return names.index(text[:3]) + offset
+        return int(text)
+
+
+class IntervalSchedule:
+    def __init__(self, seconds: float):
+        """一定間隔の実行予定"""
+        if seconds <= 0:
+            raise ValueError(f"間隔は0より大きい値が必要です: {seconds}")
+        self.interval = timedelta(seconds=seconds)
+        self.expression = f"every {seconds:g}s"
+
+    def next_after(self, after: datetime) -> datetime:
+        return after + self.interval
+
+
+class ScheduledJob:
+    def __init__(self, name: str, function: Callable, cron: Optional[str] = None,
+                 interval: Optional[float] = None, policy: str = 'skip', catch_up: bool = False,
+                 first_run: Optional[datetime] = None):
+        """
+        スケジューラーに登録するジョブ
+
+        Args:
+            name: ジョブ名（状態ファイルのキー）
+            function: 実行する関数
+            cron: cron形式の実行予定
+            interval: 実行間隔（秒）。cron の代わりに指定
+            policy: 実行中に次の時刻が来た場合の動作（skip / queue）
+            catch_up: 停止中に過ぎた実行予定を再起動時に1回だけ実行する
+            first_run: 初回の実行時刻（省略時は実行予定の次の時刻）
+        """
+        if policy not in ('skip', 'queue'):
+            raise ValueError(f"不明なポリシー: {policy}")
+        if (cron is None) == (interval is None):
+            raise ValueError(f"cron と interval のどちらか一方を指定してください: {name}")
+        self.name = name
+        self.function = function
+        self.schedule = CronExpression(cron) if cron is not None else IntervalSchedule(interval)
+        self.policy = policy
+        self.catch_up = catch_up
+        self.first_run = first_run
+        self.next_run: Optional[datetime] = None
+        self.running = False
+        self.queued = False
+
+
+class TimerScheduler:
+    def __init__(self, state_path: Optional[str] = None):
+        """
+        ヒープで次の実行時刻を管理するスケジューラー
+
+        1つのスレッドが次の実行時刻まで待機し、時刻が来たジョブを別スレッドで実行する。
+        同じジョブは同時に1つしか実行しない。
+
+        Args:
+            state_path: ジョブごとの最終実行を記録するファイル
+        """
+        self.state_path = state_path or SCHEDULER_CONFIG['state_path']
+        self.jobs: Dict[str, ScheduledJob] = {}
+        self._heap = []
+        self._seq = 0
+        self._condition = threading.Condition()
+        self._state_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._workers: Set[threading.Thread] = set()
+        self.is_running = False
+
+    def add_job(self, name: str, function: Callable, cron: Optional[str] = None,
+                interval: Optional[float] = None, policy: str = 'skip', catch_up: bool = False,
+                first_run: Optional[datetime] = None) -> ScheduledJob:
+        """ジョブを登録（開始後に登録した場合も次の実行時刻から実行）"""
+        job = ScheduledJob(name, function, cron, interval, policy, catch_up, first_run)
+        with self._condition:
+            self.jobs[name] = job
+            if self.is_running:
+                self._push(job, job.first_run or job.schedule.next_after(datetime.now()))
+                self._condition.notify()
+        return job
+
+    def start(self):
+        """停止中に過ぎた実行予定を確認してからスケジューラーを開始"""
+        now = datetime.now()
+        state = self._load_state()
+
+        with self._condition:
+            for job in self.jobs.values():
+                last_scheduled = state.get(job.name, {}).get('last_scheduled')
+                if job.catch_up and last_scheduled:
+                    scheduled = job.schedule.next_after(datetime.fromisoformat(last_scheduled))
+                    if scheduled <= now:
+                        logger.info(f"停止中に過ぎた実行予定を実行します: {job.name}（{scheduled.isoformat()}）")
+                        self._push(job, job.first_run or now)
+                    else:
+                        self._push(job, scheduled)
+                    continue
+                self._push(job, job.first_run or job.schedule.next_after(now))
+
+            self.is_running = True
+            self._stopped.clear()
+
+        self._thread = threading.Thread(target=self._run_loop, name='scheduler', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5):
+        """スケジューラーを停止（実行中のジョブは timeout 秒まで終了を待つ）"""
+        with self._condition:
+            self.is_running = False
+            self._heap.clear()
+            self._condition.notify_all()
+        self._stopped.set()
+
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=timeout)
+        for worker in list(self._workers):
+            worker.join(timeout=timeout)
+
+    def wait(self):
+        """stop() が呼ばれるまで待機（Ctrl+C で中断可能）"""
+        self._stopped.wait()
+
+    def next_run_time(self) -> Optional[datetime]:
+        with self._condition:
+            return self._heap[0][0] if self._heap else None
+
+    def reschedule(self, name: str, interval: float):
+        """
+        一定間隔のジョブの間隔を変更
+
+        次回の実行時刻は、前回の実行予定から新しい間隔を空けた時刻にする（過ぎていれば今すぐ）。
+        """
+        with self._condition:
+            job = self.jobs[name]
+            previous = job.schedule
+            if not isinstance(previous, IntervalSchedule) or previous.interval.total_seconds() == interval:
+                return
+            job.schedule = IntervalSchedule(interval)
+            if self.is_running and job.next_run is not None:
+                # ヒープに残る前回の時刻は取り出した時に読み飛ばす
+                scheduled = job.next_run - previous.interval
+                self._push(job, max(job.schedule.next_after(scheduled), datetime.now()))
+                self._condition.notify()
+
+    def job_status(self) -> Dict[str, Any]:
+        """ジョブごとの次回実行・実行中かどうか・最終実行の結果"""
+        state = self._load_state()
+        with self._condition:
+            return {
+                name: dict(
+                    state.get(name, {}),
+                    next_run=job.next_run.isoformat() if job.next_run else None,
+                    running=job.running,
+                    queued=job.queued,
+                    schedule=job.schedule.expression,
+                    policy=job.policy
+                )
+                for name, job in self.jobs.items()
+            }
+
+    def _push(self, job: ScheduledJob, run_at: datetime):
+        job.next_run = run_at
+        heapq.heappush(self._heap, (run_at, self._seq, job.name))
+        self._seq += 1
+
+    def _run_loop(self):
+        """次の実行時刻まで待機し、時刻が来たジョブを起動"""
+        with self._condition:
+            while self.is_running:
+                if not self._heap:
+                    self._condition.wait()
+                    continue
+
+                run_at, _, name = self._heap[0]
+                delay = (run_at - datetime.now()).total_seconds()
+                if delay > 0:
+                    # ジョブの追加・停止で起こされるまで、または次の実行時刻まで待機
+                    self._condition.wait(timeout=delay)
+                    continue
+
+                heapq.heappop(self._heap)
+                job = self.jobs[name]
+                if run_at != job.next_run:
+                    continue  # reschedule で置き換えた時刻
+                self._push(job, job.schedule.next_after(max(run_at, datetime.now())))
+                self._dispatch(job, run_at)
+
+    def _dispatch(self, job: ScheduledJob, scheduled_at: datetime):
+        """ジョブを別スレッドで実行（実行中ならポリシーに従って見送りまたは待機）"""
+        self._update_state(job.name, last_scheduled=scheduled_at.isoformat(timespec='seconds'))
+
+        if job.running:
+            if job.policy == 'queue':
+                job.queued = True
+                logger.info(f"前回の実行が終わっていないため終了後に実行します: {job.name}")
+            else:
+                logger.warning(f"前回の実行が終わっていないため見送ります: {job.name}")
+                self._update_state(job.name, skipped=self._load_state().get(job.name, {}).get('skipped', 0) + 1)
+            return
+
+        job.running = True
+        worker = threading.Thread(target=self._run_job, args=(job,), name=f"job-{job.name}", daemon=True)
+        self._workers.add(worker)
+        worker.start()
+
+    def _run_job(self, job: ScheduledJob):
+        while True:
+            started = datetime.now()
+            self._update_state(job.name, last_started=started.isoformat(timespec='seconds'))
+            try:
+                logger.info(f"ジョブ開始: {job.name}")
+                job.function()
+                status, error = 'success', None
+            except Exception as e:
+                logger.error(f"ジョブ実行中にエラーが発生しました: {job.name}: {e}")
+                status, error = 'error', str(e)
+
+            finished = datetime.now()
+            self._update_state(
+                job.name,
+                last_finished=finished.isoformat(timespec='seconds'),
+                last_status=status,
+                last_error=error,
+                last_duration_seconds=round((finished - started).total_seconds(), 3)
+            )
+            logger.info(f"ジョブ終了: {job.name}（{status}, {(finished - started).total_seconds():.1f}秒）")
+
+            with self._condition:
+                if job.queued and self.is_running:
+                    job.queued = False
+                    continue
+                job.running = False
+                self._workers.discard(threading.current_thread())
+                return
+
+    def _load_state(self) -> Dict[str, Any]:
+        if not os.path.exists(self.state_path):
+            return {}
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"スケジューラーの状態ファイルを読み込めません: {e}")
+            return {}
+
+    def _update_state(self, name: str, **values):
+        """ジョブの状態を更新して保存（一時ファイル経由で置き換え）"""
+        with self._state_lock:
+            state = self._load_state()
+            state.setdefault(name, {}).update(values)
+
+            os.makedirs(os.path.dirname(self.state_path) or '.', exist_ok=True)
+            tmp_path = f"{self.state_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.state_path)
+
+
 class NewsletterScheduler:
-    def __init__(self, newsletter_function: Callable):
+    def __init__(self, newsletter_function: Callable, maintenance_function: Optional[Callable] = None,
+                 config: Optional[Dict[str, Any]] = None):
         """
         スケジューラーを初期化
-        
+
         Args:
             newsletter_function: ニュースレター生成を実行する関数
+            maintenance_function: 毎日実行するデータのコンパクション関数
+            config: SCHEDULER_CONFIG の上書き
         """
         self.newsletter_function = newsletter_function
-        self.is_running = False
-        self.scheduler_thread = None
-    
+        self.maintenance_function = maintenance_function
+        self.config = dict(SCHEDULER_CONFIG, **(config or {}))
+        self.timer = TimerScheduler(self.config['state_path'])
+
+    @property
+    def is_running(self) -> bool:
+        return self.timer.is_running
+
     def start_scheduler(self):
         """スケジューラーを開始"""
         logger.info("スケジューラー開始")
-        
-        # 月曜夜8時に実行（コメントアウト）
-        # schedule.every().monday.at("20:00").do(self._run_newsletter)
-        
-        # テスト用：1分後に実行（コメントアウト）
-        # schedule.every(1).minutes.do(self._run_newsletter)
-        
-        self.is_running = True
-        
-        # 別スレッドでスケジューラーを実行
-        self.scheduler_thread = threading.Thread(target=self._run_scheduler)
-        self.scheduler_thread.daemon = True
-        self.scheduler_thread.start()
-        
-        logger.info("スケジューラーが開始されました。月曜夜8時にニュースレターが自動生成されます。")
-    
+        jobs = self.config['jobs']
+
+        self.timer.add_job('newsletter', self._run_newsletter, **jobs['newsletter'])
+
+        # 毎日のコンパクション・保持期間の適用
+        if self.maintenance_function:
+            self.timer.add_job('maintenance', self._run_maintenance, **jobs['maintenance'])
+
+        self.timer.start()
+
+        next_run = self.get_next_run_time()
+        logger.info(f"スケジューラーが開始されました。次回実行: {next_run.isoformat() if next_run else 'なし'}")
+
     def stop_scheduler(self):
         """スケジューラーを停止"""
         logger.info("スケジューラー停止")
-        self.is_running = False
-        schedule.clear()
-        
-        if self.scheduler_thread and self.scheduler_thread.is_alive():
-            self.scheduler_thread.join(timeout=5)
-    
-    def _run_scheduler(self):
-        """スケジューラーのメインループ"""
-        while self.is_running:
-            schedule.run_pending()
-            time.sleep(60)  # 1分ごとにチェック
-    
+        self.timer.stop()
+
+    def wait(self):
+        """スケジューラーが停止するまで待機"""
+        self.timer.wait()
+
     def _run_newsletter(self):
         """ニュースレター生成を実行"""
-        try:
-            logger.info("ニュースレター生成を開始します")
-            self.newsletter_function()
-            logger.info("ニュースレター生成が完了しました")
-        except Exception as e:
-            logger.error(f"ニュースレター生成中にエラーが発生しました: {e}")
-    
+        logger.info("ニュースレター生成を開始します")
+        result = self.newsletter_function()
+        if isinstance(result, dict) and 'error' in result:
+            raise RuntimeError(result['error'])
+        logger.info("ニュースレター生成が完了しました")
+
+    def _run_maintenance(self):
+        """データのコンパクションを実行"""
+        logger.info("データのコンパクションを開始します")
+        self.maintenance_function()
+
     def run_manual(self):
         """手動実行"""
         logger.info("手動でニュースレター生成を実行します")
-        self._run_newsletter()
-    
-    def get_next_run_time(self) -> Optional[datetime]:
-        """次回実行時刻を取得"""
         try:
-            # scheduleライブラリから次回実行時刻を取得
-            jobs = schedule.get_jobs()
-            if jobs:
-                # 最初のジョブの次回実行時刻を取得
-                next_run = jobs[0].next_run
-                return next_run
+            self._run_newsletter()
         except Exception as e:
-            logger.error(f"次回実行時刻の取得に失敗: {e}")
-        
-        return None
-    
+            logger.error(f"ニュースレター生成中にエラーが発生しました: {e}")
+
+    def get_next_run_time(self) -> Optional[datetime]:
+        """次回実行時刻を取得"""
+        return self.timer.next_run_time()
+
     def get_status(self) -> dict:
         """スケジューラーの状態を取得"""
         next_run = self.get_next_run_time()
-        
+
+        return {
+            'is_running': self.is_running,
+            'next_run_time': next_run.isoformat() if next_run else None,
+            'current_time': datetime.now().isoformat(),
+            'jobs': self.timer.job_status()
+        }
+
+class ContinuousCollector:
+    def __init__(self, collector, newsletter_function: Callable,
+                 maintenance_function: Optional[Callable] = None, config: Optional[Dict[str, Any]] = None,
+                 queue=None, yield_tracker=None):
+        """
+        ソースごとに優先度に応じた間隔で取得し続ける継続収集
+
+        取得した記事は記事ストア・リポジトリに蓄積し、週次のニュースレター生成は
+        蓄積した記事の分析とレンダリングのみを行う（ネットワークを使わない）。
+
+        Args:
+            collector: NewsCollector
+            newsletter_function: 蓄積した記事からニュースレターを生成する関数
+            maintenance_function: 毎日実行するデータのコンパクション関数
+            config: CONTINUOUS_CONFIG の上書き
+            queue: 指定した場合は自分で取得せず、ソースごとの取得ジョブをキューに登録する
+                   （--mode worker のプロセスが実行）
+            yield_tracker: 指定した場合はソースごとの新着の出方に応じて取得間隔を調整する（SourceYieldTracker）
+        """
+        self.collector = collector
+        self.queue = queue
+        self.yield_tracker = yield_tracker
+        self.newsletter_function = newsletter_function
+        self.maintenance_function = maintenance_function
+        self.config = dict(CONTINUOUS_CONFIG, **(config or {}))
+        self.timer = TimerScheduler(SCHEDULER_CONFIG['state_path'])
+        self.seen_path = self.config['seen_path']
+        self._seen_lock = threading.Lock()
+        self._seen = self._load_seen()
+
+    @property
+    def is_running(self) -> bool:
+        return self.timer.is_running
+
+    def poll_interval(self, kind: str, source: Dict[str, Any]) -> float:
+        """ソースの取得間隔（秒。新着状況を記録している場合は調整後の間隔）"""
+        if self.yield_tracker is not None:
+            return self.yield_tracker.poll_interval(kind, source, self.config)
+        return base_poll_interval(kind, source, self.config)
+
+    def start(self):
+        """ソースごとの取得ジョブと週次のニュースレター生成ジョブを登録して開始"""
+        logger.info("継続収集を開始します")
+        now = datetime.now()
+
+        for index, target in enumerate(self.collector.poll_targets()):
+            kind, source = target['kind'], target['source']
+            self.timer.add_job(
+                f"poll:{kind}:{source['name']}",
+                lambda kind=kind, source=source: self.poll(kind, source),
+                interval=self.poll_interval(kind, source),
+                policy='skip',
+                catch_up=True,
+                # 初回の取得が同時に集中しないようずらす
+                first_run=now + timedelta(seconds=index * self.config['stagger_seconds'])
+            )
+
+        jobs = SCHEDULER_CONFIG['jobs']
+        self.timer.add_job('newsletter', self._run_newsletter, **jobs['newsletter'])
+        if self.maintenance_function:
+            self.timer.add_job('maintenance', self._run_maintenance, **jobs['maintenance'])
+
+        self.timer.start()
+        logger.info(f"継続収集: {len(self.timer.jobs)}ジョブを登録しました")
+
+    def stop(self):
+        logger.info("継続収集を停止します")
+        self.timer.stop()
+
+    def wait(self):
+        """停止するまで待機"""
+        self.timer.wait()
+
+    def poll(self, kind: str, source: Dict[str, Any]) -> int:
+        """1つのソースを取得し、新着の記事IDを記録（取得後に次回までの間隔を調整）"""
+        try:
+            return self._poll(kind, source)
+        finally:
+            if self.yield_tracker is not None:
+                # キューを使う場合はワーカーが前回までに記録した新着状況で調整する
+                self.timer.reschedule(f"poll:{kind}:{source['name']}", self.poll_interval(kind, source))
+
+    def _poll(self, kind: str, source: Dict[str, Any]) -> int:
+        if self.queue is not None:
+            # 前回のジョブが待機中・実行中なら登録しない
+            job_id = self.queue.enqueue('fetch_source', {'kind': kind, 'source': source},
+                                        dedupe_key=fetch_job_key(kind, source))
+            if job_id is None:
+                logger.info(f"取得ジョブが未完了のため登録を見送ります: {kind}:{source['name']}")
+            return 0
+
+        articles = self.collector.poll_source(kind, source, self._seen)
+
+        with self._seen_lock:
+            today = date.today()
+            for article in articles:
+                self._seen[article.id] = today.isoformat()
+            # フィードから記事が消えるまで（蓄積期間の2倍）保持
+            cutoff = (today - timedelta(days=self.config['window_days'] * 2)).isoformat()
+            self._seen = {article_id: seen_on for article_id, seen_on in self._seen.items() if seen_on >= cutoff}
+            self._save_seen()
+
+        return len(articles)
+
+    def _run_newsletter(self):
+        logger.info("蓄積した記事からニュースレターを生成します")
+        result = self.newsletter_function()
+        if isinstance(result, dict) and 'error' in result:
+            raise RuntimeError(result['error'])
+
+    def _run_maintenance(self):
+        logger.info("データのコンパクションを開始します")
+        self.maintenance_function()
+        if self.queue is not None:
+            purged = self.queue.purge()
+            logger.info(f"ジョブキューから完了・失敗したジョブを削除しました: {purged}件")
+
+    def get_status(self) -> dict:
+        next_run = self.timer.next_run_time()
         return {
             'is_running': self.is_running,
             'next_run_time': next_run.isoformat() if next_run else None,
-            'current_time': datetime.now().isoformat()
+            'current_time': datetime.now().isoformat(),
+            'seen_articles': len(self._seen),
+            'queue': self.queue.stats() if self.queue is not None else None,
+            'jobs': self.timer.job_status()
         }
 
+    def _load_seen(self) -> Dict[str, str]:
+        """取得済みの記事IDと最初に取得した日付"""
+        if not os.path.exists(self.seen_path):
+            return {}
+        with open(self.seen_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _save_seen(self):
+        os.makedirs(os.path.dirname(self.seen_path) or '.', exist_ok=True)
+        tmp_path = f"{self.seen_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._seen, f, separators=(',', ':'))
+        os.replace(tmp_path, self.seen_path)
+
 class ManualScheduler:
     """手動実行用のシンプルなスケジューラー"""
-    
+
     def __init__(self, newsletter_function: Callable):
         self.newsletter_function = newsletter_function
-    
+
     def run_now(self):
         """即座に実行"""
         logger.info("手動実行を開始します")
@@ -110,34 +606,29 @@ class ManualScheduler:
             logger.info("手動実行が完了しました")
         except Exception as e:
             logger.error(f"手動実行中にエラーが発生しました: {e}")
-    
+
     def run_with_delay(self, delay_minutes: int = 0):
         """指定時間後に実行"""
-        import threading
-        import time
-        
-        def delayed_run():
-            time.sleep(delay_minutes * 60)
-            self.run_now()
-        
-        thread = threading.Thread(target=delayed_run)
-        thread.daemon = True
-        thread.start()
-        
+        timer = threading.Timer(delay_minutes * 60, self.run_now)
+        timer.daemon = True
+        timer.start()
+
         logger.info(f"{delay_minutes}分後にニュースレター生成を実行します")
 
-def create_scheduler(newsletter_function: Callable, auto_schedule: bool = True):
+def create_scheduler(newsletter_function: Callable, auto_schedule: bool = True,
+                     maintenance_function: Optional[Callable] = None):
     """
     スケジューラーを作成
-    
+
     Args:
         newsletter_function: ニュースレター生成関数
         auto_schedule: 自動スケジューリングを有効にするかどうか
-    
+        maintenance_function: 毎日実行するコンパクション関数
+
     Returns:
         NewsletterScheduler or ManualScheduler
     """
     if auto_schedule:
-        return NewsletterScheduler(newsletter_function)
+        return NewsletterScheduler(newsletter_function, maintenance_function)
     else:
-        return ManualScheduler(newsletter_function) 
\ No newline at end of file
+        return ManualScheduler(newsletter_function)
@@ -0,0 +1,243 @@
+"""
+検索インデックスモジュール
+ニュースレターアーカイブ用のシャード分割転置インデックスを管理
+"""
+
+import os
+import re
+import json
+import unicodedata
+from datetime import datetime
+from typing import List, Dict, Any, Iterable, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 英数字トークンと日本語（ひらがな・カタカナ・漢字）の連続部分
+_LATIN_TOKEN_RE = re.compile(r'[a-z0-9]+')
+_CJK_RUN_RE = re.compile(r'[\u3040-\u30ff\u3400-\u9fff]+')
+
+# インデックスに載せない英語の頻出語
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has',
+    'in', 'is', 'it', 'its', 'of', 'on', 'or', 'that', 'the', 'this', 'to',
+    'was', 'with', 'you', 'your', 'we', 'our', 'how', 'what', 'why'
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """検索用にテキストをトークン化（index.htmlのJSと同じ規則）"""
+    if not text:
+        return []
+
+    normalized = unicodedata.normalize('NFKC', text).lower()
+    tokens = [t for t in _LATIN_TOKEN_RE.findall(normalized)
+              if len(t) > 1 and t not in STOPWORDS]
+
+    # 日本語は文字bigramで分割（1文字の場合はそのまま）
+    for run in _CJK_RUN_RE.findall(normalized):
+        if len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+
+    return tokens
+
+
+def shard_of(token: str, num_shards: int) -> int:
+    """トークンのシャード番号を計算（UTF-8上のFNV-1a 32bit）"""
+    h = 0x811c9dc5
+    for b in token.encode('utf-8'):
+        h ^= b
+        h = (h * 0x01000193) & 0xffffffff
+    return h % num_shards
+
+
+class SearchIndex:
+    def __init__(self, index_dir: str = "reports/search", num_shards: int = 64):
+        """
+        検索インデックスを初期化
+
+        Args:
+            index_dir: インデックスの保存先（GitHub Pagesで配信される）
+            num_shards: シャード数（既存インデックスがある場合はその値を優先）
+        """
+        self.index_dir = index_dir
+        self.shards_dir = os.path.join(index_dir, "shards")
+        self.docs_dir = os.path.join(index_dir, "docs")
+        self.manifest_path = os.path.join(index_dir, "manifest.json")
+        self.manifest = self._load_manifest(num_shards)
+
+    def add_edition(self, edition_id: str, html_file: str, articles: List[Dict[str, Any]]) -> int:
+        """
+        ニュースレター1号分をインデックスに追加（追加分のポスティングのみ書き込む）
+
+        Args:
+            edition_id: 号のID（タイムスタンプ）
+            html_file: reports/newsletters内のHTMLファイル名
+            articles: 号に掲載された記事
+
+        Returns:
+            追加したポスティング数
+        """
+        if edition_id in self.manifest['editions']:
+            logger.info(f"検索インデックス登録済みのためスキップ: {edition_id}")
+            return 0
+
+        docs = self._unique_docs(articles)
+        edition_no = len(self.manifest['editions'])
+
+        # シャードごとに新規ポスティングをまとめる
+        new_postings: Dict[int, Dict[str, List[int]]] = {}
+        for article_no, (title, link, source) in enumerate(docs):
+            for token in set(tokenize(f"{title} {source}")):
+                shard = shard_of(token, self.manifest['shards'])
+                postings = new_postings.setdefault(shard, {}).setdefault(token, [])
+                postings.extend([edition_no, article_no])
+
+        # 号の記事一覧（検索結果表示用）
+        os.makedirs(self.docs_dir, exist_ok=True)
+        self._write_json(os.path.join(self.docs_dir, f"{edition_id}.json"), {
+            'id': edition_id,
+            'file': html_file,
+            'date': self._format_date(edition_id),
+            'articles': [list(doc) for doc in docs]
+        })
+
+        # 変更があったシャードのみ読み込んで追記
+        os.makedirs(self.shards_dir, exist_ok=True)
+        posting_count = 0
+        for shard, token_postings in new_postings.items():
+            shard_path = self._shard_path(shard)
+            shard_data = self._read_json(shard_path, {})
+            for token, postings in token_postings.items():
+                shard_data.setdefault(token, []).extend(postings)
+                posting_count += len(postings) // 2
+            self._write_json(shard_path, shard_data)
+
+        self.manifest['editions'].append(edition_id)
+        self.manifest['updated_at'] = datetime.now().isoformat(timespec='seconds')
+        self._write_json(self.manifest_path, self.manifest)
+
+        logger.info(f"検索インデックス更新: {edition_id} ({len(docs)}記事, {posting_count}ポスティング, {len(new_postings)}シャード)")
+        return posting_count
+
+    def remove_editions(self, edition_ids: Iterable[str]) -> int:
+        """
+        削除したニュースレターをインデックスから外す
+
+        号番号がずれないようマニフェストの該当箇所は null にし、シャードからポスティングを除く。
+        """
+        removed = set(edition_ids)
+        edition_nos = {
+            no for no, edition_id in enumerate(self.manifest['editions'])
+            if edition_id is not None and edition_id in removed
+        }
+        if not edition_nos:
+            return 0
+
+        for no in edition_nos:
+            doc_path = os.path.join(self.docs_dir, f"{self.manifest['editions'][no]}.json")
+            if os.path.exists(doc_path):
+                os.remove(doc_path)
+            self.manifest['editions'][no] = None
+
+        for shard in range(self.manifest['shards']):
+            shard_path = self._shard_path(shard)
+            shard_data = self._read_json(shard_path, None)
+            if not shard_data:
+                continue
+            pruned = {}
+            for token, postings in shard_data.items():
+                kept = []
+                for i in range(0, len(postings), 2):
+                    if postings[i] not in edition_nos:
+                        kept.extend(postings[i:i + 2])
+                if kept:
+                    pruned[token] = kept
+            if pruned != shard_data:
+                self._write_json(shard_path, pruned)
+
+        self.manifest['updated_at'] = datetime.now().isoformat(timespec='seconds')
+        self._write_json(self.manifest_path, self.manifest)
+
+        logger.info(f"検索インデックスから削除: {len(edition_nos)}号")
+        return len(edition_nos)
+
+    def index_archive(self, reports_dir: str = "reports/newsletters") -> int:
+        """未登録の既存ニュースレターHTMLをインデックスに追加"""
+        from bs4 import BeautifulSoup
+
+        added = 0
+        filenames = sorted(
+            f for f in os.listdir(reports_dir)
+            if f.startswith('newsletter_') and f.endswith('.html')
+        )
+
+        for filename in filenames:
+            edition_id = filename.replace('newsletter_', '').replace('.html', '')
+            if edition_id in self.manifest['editions']:
+                continue
+
+            with open(os.path.join(reports_dir, filename), 'r', encoding='utf-8') as f:
+                soup = BeautifulSoup(f.read(), 'html.parser')
+
+            articles = []
+            for anchor in soup.select('a[target="_blank"]'):
+                link = anchor.get('href', '')
+                if not link.startswith('http'):
+                    continue
+                source_elem = anchor.find_next_sibling('span', class_='source')
+                source = source_elem.get_text(strip=True).strip('[]') if source_elem else ''
+                articles.append({'title': anchor.get_text(strip=True), 'link': link, 'source': source})
+
+            self.add_edition(edition_id, filename, articles)
+            added += 1
+
+        return added
+
+    def _unique_docs(self, articles: Iterable[Dict[str, Any]]) -> List[Tuple[str, str, str]]:
+        """リンク単位で重複を除いた (タイトル, リンク, ソース) のリスト"""
+        seen_links = set()
+        docs = []
+
+        for article in articles:
+            title = article.get('title', '') or ''
+            link = article.get('link', '') or ''
+            if not title or link in seen_links:
+                continue
+            seen_links.add(link)
+            docs.append((title, link, article.get('source', '') or ''))
+
+        return docs
+
+    def _load_manifest(self, num_shards: int) -> Dict[str, Any]:
+        """マニフェストを読み込み（なければ新規作成）"""
+        return self._read_json(self.manifest_path, {
+            'version': 1,
+            'shards': num_shards,
+            'editions': [],
+            'updated_at': None
+        })
+
+    def _shard_path(self, shard: int) -> str:
+        return os.path.join(self.shards_dir, f"{shard:03d}.json")
+
+    def _format_date(self, edition_id: str) -> str:
+        try:
+            return f"{edition_id[:4]}年{edition_id[4:6]}月{edition_id[6:8]}日"
+        except Exception:
+            return edition_id
+
+    def _read_json(self, path: str, default: Any) -> Any:
+        if not os.path.exists(path):
+            return default
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _write_json(self, path: str, data: Any):
+        """コンパクトなJSONを一時ファイル経由で書き込み"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, path)
@@ -0,0 +1,215 @@
+"""
+ソース別の新着状況モジュール
+ソースごとに取得1回あたりの新着記事数・最後に新着があった時刻・連続失敗回数を記録し、
+継続収集の取得間隔を新着の出方に合わせて調整する
+"""
+
+import os
+import json
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+import logging
+
+try:
+    import fcntl
+except ImportError:  # Windows（プロセス間のロックなし）
+    fcntl = None
+
+from config.scheduler import CONTINUOUS_CONFIG, ADAPTIVE_POLL_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+def source_key(kind: str, source: Dict[str, Any]) -> str:
+    return f"{kind}:{source['name']}"
+
+
+def base_poll_interval(kind: str, source: Dict[str, Any], config: Optional[Dict[str, Any]] = None) -> float:
+    """ソースの priority（ソース設定の poll_interval_minutes）による基準の取得間隔（秒）"""
+    config = config or CONTINUOUS_CONFIG
+    minutes = source.get('poll_interval_minutes')
+    if minutes is None:
+        intervals = config['poll_interval_minutes']
+        minutes = intervals.get(source.get('priority', 'medium'), intervals['medium'])
+    return max(minutes, config['min_interval_minutes'].get(kind, 0)) * 60
+
+
+class SourceYieldTracker:
+    def __init__(self, path: Optional[str] = None, config: Optional[Dict[str, Any]] = None):
+        """
+        ソースごとの新着状況と取得間隔の倍率
+
+        状態はファイルにのみ保持し、更新のたびに読み込み直して該当ソースだけを書き換える
+        （--mode worker の複数プロセスと継続収集のプロセスで共有するため）。
+        読み込みから書き込みまでは隣のロックファイル（<path>.lock）の排他ロックの下で行う。
+
+        Args:
+            path: 状態ファイル
+            config: ADAPTIVE_POLL_CONFIG の上書き
+        """
+        self.config = dict(ADAPTIVE_POLL_CONFIG, **(config or {}))
+        self.path = path or self.config['state_path']
+        self._lock = threading.Lock()
+
+    def factor(self, kind: str, source: Dict[str, Any]) -> float:
+        """基準の取得間隔に掛ける倍率（記録がなければ1）"""
+        return self._load().get(source_key(kind, source), {}).get('factor', 1.0)
+
+    def poll_interval(self, kind: str, source: Dict[str, Any], continuous_config: Optional[Dict[str, Any]] = None) -> float:
+        """
+        調整後の取得間隔（秒）
+
+        縮める場合も種別ごとの最短間隔（APIの呼び出し回数の上限など）より短くはしない。
+        """
+        continuous_config = continuous_config or CONTINUOUS_CONFIG
+        interval = base_poll_interval(kind, source, continuous_config) * self.factor(kind, source)
+        return max(interval, continuous_config['min_interval_minutes'].get(kind, 0) * 60)
+
+    def record_fetch(self, kind: str, source: Dict[str, Any], fetched: int, new: int,
+                     delays: Optional[List[float]] = None) -> Dict[str, Any]:
+        """
+        取得の結果を記録し、倍率を調整
+
+        取得した記事が全て新着なら、前回の取得との間に取りこぼした記事がある可能性があるため間隔を縮める。
+        新着なしが empty_fetches_before_backoff 回続いたら間隔を延ばす。
+
+        Args:
+            fetched: 取得した記事数（日付・除外キーワードで除いた後）
+            new: そのうち新着の記事数
+            delays: 新着の記事の公開から取得までの秒数
+        """
+        config = self.config
+
+        def update(entry: Dict[str, Any], now: str):
+            factor = entry['factor']
+            if new > 0:
+                if fetched and new == fetched and entry['fetches']:
+                    entry['no_overlap_fetches'] += 1
+                    factor = max(config['min_factor'], factor / config['burst_factor'])
+                elif factor > 1:
+                    factor = 1.0
+                else:
+                    factor = min(1.0, factor * config['burst_factor'])
+                entry['empty_streak'] = 0
+                entry['last_change_at'] = now
+            else:
+                entry['empty_streak'] += 1
+                if entry['empty_streak'] >= config['empty_fetches_before_backoff']:
+                    factor = min(config['max_backoff_factor'], max(factor, 1.0) * config['backoff_factor'])
+                elif factor < 1:
+                    factor = min(1.0, factor * config['burst_factor'])
+
+            entry['factor'] = factor
+            entry['fetches'] += 1
+            entry['new_articles'] += new
+            entry['last_new'] = new
+            entry['failure_streak'] = 0
+            entry['last_error'] = None
+            for delay in delays or []:
+                entry['delay_seconds_total'] += delay
+                entry['delay_count'] += 1
+
+        return self._update(kind, source, update)
+
+    def record_failure(self, kind: str, source: Dict[str, Any], error: str) -> Dict[str, Any]:
+        """
+        取得の失敗を記録
+
+        1回だけの失敗では間隔を変えず、2回目から失敗ごとに延ばす（停止したフィードは max_failure_factor で止まる）。
+        """
+        config = self.config
+
+        def update(entry: Dict[str, Any], now: str):
+            entry['fetches'] += 1
+            entry['failures'] += 1
+            entry['failure_streak'] += 1
+            entry['last_error'] = error
+            backoff = config['failure_backoff_factor'] ** (entry['failure_streak'] - 1)
+            entry['factor'] = max(entry['factor'], min(config['max_failure_factor'], backoff))
+
+        return self._update(kind, source, update)
+
+    def report(self) -> List[Dict[str, Any]]:
+        """
+        ソースごとの新着状況と、基準の間隔で取得した場合と比べて減らせた取得回数
+
+        記録を始めてから最後の取得までの時間を基準の間隔で割った回数を、一定間隔の場合の取得回数とする。
+        no_overlap_fetches は取得した記事が全て新着だった回数で、取りこぼした記事があった可能性を示す。
+        """
+        rows = []
+        for key, entry in sorted(self._load().items()):
+            tracked = (datetime.fromisoformat(entry['last_fetch_at'])
+                       - datetime.fromisoformat(entry['first_fetch_at'])).total_seconds()
+            baseline = tracked / entry['base_interval'] + 1
+            rows.append(dict(
+                entry,
+                key=key,
+                interval=max(entry['base_interval'] * entry['factor'],
+                             CONTINUOUS_CONFIG['min_interval_minutes'].get(entry['kind'], 0) * 60),
+                yield_per_fetch=entry['new_articles'] / entry['fetches'] if entry['fetches'] else 0.0,
+                baseline_fetches=baseline,
+                fetches_saved=baseline - entry['fetches'],
+                mean_delay_seconds=entry['delay_seconds_total'] / entry['delay_count'] if entry['delay_count'] else None
+            ))
+        return rows
+
+    def _update(self, kind: str, source: Dict[str, Any], update) -> Dict[str, Any]:
+        now = datetime.now().isoformat(timespec='seconds')
+        with self._lock, self._file_lock():
+            state = self._load()
+            entry = state.setdefault(source_key(kind, source), {
+                'kind': kind,
+                'name': source['name'],
+                'factor': 1.0,
+                'fetches': 0,
+                'failures': 0,
+                'new_articles': 0,
+                'last_new': 0,
+                'empty_streak': 0,
+                'failure_streak': 0,
+                'no_overlap_fetches': 0,
+                'delay_seconds_total': 0.0,
+                'delay_count': 0,
+                'first_fetch_at': now,
+                'last_change_at': None,
+                'last_error': None
+            })
+            entry['base_interval'] = base_poll_interval(kind, source)
+            update(entry, now)
+            entry['last_fetch_at'] = now
+            self._save(state)
+        return entry
+
+    @contextmanager
+    def _file_lock(self):
+        """他のプロセスの読み込み〜書き込みと重ならないよう、ロックファイルを排他ロック"""
+        if fcntl is None:
+            yield
+            return
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(f"{self.path}.lock", 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"新着状況のファイルを読み込めません: {e}")
+            return {}
+
+    def _save(self, state: Dict[str, Dict[str, Any]]):
+        """一時ファイル経由で置き換え"""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,198 @@
+"""
+状態公開モジュール
+実行中のスケジューラー・継続収集のプロセスが、現在の段階・進捗・最終実行・次回実行を状態ファイルに
+アトミックに書き出す。--mode status はパイプラインを読み込まずにそのファイルを読む
+"""
+
+import os
+import json
+import time
+import socket
+import logging
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Any, Optional
+
+from config.scheduler import STATUS_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+class StatusPublisher:
+    def __init__(self, mode: str, scheduler_status: Callable[[], Dict[str, Any]],
+                 path: Optional[str] = None, config: Optional[Dict[str, Any]] = None):
+        """
+        状態ファイルの書き出しを初期化
+
+        段階の開始・実行の終了で書き出し、それ以外は heartbeat_seconds ごとに書き直す
+        （更新時刻で、プロセスが動いているかを判定できるようにする）。
+
+        Args:
+            mode: 実行モード（scheduler / continuous）
+            scheduler_status: スケジューラーの get_status（次回実行・ジョブごとの状態）
+            path: 状態ファイル
+            config: STATUS_CONFIG の上書き
+        """
+        self.config = dict(STATUS_CONFIG, **(config or {}))
+        self.path = path or self.config['status_path']
+        self.scheduler_status = scheduler_status
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_progress_write = 0.0
+        self._state: Dict[str, Any] = {
+            'mode': mode,
+            'pid': os.getpid(),
+            'hostname': socket.gethostname(),
+            'started_at': datetime.now().isoformat(),
+            'state': 'idle',
+            'current_run': None,
+            'last_run': None
+        }
+
+    def start(self):
+        """状態ファイルを書き出し、定期的な書き直しを開始"""
+        self._stopped.clear()
+        self._write()
+        self._thread = threading.Thread(target=self._heartbeat, name='status', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """停止したことを書き出す"""
+        self._stopped.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        with self._lock:
+            self._state['state'] = 'stopped'
+        self._write()
+
+    def run_started(self):
+        with self._lock:
+            self._state['state'] = 'running'
+            self._state['current_run'] = {
+                'started_at': datetime.now().isoformat(),
+                'stage': None,
+                'stage_started_at': None,
+                'progress': None
+            }
+        self._write()
+
+    def stage(self, name: str):
+        """実行中の段階を更新"""
+        with self._lock:
+            run = self._state['current_run']
+            if run is None:
+                return
+            run.update(stage=name, stage_started_at=datetime.now().isoformat(), progress=None)
+        self._write()
+
+    def progress(self, done: int, total: int, unit: str = 'sources'):
+        """
+        段階内の進捗を更新
+
+        ソースごとに呼ばれるため、書き出しは progress_interval_seconds に1回に抑える（最後の1件は必ず書く）。
+        """
+        with self._lock:
+            run = self._state['current_run']
+            if run is None:
+                return
+            run['progress'] = {'done': done, 'total': total, 'unit': unit}
+            now = time.monotonic()
+            if done < total and now - self._last_progress_write < self.config['progress_interval_seconds']:
+                return
+            self._last_progress_write = now
+        self._write()
+
+    def run_finished(self, result: Dict[str, Any], duration: float, metrics: Dict[str, Any]):
+        """
+        実行の終了を記録
+
+        Args:
+            result: run_full_pipeline の結果
+            duration: 所要時間（秒）
+            metrics: 最終実行のメトリクス（段階ごとの所要時間など）
+        """
+        with self._lock:
+            run = self._state['current_run'] or {}
+            self._state['state'] = 'idle'
+            self._state['current_run'] = None
+            self._state['last_run'] = {
+                'run_id': result.get('run_id'),
+                'started_at': run.get('started_at'),
+                'finished_at': datetime.now().isoformat(),
+                'duration_seconds': round(duration, 3),
+                'status': 'error' if 'error' in result else 'success',
+                'error': result.get('error'),
+                'failed_stage': result.get('failed_stage'),
+                'metrics': metrics
+            }
+        self._write()
+
+    def _heartbeat(self):
+        while not self._stopped.wait(self.config['heartbeat_seconds']):
+            self._write()
+
+    def _write(self):
+        """スケジューラーの状態と合わせて一時ファイル経由で置き換え"""
+        try:
+            scheduler = self.scheduler_status()
+        except Exception as e:
+            logger.warning(f"スケジューラーの状態を取得できません: {e}")
+            scheduler = {}
+
+        with self._lock:
+            status = dict(
+                self._state,
+                updated_at=datetime.now().isoformat(),
+                heartbeat_seconds=self.config['heartbeat_seconds'],
+                next_run_time=scheduler.get('next_run_time'),
+                scheduler=scheduler
+            )
+            try:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                tmp_path = f"{self.path}.{os.getpid()}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(status, f, ensure_ascii=False, indent=2, default=str)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.error(f"状態ファイルの書き出しエラー: {e}")
+
+
+def read_status(path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    状態ファイルを読み込み、書き出したプロセスが動いているかを running に設定
+
+    Returns:
+        状態（状態ファイルがなければ None）
+    """
+    path = path or STATUS_CONFIG['status_path']
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            status = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"状態ファイルを読み込めません: {e}")
+        return None
+
+    age = (datetime.now() - datetime.fromisoformat(status['updated_at'])).total_seconds()
+    status['age_seconds'] = age
+    status['running'] = (
+        status.get('state') != 'stopped'
+        and age <= max(STATUS_CONFIG['stale_seconds'], status.get('heartbeat_seconds', 0) * 2)
+        and _process_alive(status)
+    )
+    return status
+
+
+def _process_alive(status: Dict[str, Any]) -> bool:
+    """同じホストのプロセスであれば PID で確認（他のホストは更新時刻だけで判定）"""
+    if status.get('hostname') != socket.gethostname():
+        return True
+    try:
+        os.kill(status['pid'], 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
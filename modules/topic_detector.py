@@ -0,0 +1,229 @@
+"""
+新興トピック検出モジュール
+記事のunigram・bigramをストリーミングで数え、過去週のベースラインとの比較でバースト度を評価
+"""
+
+import os
+import re
+import json
+import heapq
+import math
+import unicodedata
+from datetime import datetime
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+import logging
+
+from modules.article import Article
+from modules.trend_store import week_key
+
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r'[a-z0-9][a-z0-9\-\+\.]*[a-z0-9\+]|[a-z]')
+_KATAKANA_RE = re.compile(r'[\u30a0-\u30ff]{3,}')
+
+# トピックとして意味を持たない語
+STOPWORDS = {
+    'a', 'about', 'after', 'all', 'also', 'an', 'and', 'any', 'are', 'as', 'at',
+    'be', 'been', 'but', 'by', 'can', 'could', 'did', 'do', 'does', 'for', 'from',
+    'get', 'gets', 'had', 'has', 'have', 'how', 'if', 'in', 'into', 'is', 'it',
+    'its', 'just', 'more', 'most', 'new', 'not', 'now', 'of', 'on', 'one', 'or',
+    'our', 'out', 'over', 'says', 'so', 'than', 'that', 'the', 'their', 'them',
+    'there', 'these', 'they', 'this', 'to', 'up', 'us', 'was', 'we', 'were',
+    'what', 'when', 'which', 'who', 'why', 'will', 'with', 'would', 'you', 'your',
+    'ai', 'via', 'use', 'using', 'here', 'heres', 'first', 'read', 'week'
+}
+
+
+class SpaceSavingCounter:
+    """Space-Saving法による上位頻出語の近似カウンタ（保持語数は capacity 以下）"""
+
+    def __init__(self, capacity: int = 5000):
+        self.capacity = capacity
+        self.counts: Dict[str, int] = {}
+        self._heap: List[Tuple[int, str]] = []
+
+    def add(self, term: str):
+        """語を1回カウント"""
+        if term in self.counts:
+            self.counts[term] += 1
+            heapq.heappush(self._heap, (self.counts[term], term))
+        elif len(self.counts) < self.capacity:
+            self.counts[term] = 1
+            heapq.heappush(self._heap, (1, term))
+        else:
+            # 最小カウントの語を置き換え、そのカウント+1を引き継ぐ
+            min_count, min_term = self._pop_min()
+            self.counts[term] = min_count + 1
+            heapq.heappush(self._heap, (min_count + 1, term))
+
+        # ヒープ内の古いエントリが増えすぎたら作り直す
+        if len(self._heap) > self.capacity * 4:
+            self._heap = [(count, t) for t, count in self.counts.items()]
+            heapq.heapify(self._heap)
+
+    def most_common(self, n: Optional[int] = None) -> List[Tuple[str, int]]:
+        items = sorted(self.counts.items(), key=lambda x: x[1], reverse=True)
+        return items if n is None else items[:n]
+
+    def _pop_min(self) -> Tuple[int, str]:
+        while True:
+            count, term = heapq.heappop(self._heap)
+            if self.counts.get(term) == count:
+                del self.counts[term]
+                return count, term
+
+
+def extract_terms(text: str) -> List[str]:
+    """テキストからunigram・bigram・カタカナ語を抽出"""
+    normalized = unicodedata.normalize('NFKC', text or '').lower()
+
+    words = [w for w in _WORD_RE.findall(normalized) if w not in STOPWORDS and len(w) > 1]
+    terms = list(words)
+    terms.extend(f"{words[i]} {words[i + 1]}" for i in range(len(words) - 1))
+    terms.extend(_KATAKANA_RE.findall(normalized))
+
+    return terms
+
+
+class TopicDetector:
+    def __init__(self, baseline_path: str = "data/trends/topic_baseline.json",
+                 capacity: int = 5000, baseline_size: int = 5000,
+                 decay: float = 0.3, min_count: int = 2):
+        """
+        新興トピック検出器を初期化
+
+        Args:
+            baseline_path: ベースラインの保存先
+            capacity: 今週分カウンタの最大保持語数
+            baseline_size: ベースラインの最大保持語数
+            decay: 週ごとの指数移動平均の重み（新しい週の比重）
+            min_count: トピック候補とする最小出現記事数
+        """
+        self.baseline_path = baseline_path
+        self.capacity = capacity
+        self.baseline_size = baseline_size
+        self.decay = decay
+        self.min_count = min_count
+
+    def detect(self, articles: Iterable[Article], top_n: int = 5,
+               date: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        今回の記事から新興トピックを検出し、ベースラインを更新
+
+        Args:
+            articles: 今回の記事（タイトル・説明文を使用）
+            top_n: 返すトピック数
+            date: 集計対象の日時（省略時は現在時刻）
+
+        Returns:
+            バースト度の高い順のトピック
+        """
+        counter = self.new_counter()
+        doc_count = 0
+        for article in articles:
+            doc_count += 1
+            self.add_terms(counter, article)
+
+        return self.detect_counts(counter, doc_count, top_n, date)
+
+    def new_counter(self) -> SpaceSavingCounter:
+        """今回の記事の語を数えるカウンタ"""
+        return SpaceSavingCounter(self.capacity)
+
+    def add_terms(self, counter: SpaceSavingCounter, article: Article):
+        """記事1件の語をカウンタに加算（1記事内の重複は1回として数える）"""
+        for term in set(extract_terms(f"{article.title} {article.description}")):
+            counter.add(term)
+
+    def detect_counts(self, counter: SpaceSavingCounter, doc_count: int, top_n: int = 5,
+                      date: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """集計済みのカウンタから新興トピックを検出し、ベースラインを更新"""
+        state = self._load_state()
+        state = self._roll_week(state, week_key(date or datetime.now()))
+
+        topics = self._rank(counter, doc_count, state, top_n)
+
+        # 同じ週の再実行でも二重計上しないよう、今週分は置き換えで保持
+        state['current'] = dict(counter.most_common(self.baseline_size))
+        state['current_docs'] = doc_count
+        self._save_state(state)
+
+        return topics
+
+    def _rank(self, counter: SpaceSavingCounter, doc_count: int,
+              state: Dict[str, Any], top_n: int) -> List[Dict[str, Any]]:
+        """ベースラインの出現率からの超過をバースト度として順位付け"""
+        baseline = state['baseline']
+        candidates = []
+
+        for term, count in counter.counts.items():
+            if count < self.min_count:
+                continue
+            expected = doc_count * baseline.get(term, 0.0)
+            score = (count - expected) / math.sqrt(expected + 1.0)
+            if score > 0:
+                # 同点ならbigramを優先
+                candidates.append((score, term.count(' '), count, term))
+
+        candidates.sort(reverse=True)
+
+        # 既に選んだトピックと語を共有するものは重複として除く
+        topics = []
+        selected_words = set()
+        for score, _, count, term in candidates:
+            words = set(term.split(' '))
+            if words & selected_words:
+                continue
+            selected_words |= words
+            topics.append({
+                'term': term,
+                'count': count,
+                'baseline_rate': baseline.get(term, 0.0),
+                'burst_score': round(score, 3)
+            })
+            if len(topics) >= top_n:
+                break
+
+        return topics
+
+    def _roll_week(self, state: Dict[str, Any], week: str) -> Dict[str, Any]:
+        """週が変わっていれば前週分の出現率をベースラインへ取り込む"""
+        if state['week'] == week:
+            return state
+
+        if state['week'] and state['current_docs']:
+            docs = state['current_docs']
+            baseline = state['baseline']
+            current_rates = {term: count / docs for term, count in state['current'].items()}
+
+            # 指数移動平均（初回は今週の値をそのまま採用）
+            alpha = self.decay if state['weeks_observed'] else 1.0
+            for term in set(baseline) | set(current_rates):
+                baseline[term] = (1 - alpha) * baseline.get(term, 0.0) + alpha * current_rates.get(term, 0.0)
+
+            # 保持語数を制限
+            if len(baseline) > self.baseline_size:
+                kept = sorted(baseline.items(), key=lambda x: x[1], reverse=True)[:self.baseline_size]
+                baseline = dict(kept)
+
+            state['baseline'] = baseline
+            state['weeks_observed'] += 1
+
+        state['week'] = week
+        state['current'] = {}
+        state['current_docs'] = 0
+        return state
+
+    def _load_state(self) -> Dict[str, Any]:
+        state = {'week': None, 'weeks_observed': 0, 'baseline': {}, 'current': {}, 'current_docs': 0}
+        if os.path.exists(self.baseline_path):
+            with open(self.baseline_path, 'r', encoding='utf-8') as f:
+                state.update(json.load(f))
+        return state
+
+    def _save_state(self, state: Dict[str, Any]):
+        os.makedirs(os.path.dirname(self.baseline_path), exist_ok=True)
+        tmp_path = f"{self.baseline_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, self.baseline_path)
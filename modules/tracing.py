@@ -0,0 +1,223 @@
+"""
+トレーシングモジュール
+実行・段階・ソース・HTTPリクエスト・パース・レンダリングの入れ子のスパンを記録し、
+JSONL と Chrome トレース形式（chrome://tracing や Perfetto で開く）に書き出す
+"""
+
+import os
+import json
+import time
+import itertools
+import threading
+import contextvars
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Callable
+
+from config.storage import TRACE_CONFIG
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar('current_span', default=None)
+_active_tracer: Optional['Tracer'] = None
+
+
+class Span:
+    __slots__ = ('name', 'kind', 'span_id', 'parent_id', 'start_ns', 'end_ns', 'thread_id', 'thread_name',
+                 'attributes', 'status')
+
+    def __init__(self, name: str, kind: str, span_id: int, parent_id: Optional[int], attributes: Dict[str, Any]):
+        thread = threading.current_thread()
+        self.name = name
+        self.kind = kind
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.thread_id = thread.ident
+        self.thread_name = thread.name
+        self.attributes = attributes
+        self.status = 'ok'
+
+    def set(self, **attributes):
+        """属性を追加（バイト数・ステータス・件数など）"""
+        self.attributes.update(attributes)
+
+    def set_error(self, message: str):
+        """例外を外に出さずに処理した失敗を記録"""
+        self.status = 'error'
+        self.attributes['error'] = message
+
+    def to_dict(self, trace_id: str) -> Dict[str, Any]:
+        return {
+            'trace_id': trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'name': self.name,
+            'kind': self.kind,
+            'start': self.start_ns / 1e9,
+            'duration_ms': (self.end_ns - self.start_ns) / 1e6,
+            'thread': self.thread_name,
+            'status': self.status,
+            'attributes': self.attributes
+        }
+
+
+class _NoopSpan:
+    """トレースしていない時のスパン（何も記録しない）"""
+
+    def set(self, **attributes):
+        pass
+
+    def set_error(self, message: str):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+class _SpanContext:
+    __slots__ = ('tracer', 'span', 'token')
+
+    def __init__(self, tracer: 'Tracer', span: Span):
+        self.tracer = tracer
+        self.span = span
+        self.token = None
+
+    def __enter__(self) -> Span:
+        self.token = _current_span.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        self.span.end_ns = time.time_ns()
+        if exc_type is not None:
+            self.span.status = 'error'
+            self.span.attributes['error'] = f"{exc_type.__name__}: {exc}"
+        _current_span.reset(self.token)
+        self.tracer.spans.append(self.span)
+        return False
+
+
+class Tracer:
+    def __init__(self, trace_dir: str = None):
+        """
+        1回の実行のスパンを集める
+
+        Args:
+            trace_dir: 書き出し先ディレクトリ
+        """
+        self.trace_dir = trace_dir or TRACE_CONFIG['trace_dir']
+        self.trace_id = datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.spans: List[Span] = []
+        self._ids = itertools.count(1)
+
+    def start_span(self, name: str, kind: str, attributes: Dict[str, Any]) -> _SpanContext:
+        parent = _current_span.get()
+        return _SpanContext(self, Span(name, kind, next(self._ids), parent.span_id if parent else None, attributes))
+
+    def export(self, run_id: Optional[str] = None) -> Dict[str, str]:
+        """
+        JSONL（1行1スパン）と Chrome トレース形式に書き出し
+
+        Returns:
+            書き出したファイルのパス（jsonl / chrome）
+        """
+        run_id = run_id or self.trace_id
+        os.makedirs(self.trace_dir, exist_ok=True)
+        spans = sorted(self.spans, key=lambda span: span.start_ns)
+
+        jsonl_path = os.path.join(self.trace_dir, f"{run_id}.jsonl")
+        with open(jsonl_path, 'w', encoding='utf-8') as f:
+            for span in spans:
+                f.write(json.dumps(span.to_dict(run_id), ensure_ascii=False, default=str) + '\n')
+
+        # スレッドごとの行に並べる（tid はスレッドの出現順）
+        thread_ids: Dict[int, int] = {}
+        events = []
+        for span in spans:
+            if span.thread_id not in thread_ids:
+                thread_ids[span.thread_id] = len(thread_ids) + 1
+                events.append({
+                    'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': thread_ids[span.thread_id],
+                    'args': {'name': span.thread_name}
+                })
+            events.append({
+                'name': span.name,
+                'cat': span.kind,
+                'ph': 'X',
+                'ts': span.start_ns / 1000,
+                'dur': (span.end_ns - span.start_ns) / 1000,
+                'pid': 1,
+                'tid': thread_ids[span.thread_id],
+                'args': dict(span.attributes, status=span.status, span_id=span.span_id, parent_id=span.parent_id)
+            })
+
+        chrome_path = os.path.join(self.trace_dir, f"{run_id}.trace.json")
+        with open(chrome_path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f, ensure_ascii=False, default=str)
+
+        self._prune()
+        return {'jsonl': jsonl_path, 'chrome': chrome_path}
+
+    def _prune(self):
+        """保持数を超えた古いトレースを削除"""
+        runs = sorted(name[:-len('.jsonl')] for name in os.listdir(self.trace_dir) if name.endswith('.jsonl'))
+        for run_id in runs[:-TRACE_CONFIG['keep_runs']]:
+            for suffix in ('.jsonl', '.trace.json'):
+                path = os.path.join(self.trace_dir, f"{run_id}{suffix}")
+                if os.path.exists(path):
+                    os.remove(path)
+
+
+def start(trace_dir: str = None) -> Tracer:
+    """トレースを開始（以降の span() が記録される）"""
+    global _active_tracer
+    _active_tracer = Tracer(trace_dir)
+    return _active_tracer
+
+
+def stop():
+    global _active_tracer
+    _active_tracer = None
+
+
+def span(name: str, kind: str = 'internal', **attributes):
+    """
+    スパンの context manager（トレースしていなければ何もしない）
+
+    Args:
+        name: スパン名（ソース名・段階名など）
+        kind: 種類（run / stage / source / http / parse / render など）
+        attributes: 属性
+    """
+    tracer = _active_tracer
+    if tracer is None:
+        return _NOOP
+    return tracer.start_span(name, kind, attributes)
+
+
+def current():
+    """実行中のスパン（なければ何も記録しないスパン）"""
+    if _active_tracer is None:
+        return _NOOP
+    return _current_span.get() or _NOOP
+
+
+def bind(function: Callable) -> Callable:
+    """
+    現在のスパンを親にして function を実行する関数を返す
+
+    スレッドプールには contextvars が引き継がれないため、submit / map する関数を包む。
+    """
+    parent = _current_span.get()
+
+    def run(*args, **kwargs):
+        token = _current_span.set(parent)
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _current_span.reset(token)
+    return run
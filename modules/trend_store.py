@@ -0,0 +1,247 @@
+"""
+トレンド集計ストアモジュール
+週次のカテゴリ・ソース・キーワード別件数を時系列で蓄積し、前週比や移動平均を計算
+"""
+
+import os
+import re
+import glob
+import json
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+import logging
+
+from config.categories import CATEGORIES
+from modules.article import Article, to_articles
+
+logger = logging.getLogger(__name__)
+
+# 集計対象のディメンション
+DIMENSIONS = ['categories', 'sources', 'keywords']
+
+
+def week_key(date: datetime) -> str:
+    """ISO週のキー（例: 2025-W41）"""
+    year, week, _ = date.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+class TrendStore:
+    def __init__(self, store_dir: str = "data/trends", window: int = 4):
+        """
+        トレンドストアを初期化
+
+        Args:
+            store_dir: 保存先ディレクトリ
+            window: 移動平均に使う過去週数
+        """
+        self.store_dir = store_dir
+        self.window = window
+        self.rows_path = os.path.join(store_dir, "weekly.jsonl")
+        self.state_path = os.path.join(store_dir, "state.json")
+        self.keywords = sorted({
+            keyword.lower()
+            for category_info in CATEGORIES.values()
+            for keyword in category_info['keywords']
+        })
+
+    def aggregate(self, articles: List[Article], week: str) -> Dict[str, Any]:
+        """記事リストを週次の集計行に変換"""
+        row = self.new_row(week)
+        for article in articles:
+            self.add_to_row(row, article)
+        return row
+
+    def new_row(self, week: str) -> Dict[str, Any]:
+        """空の週次集計行"""
+        return {'week': week, 'total': 0, 'categories': {}, 'sources': {}, 'keywords': {}}
+
+    def add_to_row(self, row: Dict[str, Any], article: Article):
+        """記事1件を集計行に加算"""
+        row['total'] += 1
+
+        category = article.category or 'general'
+        row['categories'][category] = row['categories'].get(category, 0) + 1
+
+        source = article.source or 'unknown'
+        row['sources'][source] = row['sources'].get(source, 0) + 1
+
+        content = f"{article.title.lower()} {article.description.lower()}"
+        for keyword in self.keywords:
+            if keyword in content:
+                row['keywords'][keyword] = row['keywords'].get(keyword, 0) + 1
+
+    def record(self, articles: List[Article], date: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        今回の記事を集計して1行追記し、トレンドを返す
+
+        Args:
+            articles: 今回の分析済み記事
+            date: 集計対象の日時（省略時は現在時刻）
+
+        Returns:
+            前週比・移動平均を含むトレンド
+        """
+        return self.record_row(self.aggregate(articles, week_key(date or datetime.now())))
+
+    def record_row(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """集計済みの週次行を記録し（同じ週の行は置き換え）、トレンドを返す"""
+        row['recorded_at'] = datetime.now().isoformat(timespec='seconds')
+
+        rows = {r['week']: r for r in self.load_history()}
+        if row['week'] in rows:
+            # 同じ週の再実行は行を追記せず書き直す
+            rows[row['week']] = row
+            self._write_rows([rows[week] for week in sorted(rows)])
+        else:
+            os.makedirs(self.store_dir, exist_ok=True)
+            with open(self.rows_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(row, ensure_ascii=False, separators=(',', ':')) + '\n')
+
+        # 直近の週だけを保持するステートを更新（同じ週の再実行は上書き）
+        recent = [r for r in self._load_state() if r['week'] != row['week']]
+        recent.append(row)
+        recent.sort(key=lambda r: r['week'])
+        self._save_state(recent[-(self.window + 1):])
+
+        return self.compute_trends(row)
+
+    def compute_trends(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """保持中の直近週から前週比・成長率・移動平均を計算"""
+        history = [r for r in self._load_state() if r['week'] < row['week']][-self.window:]
+        previous = history[-1] if history else None
+
+        trends = {'week': row['week'], 'previous_week': previous['week'] if previous else None}
+        for dimension in DIMENSIONS:
+            trends[dimension] = self._compute_dimension(dimension, row, previous, history)
+
+        return trends
+
+    def _compute_dimension(self, dimension: str, row: Dict[str, Any],
+                           previous: Optional[Dict[str, Any]],
+                           history: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """1ディメンション分のトレンドを計算（増加量の大きい順）"""
+        current_counts = row[dimension]
+        previous_counts = previous[dimension] if previous else {}
+        keys = set(current_counts) | set(previous_counts)
+
+        results = []
+        for key in sorted(keys):
+            count = current_counts.get(key, 0)
+            previous_count = previous_counts.get(key, 0)
+            moving_average = (
+                sum(r[dimension].get(key, 0) for r in history) / len(history)
+                if history else None
+            )
+            results.append({
+                'key': key,
+                'count': count,
+                'previous': previous_count,
+                'delta': count - previous_count,
+                'growth': (count - previous_count) / previous_count if previous_count else None,
+                'moving_average': moving_average
+            })
+
+        # 増加量・件数が同じキーは名前順（実行ごとに順序が変わらないように）
+        results.sort(key=lambda x: (-x['delta'], -x['count'], x['key']))
+        return results
+
+    def load_history(self) -> List[Dict[str, Any]]:
+        """全期間の週次集計を読み込み（同じ週は最後の行を採用）"""
+        rows = {}
+        if os.path.exists(self.rows_path):
+            with open(self.rows_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        row = json.loads(line)
+                        rows[row['week']] = row
+        return [rows[week] for week in sorted(rows)]
+
+    def backfill(self, collected_dir: str = "data/collected", store: Optional[Any] = None) -> int:
+        """
+        data/collected の既存JSONと記事ストアから週次集計を作り直す
+
+        分析済みデータがある週はそれを、ない週は収集データを使う。
+
+        Args:
+            collected_dir: 旧形式のJSONファイルのディレクトリ
+            store: 記事ストア（ArticleStore）
+
+        Returns:
+            作成した週の数
+        """
+        weekly_files = {}
+        for path in glob.glob(os.path.join(collected_dir, "*.json")):
+            match = re.match(r'(analyzed_articles|articles)_(\d{8}_\d{6})\.json$', os.path.basename(path))
+            if not match:
+                continue
+            kind, timestamp = match.groups()
+            kind = 'analyzed' if kind == 'analyzed_articles' else 'articles'
+            week = week_key(datetime.strptime(timestamp, '%Y%m%d_%H%M%S'))
+            weekly_files.setdefault(week, {}).setdefault(kind, []).append(path)
+
+        if store is not None:
+            # 収集記事のパーティションを週ごとにまとめ、分析結果の差分と結合して読む
+            for partition_dir in store.partitions('articles'):
+                partition_date = datetime.strptime(os.path.basename(partition_dir), 'date=%Y-%m-%d').date()
+                week = week_key(datetime.combine(partition_date, datetime.min.time()))
+                weekly_files.setdefault(week, {}).setdefault('analyzed', []).append(partition_date)
+
+        backfilled = {}
+        for week, files in weekly_files.items():
+            sources = files.get('analyzed') or files.get('articles', [])
+            seen_links = set()
+            articles = []
+            for source in sorted(sources, key=str):
+                if isinstance(source, str):
+                    records = self._load_articles_file(source)
+                else:
+                    records = store.read_joined('articles', 'analysis', source, source)
+                for article in to_articles(records):
+                    link = article.link
+                    if link in seen_links:
+                        continue
+                    seen_links.add(link)
+                    articles.append(article)
+
+            row = self.aggregate(articles, week)
+            row['recorded_at'] = datetime.now().isoformat(timespec='seconds')
+            row['backfilled'] = True
+            backfilled[week] = row
+
+        # 既存の行とマージして書き直す（バックフィルした週を優先）
+        rows = {row['week']: row for row in self.load_history()}
+        rows.update(backfilled)
+        ordered = [rows[week] for week in sorted(rows)]
+
+        self._write_rows(ordered)
+        self._save_state(ordered[-(self.window + 1):])
+
+        logger.info(f"トレンドストアのバックフィル完了: {len(backfilled)}週")
+        return len(backfilled)
+
+    def _write_rows(self, rows: List[Dict[str, Any]]):
+        """週次集計の全行を一時ファイル経由で書き直す"""
+        os.makedirs(self.store_dir, exist_ok=True)
+        tmp_path = f"{self.rows_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False, separators=(',', ':')) + '\n')
+        os.replace(tmp_path, self.rows_path)
+
+    def _load_articles_file(self, path: str) -> List[Dict[str, Any]]:
+        """旧形式のJSON配列を読み込み"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _load_state(self) -> List[Dict[str, Any]]:
+        if not os.path.exists(self.state_path):
+            return []
+        with open(self.state_path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('weeks', [])
+
+    def _save_state(self, rows: List[Dict[str, Any]]):
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'weeks': rows}, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, self.state_path)